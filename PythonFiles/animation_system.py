@@ -0,0 +1,43 @@
+class AnimationSystem:
+    """ The AnimationSystem class is responsible for advancing the animations of every entity of the level in a single pass per tick.
+        The animations are driven by the simulation time of the level (the time of the game clock tick, a fixed step in headless sessions)
+        instead of each animator reading the wall clock, so the frames shown only depend on the ticks played and the animations
+        are paused with the level (menus, game over screen).
+        The entities choose their animation when their state changes (Animator.play_animation), the system only advances the frame index
+        and replaces the image of the entities whose frame changed. The animations with a single frame are skipped.
+
+        The class has the following attributes:
+            - time: The simulation time of the animations in milliseconds
+            - updated: The number of entities whose frame changed in the last tick (metric)
+    """
+
+    def __init__(self) -> None:
+        """ Initializes a new instance of the AnimationSystem class"""
+        self.time = 0
+        self.updated = 0
+
+    def update(self, elapsed_time, sprites):
+        """ The update method is responsible for advancing the animation of every sprite by the simulation time elapsed.
+
+            Args:
+                - elapsed_time (float): The simulation time elapsed since the last tick in milliseconds
+                - sprites (iterable): The sprites whose animations are advanced
+
+            Returns:
+                - int: The number of sprites whose frame changed
+        """
+        self.time += elapsed_time
+        updated = 0
+
+        for sprite in sprites:
+            if sprite.animator.advance(elapsed_time, sprite):
+                updated += 1
+
+        self.updated = updated
+
+        return updated
+
+    def reset(self):
+        """ The reset method is responsible for rewinding the simulation time of the animations (e.g. when the level is restarted)."""
+        self.time = 0
+        self.updated = 0
@@ -1,20 +1,59 @@
 import pygame as pg
 import os
-from consts import PLAYER_PATHS, KIRBY_PATHS
+from lru_cache import LRUCache, get_frames_size
+from consts import PLAYER_PATHS, KIRBY_PATHS, CACHE_BUDGETS, ANIMATION_FRAME_DURATIONS
+
+def get_animation_size(animation):
+    """ The get_animation_size function returns the number of bytes of the pixels of an animation (its frames and its flipped frames)
+
+        Args:
+            - animation (tuple): The frames and the flipped frames of the animation
+
+        Returns:
+            - int: The size in bytes
+    """
+    return get_frames_size(animation[0]) + get_frames_size(animation[1])
+
+
+def get_frame_durations(key, len_frames):
+    """ The get_frame_durations function returns the duration of each frame of an animation from the ANIMATION_FRAME_DURATIONS table
+
+        Args:
+            - key (str): The key of the animation (entity name and state)
+            - len_frames (int): The number of frames of the animation
+
+        Returns:
+            - tuple: The duration of each frame in milliseconds
+    """
+    durations = ANIMATION_FRAME_DURATIONS.get(key, ANIMATION_FRAME_DURATIONS["DEFAULT"])
+
+    if isinstance(durations, (int, float)):
+        return (durations,) * len_frames
+
+    # A list of durations is repeated when the animation has more frames
+    return tuple(durations[index % len(durations)] for index in range(len_frames))
+
 
 class Animator:
     """The Animator class is responsible for playing animations for the entities. It uses the Flyweight pattern to store shared instances of animations.
+       The animators don't measure the time, the animation system advances every animator with the simulation time of the level (advance).
 
        The class has the following attributes:
-         - _animations: A dictionary that stores the shared instances of animations (Flyweight storage)
+         - _animations: A cache that stores the shared instances of animations (frames and flipped frames, Flyweight storage), bounded by a byte budget (LRU eviction)
          - current_animation: The current animation that is being played
+         - animation_key: The key of the animation in the cache, it is pinned while the animation is played so it is not evicted
          - animation_index: The index of the current frame in the animation
-         - animation_delay: The delay between each frame in milliseconds
          - animations_frames: The frames of the current animation
-         - last_update: The time of the last update in milliseconds 
+         - flipped_frames: The frames of the current animation flipped horizontally (for the entities turned left)
+         - frame_durations: The duration of each frame of the current animation in milliseconds
+         - elapsed_time: The simulation time elapsed since the current frame was shown in milliseconds
+         - delay_scale: The factor applied to the frame durations of every animator, it is raised by the frame pacer when the game is under load
     """
 
-    _animations = {}
+    __slots__ = ("current_animation", "animation_key", "animation_index", "animations_frames", "flipped_frames", "frame_durations", "elapsed_time")
+
+    _animations = LRUCache("animations", CACHE_BUDGETS["ANIMATIONS"], get_animation_size)
+    delay_scale = 1
 
     def __init__(self) -> None:
         """ 
@@ -22,13 +61,47 @@ class Animator:
         """
         
         self.current_animation = "idle"
+        self.animation_key = None
         self.animation_index = 0
-        self.animation_delay = 100
         self.animations_frames = None
-        self.last_update = 0
+        self.flipped_frames = None
+        self.frame_durations = None
+        self.elapsed_time = 0
+
+    def __deepcopy__(self, memo):
+        """ The __deepcopy__ method creates a copy of the animator (e.g. for a cloned entity), the copy shares the frames and pins the animation it plays"""
+        result = Animator()
+        memo[id(self)] = result
+
+        for name in self.__slots__:
+            setattr(result, name, getattr(self, name))
+
+        if result.animation_key is not None:
+            self._animations.pin(result.animation_key)
+
+        return result
                
+    def reset(self):
+        """ The reset method is responsible for returning the animator to its initial state, the cached animations are kept (the played animation is unpinned)"""
+
+        self.release_animation()
+
+        self.current_animation = "idle"
+        self.animation_index = 0
+        self.animations_frames = None
+        self.flipped_frames = None
+        self.frame_durations = None
+        self.elapsed_time = 0
+
+    def release_animation(self):
+        """ The release_animation method is responsible for unpinning the animation that is played, so it can be evicted from the cache"""
+
+        if self.animation_key is not None:
+            self._animations.unpin(self.animation_key)
+            self.animation_key = None
+
     def play_animation(self,state,entity):
-     """The play_animation method is responsible for playing the animation for the given state
+     """The play_animation method is responsible for choosing the animation for the given state, the first frame is shown when the animation changes
         
         Args:
             - state (str): The state of the entity (e.g. idle, walk, jump)
@@ -36,49 +109,92 @@ class Animator:
     """
      
      # Check if the current animation is different from the new animation
-     if self.current_animation != state:
-        self.current_animation = state
+     if self.current_animation == state:
+        return
 
-         # Reset the animation
-        self.animation_index = 0 
-        self.last_update = 0
+     self.current_animation = state
 
-        # Load the animation frames for the new state
-        self.animations_frames = self.load_animation_frames(entity, state) 
-     
-     # Get the current time in milliseconds since Pygame was initialized
-     now = pg.time.get_ticks()
-    
-    # Check if the time elapsed since the last update is greater than the animation delay
-     if now - self.last_update > self.animation_delay:
-     
-        self.last_update = now
-        
-        # Increment the animation index and wrap it around using modulo to stay within the valid range
-        self.animation_index = (self.animation_index + 1) % len(self.animations_frames)
-        
-        entity.image = self.animations_frames[self.animation_index]
+     # Load the animation frames for the new state, the new animation is pinned before the old one is released
+     key = f"{entity.name}_{state}"
+     self._animations.pin(key)
+     self.release_animation()
+     self.animation_key = key
+
+     self.animations_frames, self.flipped_frames = self.load_animation_frames(entity, state)
+     self.frame_durations = get_frame_durations(key, len(self.animations_frames))
+
+     # Reset the animation
+     self.animation_index = 0
+     self.elapsed_time = 0
+
+     entity.image = self.animations_frames[0] if entity.turned_right else self.flipped_frames[0]
+
+    def show_frame(self, entity):
+     """The show_frame method is responsible for showing the current frame turned as the entity, it is called when the entity turns around.
+        The frame is taken from the cached frames or flipped frames, so turning doesn't create a new surface. Before the first animation is played
+        the image is kept, play_animation shows the first frame turned as the entity.
+
+        Args:
+            - entity (Entity): The entity that the animation belongs to
+     """
+     if self.animations_frames is None:
+        return
 
-        if not entity.turned_right:
-            entity.image = pg.transform.flip(entity.image, True, False)
+     entity.image = self.animations_frames[self.animation_index] if entity.turned_right else self.flipped_frames[self.animation_index]
+
+    def advance(self, elapsed_time, entity):
+     """The advance method is responsible for advancing the animation by the simulation time elapsed, it is called by the animation system.
+        The image of the entity is only replaced when the frame changes.
+
+        Args:
+            - elapsed_time (float): The simulation time elapsed since the last advance in milliseconds
+            - entity (Entity): The entity that the animation belongs to
+
+        Returns:
+            - bool: A flag indicating whether the frame changed
+     """
+     frames = self.animations_frames
+
+     if frames is None or len(frames) == 1:
+        return False
+
+     self.elapsed_time += elapsed_time
+     index = self.animation_index
+     duration = self.frame_durations[index] * Animator.delay_scale
+
+     if self.elapsed_time < duration:
+        return False
+
+     # The frames whose duration elapsed are skipped (e.g. after a long frame)
+     while self.elapsed_time >= duration:
+        self.elapsed_time -= duration
+        index = (index + 1) % len(frames)
+        duration = self.frame_durations[index] * Animator.delay_scale
+
+     self.animation_index = index
+     entity.image = frames[index] if entity.turned_right else self.flipped_frames[index]
+
+     return True
     
     def load_animation_frames(self, entity, state):
         """The load_animation_frames method is responsible for loading the animation frames for the given state
 
-           It first checks if the frames are already stored in the animations_storage dictionary. If not, it loads the frames from the sprite sheet and saves them in the dictionary for future use.
+           It first checks if the frames are already stored in the animations cache. If not, it loads the frames from the sprite sheet and saves them in the cache for future use.
+           The flipped frames are created once when the frames are loaded, so the entities turned left don't flip a frame each time it changes.
 
             Args:
                 - entity (Entity): The entity that the animation belongs to
                 - state (str): The state of the entity (e.g. idle, walk, jump)
 
             Returns:
-                - frames (list): A list of the animation frames     
+                - tuple: A list of the animation frames and a list of the flipped animation frames
         """
 
         key = f"{entity.name}_{state}"  
+        animation = self._animations.get(key)
 
-        if key in self._animations:
-            return self._animations[key] 
+        if animation is not None:
+            return animation
         
         if entity.name == "Bowser":
             image_path = os.path.join(os.path.dirname(__file__),  f"{PLAYER_PATHS['ANIMATOR_BASE']}/{state}/{entity.name}_{state}.png")
@@ -91,10 +207,12 @@ class Animator:
 
         frames = self.split_tileset(new_image, entity.dimensions[0]) if new_image.get_width() > entity.dimensions[0] else [pg.transform.scale(new_image, (entity.dimensions[0], new_image.get_height()))]
 
-        # Save the frames in the animations_storage dictionary
-        self._animations[key] = frames
+        animation = (frames, [pg.transform.flip(frame, True, False) for frame in frames])
+
+        # Save the frames in the animations cache
+        self._animations.put(key, animation)
         
-        return frames
+        return animation
 
     def split_tileset(self, tile_set, sprite_width,):
         """The split_tileset method is responsible for splitting the tileset into individual frames
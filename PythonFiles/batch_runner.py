@@ -0,0 +1,167 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+
+
+def init_worker():
+    """ The init_worker function is responsible for preparing a worker process of the pool.
+        The game loads some assets with paths relative to the PythonFiles folder, and the states of the FSMs print on every frame, so the output is discarded.
+    """
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    sys.stdout = open(os.devnull, "w")
+
+
+def run_session(session):
+    """ The run_session function is responsible for playing a headless session in a worker process.
+        The game is imported here, so the parent process never initializes pygame.
+
+        Args:
+            - session (dict): The session specification (level, seed, input_script, max_frames)
+
+        Returns:
+            - dict: The result of the session
+    """
+    from headless import HeadlessSession
+
+    try:
+        return HeadlessSession(**session).run()
+    except Exception as error:
+        return {"level": session.get("level", 0), "seed": session.get("seed"), "outcome": "error", "error": repr(error)}
+
+
+def load_sessions(arguments):
+    """ The load_sessions function is responsible for building the list of sessions to be played.
+
+        Args:
+            - arguments (Namespace): The command line arguments
+
+        Returns:
+            - list: The sessions specifications
+    """
+    if arguments.sessions is not None:
+        with open(arguments.sessions, "r") as file:
+            sessions = json.load(file)
+
+        # The input scripts paths are relative to the sessions file, they are loaded here because the workers run in other folder
+        sessions_folder = os.path.dirname(os.path.abspath(arguments.sessions))
+
+        for session in sessions:
+            if isinstance(session.get("input_script"), str):
+                with open(os.path.join(sessions_folder, session["input_script"]), "r") as file:
+                    session["input_script"] = json.load(file)
+
+        return sessions
+
+    script = None
+
+    if arguments.script is not None:
+        with open(arguments.script, "r") as file:
+            script = json.load(file)
+
+    return [{"level": arguments.level, "seed": seed, "input_script": script} for seed in range(arguments.runs)]
+
+
+def add_state_hashes(sessions, directory):
+    """ The add_state_hashes function is responsible for giving each session the path of its state hash trace (session_<index>.hash in the directory).
+        The paths are absolute because the workers run in other folder.
+
+        Args:
+            - sessions (list): The sessions specifications
+            - directory (str): The directory of the traces
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    for index, session in enumerate(sessions):
+        session["state_hash"] = os.path.join(os.path.abspath(directory), f"session_{index}.hash")
+
+
+def summarize(results, wall_time, workers):
+    """ The summarize function is responsible for aggregating the results of the sessions.
+
+        Args:
+            - results (list): The results of the sessions
+            - wall_time (float): The duration of the whole batch in seconds
+            - workers (int): The number of worker processes
+
+        Returns:
+            - dict: The summary of the batch
+    """
+    scores = [result["score"] for result in results if "score" in result]
+    session_time = sum(result.get("seconds", 0) for result in results)
+
+    return {"runs": len(results),
+            "outcomes": dict(Counter(result["outcome"] for result in results)),
+            "mean_score": sum(scores) / len(scores) if scores else None,
+            "best_score": max(scores, default=None),
+            "worst_score": min(scores, default=None),
+            "session_seconds": session_time,
+            "wall_seconds": wall_time,
+            "workers": workers
+           }
+
+
+def run_batch(sessions, workers):
+    """ The run_batch function is responsible for playing the sessions in a process pool.
+        Each process plays one session at a time, because the game classes are singletons.
+
+        Args:
+            - sessions (list): The sessions specifications
+            - workers (int): The number of worker processes
+
+        Returns:
+            - dict: The report with the results of every session and the summary
+    """
+    start_time = time.perf_counter()
+    results = [None] * len(sessions)
+
+    context = multiprocessing.get_context("spawn")
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=init_worker) as executor:
+        futures = {executor.submit(run_session, session): index for index, session in enumerate(sessions)}
+
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+
+    return {"sessions": results, "summary": summarize(results, time.perf_counter() - start_time, workers)}
+
+
+def parse_arguments():
+    """ The parse_arguments function is responsible for parsing the command line arguments of the batch runner."""
+    parser = argparse.ArgumentParser(description="Plays many headless game sessions in parallel and reports their outcomes.")
+    parser.add_argument("--sessions", help="json file with the list of sessions ({level, seed, input_script, max_frames})")
+    parser.add_argument("--runs", type=int, default=os.cpu_count(), help="number of sessions when no sessions file is given")
+    parser.add_argument("--level", type=int, default=0, help="level of the sessions when no sessions file is given")
+    parser.add_argument("--script", help="json file with the input script of the sessions when no sessions file is given")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("--report", help="path of the json report (printed when omitted)")
+    parser.add_argument("--state-hash", metavar="DIRECTORY", help="write the state hash trace of each session in this directory (compared with python state_hash.py)")
+
+    return parser.parse_args()
+
+
+def main():
+    """ Entry point of the batch runner."""
+    arguments = parse_arguments()
+    sessions = load_sessions(arguments)
+
+    if arguments.state_hash is not None:
+        add_state_hashes(sessions, arguments.state_hash)
+
+    report = run_batch(sessions, arguments.workers)
+
+    if arguments.report is None:
+        print(json.dumps(report, indent=2))
+    else:
+        with open(arguments.report, "w") as file:
+            json.dump(report, file, indent=2)
+
+        print(json.dumps(report["summary"], indent=2))
+
+
+if __name__ == "__main__":
+    main()
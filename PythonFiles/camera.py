@@ -27,8 +27,12 @@ class Camera:
         """Apply camera offset to a rectangle"""
         return rect.move(self.camera.topleft)
 
+    def get_offset(self):
+        """Return the camera offset added to the map positions (e.g. by the render queue)"""
+        return (self.camera.x, self.camera.y)
+
     def update(self, target):
-        """Update camera position to follow target"""
+        """Update camera position to follow target, the camera rect is moved in place"""
         # Center the camera on the target
         x = -target.rect.centerx + self.width // 2
         y = -target.rect.centery + self.height // 2
@@ -43,4 +47,5 @@ class Camera:
         x = max(-(map_width - self.width), x)  # Right boundary
         y = max(-(map_height - self.height), y)  # Bottom boundary
 
-        self.camera = pg.Rect(x, y, self.width, self.height)
\ No newline at end of file
+        self.camera.x = x
+        self.camera.y = y
\ No newline at end of file
@@ -1,4 +1,7 @@
 import pygame as pg
+import os
+import json
+from consts import KEY_BINDINGS_PATH
 
 """
     Class that defines the commands that can be executed by the player.
@@ -23,29 +26,113 @@ class JumpCommand(Command):
     def execute(self, player):
         player.initiate_jump()
 
-class QuitGameCommand(Command):
-    """ The QuitGameCommand class is responsible for quitting the game."""
-    def execute(self, player):
-        player.quit_game()
+# Bit of each action in the pressed actions bitmask
+ACTION_BITS = {"move_left": 1,
+               "move_right": 2,
+               "jump": 4,
+               "quit": 8,
+               "confirm": 16
+              }
+
+# Commands executed on the player while an action is pressed, in execution order (quit and confirm are handled by the game loop)
+ACTION_COMMANDS = {"jump": JumpCommand(),
+                   "move_left": MoveLeftCommand(),
+                   "move_right": MoveRightCommand()
+                  }
 
 class InputHandler:
-    """ The InputHandler class is responsible for handling the player input and executing the corresponding commands."""
-    def __init__(self):
-        self.commands = {
-            pg.K_UP: JumpCommand(),
-            pg.K_LEFT: MoveLeftCommand(),
-            pg.K_RIGHT: MoveRightCommand(),
-            pg.K_w: JumpCommand(),
-            pg.K_a: MoveLeftCommand(),
-            pg.K_d: MoveRightCommand(),
-            pg.K_SPACE: JumpCommand(),
-            pg.K_ESCAPE: QuitGameCommand()
-        }
-
-    def set_command(self, key, command):
-        self.commands[key] = command
-
-    def handle_input(self, key, player):
-        command = self.commands.get(key, None)
-        if command and player is not None:
-            command.execute(player)
\ No newline at end of file
+    """ The InputHandler class is responsible for handling the player input.
+        It keeps the pressed actions in a bitmask updated from the KEYDOWN and KEYUP events, and maps the keys to actions through a binding table
+        loaded from a json file (key name -> action name), so the keys can be rebound without code changes.
+        The player gets the active commands of the pressed actions from a table indexed by the bitmask, so the input cost per frame is constant.
+
+        The class has the following attributes:
+            - bindings: The action bit of each key code
+            - pressed_keys: The number of pressed keys of each action bit
+            - pressed_actions: The bitmask of the pressed actions
+            - commands_by_mask: The commands of each possible bitmask
+    """
+    def __init__(self, bindings_path=KEY_BINDINGS_PATH):
+        """ Initializes a new instance of the InputHandler class and loads the key bindings.
+
+            Args:
+                - bindings_path (str): The path of the key bindings json file
+        """
+        self.bindings = self.load_bindings(bindings_path)
+        self.pressed_keys = dict.fromkeys(ACTION_BITS.values(), 0)
+        self.pressed_actions = 0
+
+        self.commands_by_mask = []
+
+        for mask in range(1 << len(ACTION_BITS)):
+            commands = tuple(command for action, command in ACTION_COMMANDS.items() if mask & ACTION_BITS[action])
+            self.commands_by_mask.append(commands)
+
+    def load_bindings(self, bindings_path):
+        """ The load_bindings method is responsible for loading the key bindings json file.
+
+            Args:
+                - bindings_path (str): The path of the key bindings json file
+
+            Returns:
+                - dict: The action bit of each key code
+        """
+        with open(os.path.join(os.path.dirname(__file__), bindings_path), "r") as file:
+            key_bindings = json.load(file)
+
+        return {pg.key.key_code(key_name): ACTION_BITS[action] for key_name, action in key_bindings.items()}
+
+    def set_binding(self, key, action):
+        """ The set_binding method is responsible for binding a key to an action.
+
+            Args:
+                - key (int): The key code
+                - action (str): The action name
+        """
+        self.bindings[key] = ACTION_BITS[action]
+
+    def get_action(self, key):
+        """ The get_action method is responsible for returning the action bound to a key.
+
+            Args:
+                - key (int): The key code
+
+            Returns:
+                - int: The action bit, or 0 if the key is not bound
+        """
+        return self.bindings.get(key, 0)
+
+    def handle_event(self, event):
+        """ The handle_event method is responsible for updating the pressed actions from a keyboard event.
+            When the window loses the focus every action is released, because the KEYUP events are not received.
+
+            Args:
+                - event (Event): The pygame event
+        """
+        if event.type == pg.KEYDOWN or event.type == pg.KEYUP:
+            action = self.bindings.get(event.key, 0)
+
+            if action:
+                pressed_keys = self.pressed_keys[action] + (1 if event.type == pg.KEYDOWN else -1)
+                self.pressed_keys[action] = max(pressed_keys, 0)
+
+                if self.pressed_keys[action] > 0:
+                    self.pressed_actions |= action
+                else:
+                    self.pressed_actions &= ~action
+
+        elif event.type == pg.WINDOWFOCUSLOST:
+            self.release_all()
+
+    def release_all(self):
+        """ The release_all method is responsible for releasing every pressed action."""
+        self.pressed_keys = dict.fromkeys(ACTION_BITS.values(), 0)
+        self.pressed_actions = 0
+
+    def get_active_commands(self):
+        """ The get_active_commands method is responsible for returning the commands of the pressed actions.
+
+            Returns:
+                - tuple: The commands to be executed on the player
+        """
+        return self.commands_by_mask[self.pressed_actions]
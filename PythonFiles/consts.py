@@ -7,21 +7,38 @@ GAME_EVENTS = {"QUIT_GAME_EVENT": pg.USEREVENT + 1,
                "TIME_ALERT_EVENT": pg.USEREVENT + 4, 
                "PLAYER_JUMP_EVENT": pg.USEREVENT + 5, 
                "END_GAME_EVENT": pg.USEREVENT + 6, 
-               "ENEMY_KILLED_EVENT": pg.USEREVENT + 7 
+               "ENEMY_KILLED_EVENT": pg.USEREVENT + 7,
+               "MUSIC_END_EVENT": pg.USEREVENT + 8
                }
 
+# Window title
+GAME_TITLE = "Super Bowser"
+
 # Screen Dimensions Constants
 SCREEN_DIMENSIONS = {"WIDTH": 800, 
                      "HEIGHT": 277}
 
+# Scaling Constants (the frame is drawn at the screen dimensions and scaled to the window, the resizable window opens at WINDOW_SCALE times the screen dimensions)
+SCALE_MODES = ["window", "resizable", "fullscreen"]
+SCALING = {"WINDOW_SCALE": 2,
+           "LETTERBOX_COLOR": (0, 0, 0)
+          }
+
 # Map Constants flor block constants and peach sprite path
 FLOOR_TILE_DIMENSIONS = {"WIDTH": 16, "HEIGHT": 19}
 FLOOR_BLOCK = 0
 FLOOR_BLOCK_SPRITE_PATH = "../Assets/SpriteSheets/Map/floor_block.png"
 
+# Level Constants (the level files in the order they are played, the tile of each symbol of the tile rows of a level file (the other symbols are empty cells),
+# the maximum number of kirbies of a level (the size of the observations of the environment))
+LEVEL_PATHS = ["../Assets/Levels/level_1.json",
+               "../Assets/Levels/level_2.json"
+              ]
+LEVEL_TILES = {"#": FLOOR_BLOCK}
+MAX_KIRBIES = 5
+
 # Peach Constants
 PEACH_COLLIDER = (16, 16)
-PEACH_SPAWN_POSITION = (1445, 240)
 PEACH_SPRITE_PATH = "../Assets/SpriteSheets/Peach/peach.png"
 
 # Time Constants
@@ -31,8 +48,90 @@ TIME = {"GAME_TIME": 20,
           "ONE_SECOND": 1000
         }
 
+# Sound effects of the game, they are decoded in the background while the start menu is shown
+SOUND_EFFECTS = ["jump", "bowser_death", "time_warning", "enemy_killed", "end_game", "game_over"]
+
+# Music Constants (the background music is streamed from disk by pygame.mixer.music)
+MUSIC = {"VOLUME": 0.1,
+         "FADE_MS": 1000
+        }
+
 # Game Constants
 FPS = 60
+
+# Frame Pacing Constants (load is the frame time divided by the frame budget)
+FRAME_PACING = {"SMOOTHING": 0.1,
+                "MAX_CONSECUTIVE_SKIPS": 2,
+                "HIGH_LOAD": 0.9,
+                "LOW_LOAD": 0.6,
+                "ANIMATION_DELAY_SCALE": 2,
+                "HUD_REFRESH_INTERVAL": 6
+               }
+
+# Metrics Constants (seconds between two snapshots of the metrics exporter, snapshots waiting to be written before they are dropped)
+METRICS = {"INTERVAL": 10,
+           "QUEUE_SIZE": 4
+          }
+
+# Render Layers Constants (the layers of the render queue, drawn from the lowest to the highest)
+RENDER_LAYERS = {"MAP": 0,
+                 "SPRITES": 1,
+                 "EFFECTS": 2,
+                 "HUD": 3
+                }
+
+# Particle Constants (particles that can be alive at the same time, gravity in pixels per squared millisecond, alpha levels of the particles as they fade out)
+PARTICLES = {"CAPACITY": 4096,
+             "GRAVITY": 0.0008,
+             "FADE_LEVELS": 4,
+             "SEED": 0
+            }
+
+# Particle Effects Constants (particles emitted, color, size in pixels, speed range in pixels per millisecond, life in milliseconds,
+# direction range in degrees (0 is right, -90 is up) of the effect emitted when the game signals each moment)
+PARTICLE_EFFECTS = {"STOMP": {"COUNT": 40, "COLOR": (255, 255, 255), "SIZE": 3, "SPEED": (0.05, 0.2), "LIFE": 500, "DIRECTION": (-180, 0)},
+                    "DEATH": {"COUNT": 80, "COLOR": (255, 96, 32), "SIZE": 3, "SPEED": (0.05, 0.3), "LIFE": 800, "DIRECTION": (-180, 180)},
+                    "JUMP": {"COUNT": 12, "COLOR": (200, 200, 200), "SIZE": 2, "SPEED": (0.02, 0.08), "LIFE": 250, "DIRECTION": (-170, -10)}
+                   }
+
+# Frame Capture Constants (frames copied and waiting to be encoded before the next frames are dropped, zlib level of the PNG frames)
+CAPTURE = {"POOL_SIZE": 8,
+           "PNG_COMPRESSION": 1
+          }
+
+# Spectator Constants (address of the spectator server, snapshots waiting to be sent before the oldest is dropped,
+# snapshots kept per spectator until they are acknowledged, seconds to send a snapshot before the spectator is disconnected)
+SPECTATOR = {"HOST": "127.0.0.1",
+             "PORT": 7777,
+             "QUEUE_SIZE": 8,
+             "HISTORY": 120,
+             "SEND_TIMEOUT": 0.1
+            }
+
+# Navigation Constants (path searches run per tick, steps of the cached paths before the least recently used are evicted,
+# cost of a jump edge besides the columns it crosses, cost of each row fallen by a drop edge, rows below the take-off reached by a jump edge)
+NAVIGATION = {"SEARCHES_PER_TICK": 2,
+              "PATH_CACHE_STEPS": 4096,
+              "JUMP_COST": 2,
+              "DROP_ROW_COST": 0.25,
+              "JUMP_DOWN_ROWS": 3
+             }
+
+# State Hash Constants (bytes of the checksum of the simulation state written per tick to the state hash traces)
+STATE_HASH = {"DIGEST_SIZE": 8
+             }
+
+# Cache Constants (maximum bytes of the decoded assets kept by the flyweight caches, the least recently used entries are evicted)
+CACHE_BUDGETS = {"ANIMATIONS": 16 * 1024 * 1024,
+                 "SOUNDS": 16 * 1024 * 1024
+                }
+
+# Animation Constants (milliseconds each frame of an animation is shown, by entity name and state: a duration for every frame or a duration per frame)
+# The keys are the animation keys of the animators, the entity name and the name of the FSM state (its class name, e.g. Kirby_Walk)
+ANIMATION_FRAME_DURATIONS = {"DEFAULT": 100,
+                             "Bowser_Walk": 100,
+                             "Kirby_Walk": [120, 90, 120, 90]
+                            }
 GRAVITY = 0.8
 
 # Player Constants
@@ -51,10 +150,12 @@ KIRBY_PATHS = {"IDLE": "../Assets/SpriteSheets/Kirby/idle/kirby_idle.png",
                 "ANIMATOR_BASE": "../Assets/SpriteSheets/Kirby/",
                }
 KIRBY_MOVEMENT = {"SPEED": 1.2,
+                  "CHASE_SPEED": 1.8,
+                  "JUMP_SPEED": 10,
                   "PATROL_MAX_DISTANCE": 100
                 }
-KIRBY_COLLIDER = (18, 20)
-KIRBIES_SPAWN_POSITIONS = [(150, 252), (350, 252), (570, 195),(770, 138), (1000, 195)]
+KIRBY_COLLIDER = (18, 18)
+KIRBY_AI_MODES = ["patrol", "chase"]
 
 
 # UI Constants
@@ -66,6 +167,9 @@ COLORS = {"WHITE": (255, 255, 255),
           "BACKGROUND": (107, 136, 255)
           }
 
+# Input Constants (key name -> action name, the key names are the ones of pygame.key.name)
+KEY_BINDINGS_PATH = "../Assets/Config/key_bindings.json"
+
 # Menus Constants
 MENUS_TEXT_FILE_PATHS = {"START_MENU": "../Assets/MenusText/start_menu.txt",
                          "GAME_OVER_MENU": "../Assets/MenusText/game_over_menu.txt",
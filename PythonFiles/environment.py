@@ -0,0 +1,308 @@
+import os
+import sys
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from headless import HeadlessSession, DEFAULT_MAX_FRAMES
+from game import event_handler
+from command import Command, MoveLeftCommand, MoveRightCommand, JumpCommand
+from consts import MAX_KIRBIES
+
+# Actions of the environment, an action can be given as a Command or as its index in this list (None means no key held)
+ACTIONS = [None, MoveLeftCommand(), MoveRightCommand(), JumpCommand()]
+
+# Player values (x, y, velocity_x, velocity_y, is_on_ground), HUD values (time, score) and the values of each Kirby (x, y, alive)
+OBSERVATION_SIZE = 7 + 3 * MAX_KIRBIES
+
+# Reward for each pixel the player moves to the right
+PROGRESS_REWARD = 0.1
+
+
+class GameEnvironment:
+    """ The GameEnvironment class exposes the game as a step/reset environment to train and evaluate automated playtesting agents.
+        It plays a headless session without frame cap, each step applies a command during one frame.
+
+        The reward of a step is the change of the score plus the horizontal progress of the player, and when the player reaches Peach the remaining time.
+
+        The class has the following attributes:
+            - session: The headless session played by the environment
+            - scripted_input: The commands held by the player
+            - kirbies: The kirbies of the level in spawn order (dead kirbies are removed from the sprites group)
+            - frame: The number of frames played since the last reset
+    """
+
+    def __init__(self, level=0, max_frames=DEFAULT_MAX_FRAMES) -> None:
+        """ Initializes a new instance of the GameEnvironment class
+
+            Args:
+                - level (int): The level played by the environment
+                - max_frames (int): The number of frames after which an episode is truncated
+        """
+        self.session = HeadlessSession(level=level, max_frames=max_frames)
+        self.scripted_input = None
+        self.player = None
+        self.kirbies = []
+        self.frame = 0
+        self.last_score = 0
+        self.last_x = 0
+
+    def reset(self, seed=None):
+        """ The reset method is responsible for starting a new episode.
+
+            Args:
+                - seed (int): The seed of the random number generator
+
+            Returns:
+                - ndarray: The first observation of the episode
+        """
+        self.session.seed = seed
+        self.session.start()
+
+        game = self.session.game
+        self.scripted_input = game.player.commands_provider
+        self.player = game.player
+        self.kirbies = game.kirbies
+        self.frame = 0
+        self.last_score = game.ui.score
+        self.last_x = self.player.rect.x
+
+        return self.observe()
+
+    def step(self, action):
+        """ The step method is responsible for applying an action during one frame.
+
+            Args:
+                - action (Command | int | None): The command to be applied, or its index in ACTIONS
+
+            Returns:
+                - tuple: The observation, the reward, a flag indicating whether the episode ended and a dictionary with the outcome
+        """
+        if not isinstance(action, Command) and action is not None:
+            action = ACTIONS[action]
+
+        game = self.session.game
+        self.scripted_input.hold((action,) if action is not None else ())
+
+        game.play_level()
+        self.frame += 1
+
+        running = event_handler(True, game)
+        game_over = game.fsm.current == game.game_over
+
+        reward = game.ui.score - self.last_score + (self.player.rect.x - self.last_x) * PROGRESS_REWARD
+        self.last_score = game.ui.score
+        self.last_x = self.player.rect.x
+
+        outcome = None
+
+        if not running:
+            outcome = "quit"
+        elif game_over:
+            outcome = "won" if game.player_won else "timeout"
+
+            if game.player_won:
+                reward += game.ui.time
+        elif self.frame >= self.session.max_frames:
+            outcome = "max_frames"
+
+        return self.observe(), reward, outcome is not None, {"outcome": outcome}
+
+    def observe(self, observation=None):
+        """ The observe method is responsible for writing the observation of the current frame.
+
+            Args:
+                - observation (ndarray): The array where the observation is written, a new one is created when it is omitted
+
+            Returns:
+                - ndarray: The observation
+        """
+        if observation is None:
+            observation = np.zeros(OBSERVATION_SIZE, dtype=np.float32)
+
+        player = self.player
+        ui = self.session.game.ui
+
+        observation[:7] = (player.rect.x, player.rect.y, player.velocity_x, player.velocity_y, player.is_on_ground, ui.time, ui.score)
+
+        for index, kirby in enumerate(self.kirbies):
+            observation[7 + index * 3: 10 + index * 3] = (kirby.rect.x, kirby.rect.y, not kirby.dead)
+
+        # The levels with less kirbies leave the rest of the observation empty
+        observation[7 + len(self.kirbies) * 3:] = 0
+
+        return observation
+
+
+def environment_worker(index, level, max_frames, memory_names, connection):
+    """ The environment_worker function is responsible for running an environment in a worker process of the VectorEnvironment.
+        The actions are read from and the observations, rewards and done flags are written to the shared memory arrays, the pipe only carries the commands.
+
+        Args:
+            - index (int): The index of the environment
+            - level (int): The level played by the environment
+            - max_frames (int): The number of frames after which an episode is truncated
+            - memory_names (dict): The names of the shared memory blocks
+            - connection (Connection): The pipe connection to the main process
+    """
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    sys.stdout = open(os.devnull, "w")
+
+    arrays, memories = attach_shared_arrays(memory_names, len_environments=None)
+    environment = GameEnvironment(level, max_frames)
+    observation = arrays["observations"][index]
+
+    while True:
+        command, seed = connection.recv()
+
+        if command == "close":
+            break
+
+        if command == "reset":
+            environment.reset(seed)
+            environment.observe(observation)
+            arrays["rewards"][index] = 0
+            arrays["dones"][index] = False
+
+        elif command == "step":
+            _, reward, done, _ = environment.step(int(arrays["actions"][index]))
+
+            # The episodes are reset automatically, the observation of a finished episode is the first one of the next episode
+            if done:
+                environment.reset()
+
+            environment.observe(observation)
+            arrays["rewards"][index] = reward
+            arrays["dones"][index] = done
+
+        connection.send(True)
+
+    for memory in memories:
+        memory.close()
+
+
+# Shape and type of the shared arrays of the VectorEnvironment (the first dimension is the number of environments)
+SHARED_ARRAYS = {"observations": ((OBSERVATION_SIZE,), np.float32),
+                 "rewards": ((), np.float32),
+                 "dones": ((), np.bool_),
+                 "actions": ((), np.int8)
+                }
+
+
+def attach_shared_arrays(memory_names, len_environments):
+    """ The attach_shared_arrays function is responsible for creating numpy arrays backed by shared memory blocks.
+
+        Args:
+            - memory_names (dict): The names of existing shared memory blocks (None to create new blocks)
+            - len_environments (int): The number of environments, used when the blocks are created
+
+        Returns:
+            - tuple: The dictionary of arrays and the list of shared memory blocks
+    """
+    arrays = {}
+    memories = []
+
+    for name, (shape, dtype) in SHARED_ARRAYS.items():
+        if memory_names is None:
+            size = max(1, len_environments * int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            memory = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            memory = shared_memory.SharedMemory(name=memory_names[name])
+            len_environments = memory_names["len_environments"]
+
+        arrays[name] = np.ndarray((len_environments,) + shape, dtype=dtype, buffer=memory.buf)
+        memories.append(memory)
+
+    return arrays, memories
+
+
+class VectorEnvironment:
+    """ The VectorEnvironment class steps many environments in lockstep, each one in its own process (the game classes are singletons).
+        The observations, rewards and done flags are packed into shared memory arrays, the returned arrays are overwritten by the next step.
+
+        The class has the following attributes:
+            - len_environments: The number of environments
+            - arrays: The shared arrays (observations, rewards, dones, actions)
+            - memories: The shared memory blocks
+            - connections: The pipe connections to the workers
+            - processes: The worker processes
+    """
+
+    def __init__(self, len_environments, level=0, max_frames=DEFAULT_MAX_FRAMES) -> None:
+        """ Initializes a new instance of the VectorEnvironment class and starts the worker processes
+
+            Args:
+                - len_environments (int): The number of environments
+                - level (int): The level played by the environments
+                - max_frames (int): The number of frames after which an episode is truncated
+        """
+        self.len_environments = len_environments
+        self.arrays, self.memories = attach_shared_arrays(None, len_environments)
+
+        memory_names = {name: memory.name for name, memory in zip(SHARED_ARRAYS, self.memories)}
+        memory_names["len_environments"] = len_environments
+
+        context = multiprocessing.get_context("spawn")
+        self.connections = []
+        self.processes = []
+
+        for index in range(len_environments):
+            connection, worker_connection = context.Pipe()
+            process = context.Process(target=environment_worker, args=(index, level, max_frames, memory_names, worker_connection), daemon=True)
+            process.start()
+
+            self.connections.append(connection)
+            self.processes.append(process)
+
+    def send(self, command, seeds=None):
+        """ The send method is responsible for sending a command to every worker and waiting until all of them finish it.
+
+            Args:
+                - command (str): The command (reset, step or close)
+                - seeds (list): The seed of each environment
+        """
+        for index, connection in enumerate(self.connections):
+            connection.send((command, seeds[index] if seeds is not None else None))
+
+        for connection in self.connections:
+            connection.recv()
+
+    def reset(self, seeds=None):
+        """ The reset method is responsible for starting a new episode in every environment.
+
+            Args:
+                - seeds (list): The seed of each environment
+
+            Returns:
+                - ndarray: The observations (len_environments x OBSERVATION_SIZE)
+        """
+        self.send("reset", seeds)
+        return self.arrays["observations"]
+
+    def step(self, actions):
+        """ The step method is responsible for applying one action in each environment.
+            The environments whose episode ended are reset automatically.
+
+            Args:
+                - actions (sequence): The index in ACTIONS of the action of each environment
+
+            Returns:
+                - tuple: The observations, rewards and done flags arrays
+        """
+        self.arrays["actions"][:] = actions
+        self.send("step")
+
+        return self.arrays["observations"], self.arrays["rewards"], self.arrays["dones"]
+
+    def close(self):
+        """ The close method is responsible for stopping the workers and releasing the shared memory."""
+        for connection in self.connections:
+            connection.send(("close", None))
+
+        for process in self.processes:
+            process.join()
+
+        self.arrays = None
+
+        for memory in self.memories:
+            memory.close()
+            memory.unlink()
@@ -1,10 +1,13 @@
 class State:
     """The State class is responsible for managing the states of the entity
+       The states don't keep data of the entity (it is given to their methods), so the same states are shared by every entity of a type.
     
        The class has the following attributes:
             - name: The name of the state
     """
 
+    __slots__ = ("name",)
+
     def __init__(self, name) -> None:
         """
             Initializes a new instance of the State class
@@ -35,6 +38,8 @@ class Transition:
             - _to: The state to which the transition occurs
     """
 
+    __slots__ = ("_from", "_to")
+
     def __init__(self, _from, _to) -> None:
         """
            Initializes a new instance of the Transition class
@@ -46,6 +51,8 @@ class Idle(State):
     """The Idle class is responsible for managing the idle state of the entity
     """
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         """
             Initializes a new instance of the Idle class, and calls the constructor of the State class (the parent class)
@@ -70,6 +77,8 @@ class Walk(State):
     """The Walk class is responsible for managing the walk state of the entity
     """
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         """ 
             Initializes a new instance of the Walk class, and calls the constructor of the State class (the parent class)
@@ -94,6 +103,8 @@ class Jump(State):
     """The Jump class is responsible for managing the jump state of the entity
     """
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         """ 
             Initializes a new instance of the Jump class, and calls the constructor of the State class (the parent class)
@@ -117,6 +128,8 @@ class Jump(State):
 class Playing(State):
     """The Playing class is responsible for managing the playing state of the entity """
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         """ Initializes a new instance of the Playing class, and calls the constructor of the State class (the parent class) """
 
@@ -140,6 +153,8 @@ class GameOver(State):
         """The GameOver class is responsible for managing the game over state of the entity
         """
 
+        __slots__ = ()
+
         def __init__(self) -> None:
             """ 
                 Initializes a new instance of the GameOver class, and calls the constructor of the State class (the parent class)
@@ -164,6 +179,8 @@ class StartMenu(State):
     """The StartGame class is responsible for managing the start game state of the entity
     """
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         """ 
             Initializes a new instance of the StartGame class, and calls the constructor of the State class (the parent class)
@@ -193,6 +210,9 @@ class FSM:
             - current: The current state of the entity
             - end: The end state of the entity
     """
+
+    __slots__ = ("_states", "_transitions", "current", "end")
+
     def __init__(self, states: list[State], transitions: dict[Transition]) -> None:
         """
             Initializes a new instance of the FSM class
@@ -207,6 +227,13 @@ class FSM:
         self.current: State = self._states[0]
         self.end: State = self._states[-1]
 
+    def reset(self):
+        """
+            The reset method is responsible for returning the FSM to its initial state (the first state)
+        """
+
+        self.current = self._states[0]
+
     def update(self, event, object):
         """
             The update method is responsible for updating the state of the entity based on the event
@@ -0,0 +1,204 @@
+import os
+import json
+import zlib
+import queue
+import struct
+import threading
+import numpy as np
+import pygame as pg
+from consts import FPS, CAPTURE
+
+# Formats of the recordings: a PNG file per frame, or a single file with the RGB24 pixels of every frame (a raw video stream)
+CAPTURE_FORMATS = ["png", "raw"]
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def get_png_chunk(chunk_type, data):
+    """ The get_png_chunk function returns a chunk of a PNG file (length, type, data and CRC).
+
+        Args:
+            - chunk_type (bytes): The type of the chunk (e.g. IHDR, IDAT, IEND)
+            - data (bytes): The data of the chunk
+
+        Returns:
+            - bytes: The chunk
+    """
+    return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", zlib.crc32(chunk_type + data))
+
+
+def encode_png(pixels, compression=CAPTURE["PNG_COMPRESSION"]):
+    """ The encode_png function returns the PNG file of an RGB image (8 bits per channel, no filter).
+
+        Args:
+            - pixels (ndarray): The pixels of the image, an array of height x width x 3 bytes
+            - compression (int): The zlib compression level
+
+        Returns:
+            - bytes: The PNG file
+    """
+    height, width, _ = pixels.shape
+
+    # Each row starts with its filter type (0, no filter)
+    rows = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    rows[:, 1:] = pixels.reshape(height, width * 3)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+
+    return (PNG_SIGNATURE + get_png_chunk(b"IHDR", header) + get_png_chunk(b"IDAT", zlib.compress(rows.tobytes(), compression))
+            + get_png_chunk(b"IEND", b""))
+
+
+class FrameCapture:
+    """ The FrameCapture class is responsible for recording the frames drawn by the game (e.g. to attach a session to a bug report).
+        The game loop only copies the pixels of the frame into a buffer of a preallocated pool (a numpy array, through a surfarray view of the frame),
+        a worker thread encodes the buffers in order and gives them back to the pool. When every buffer is waiting to be encoded the frame is dropped,
+        so the game loop never waits for the compression (zlib releases the GIL while it compresses).
+
+        The frames are written as a PNG sequence (frame_000001.png, ...) or as a raw RGB24 video stream (frames.rgb) in the capture directory,
+        with a capture.json file describing the recording (size, frame rate and the frames written and dropped).
+
+        The class has the following attributes:
+            - directory: The directory of the recording
+            - format: The format of the recording (png or raw)
+            - every: The number of frames between two captured frames (1 captures every frame)
+            - frame_count: The number of frames shown since the capture started
+            - captured: The number of frames copied to the pool
+            - dropped: The number of frames not captured because the pool was full
+            - size: The size of the captured frames (the size of the first frame)
+            - free_buffers: The buffers of the pool that can be written
+            - pending: The buffers waiting to be encoded, with the number of their frame
+            - raw_file: The file of the raw video stream (None in the png format)
+            - worker: The thread that encodes the frames
+    """
+
+    def __init__(self, directory, format="png", every=1, pool_size=CAPTURE["POOL_SIZE"]) -> None:
+        """ Initializes a new instance of the FrameCapture class and starts the worker thread
+
+            Args:
+                - directory (str): The directory of the recording, it is created if it doesn't exist
+                - format (str): The format of the recording (png or raw)
+                - every (int): The number of frames between two captured frames
+                - pool_size (int): The number of buffers of the pool
+        """
+        if format not in CAPTURE_FORMATS:
+            raise ValueError(f"Unknown capture format: {format}")
+
+        os.makedirs(directory, exist_ok=True)
+
+        self.directory = directory
+        self.format = format
+        self.every = max(1, every)
+        self.frame_count = 0
+        self.captured = 0
+        self.dropped = 0
+        self.size = None
+        self.free_buffers = queue.Queue()
+        self.pending = queue.Queue()
+        self.raw_file = open(os.path.join(directory, "frames.rgb"), "wb") if format == "raw" else None
+
+        for _ in range(pool_size):
+            self.free_buffers.put(None)
+
+        self.worker = threading.Thread(target=self.encode_frames, name="frame_capture", daemon=True)
+        self.worker.start()
+
+    def capture(self, surface):
+        """ The capture method is responsible for copying a frame into a buffer of the pool, it is called when a frame is shown.
+            The frames with a size different from the first frame are dropped (e.g. a texture backend window that was resized).
+
+            Args:
+                - surface (Surface): The surface with the frame
+        """
+        self.frame_count += 1
+
+        if (self.frame_count - 1) % self.every != 0:
+            return
+
+        width, height = surface.get_size()
+
+        if self.size is None:
+            self.size = (width, height)
+
+        try:
+            buffer = self.free_buffers.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return
+
+        if (width, height) != self.size:
+            self.free_buffers.put(buffer)
+            self.dropped += 1
+            return
+
+        # The buffers are allocated the first time they are used and reused after
+        if buffer is None:
+            buffer = np.empty((width, height, 3), dtype=np.uint8)
+
+        self.copy_pixels(surface, buffer)
+        self.captured += 1
+        self.pending.put((self.frame_count, buffer))
+
+    def copy_pixels(self, surface, buffer):
+        """ The copy_pixels method is responsible for copying the RGB pixels of a surface into a buffer (width x height x 3).
+
+            Args:
+                - surface (Surface): The surface with the frame
+                - buffer (ndarray): The buffer of the pool
+        """
+        try:
+            # The view references the pixels of the surface (no copy), the surface is locked until the view is released
+            view = pg.surfarray.pixels3d(surface)
+            np.copyto(buffer, view)
+            del view
+        except ValueError:
+            # The surfaces with less than 24 bits per pixel can't be viewed
+            buffer[:] = pg.surfarray.array3d(surface)
+
+    def encode_frames(self):
+        """ The encode_frames method is run by the worker thread, it encodes the buffers in order until the capture is closed."""
+        while True:
+            item = self.pending.get()
+
+            if item is None:
+                break
+
+            frame, buffer = item
+
+            # The buffer is width x height, the images are stored row by row
+            pixels = buffer.transpose(1, 0, 2)
+
+            try:
+                if self.raw_file is not None:
+                    self.raw_file.write(np.ascontiguousarray(pixels).tobytes())
+                else:
+                    with open(os.path.join(self.directory, f"frame_{frame:06}.png"), "wb") as file:
+                        file.write(encode_png(pixels))
+            except OSError as error:
+                print(f"The frame {frame} could not be written: {error}")
+
+            self.free_buffers.put(buffer)
+
+    def close(self):
+        """ The close method is responsible for encoding the frames waiting in the pool, stopping the worker thread and writing the description of the recording."""
+        self.pending.put(None)
+        self.worker.join()
+
+        if self.raw_file is not None:
+            self.raw_file.close()
+
+        width, height = self.size or (0, 0)
+        description = {"format": self.format,
+                       "width": width,
+                       "height": height,
+                       "fps": FPS / self.every,
+                       "frames": self.captured,
+                       "dropped": self.dropped
+                      }
+
+        if self.format == "raw":
+            # e.g. ffmpeg -f rawvideo -pixel_format rgb24 -video_size 800x277 -framerate 60 -i frames.rgb session.mp4
+            description["pixel_format"] = "rgb24"
+
+        with open(os.path.join(self.directory, "capture.json"), "w") as file:
+            json.dump(description, file, indent=4)
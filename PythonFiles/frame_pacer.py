@@ -0,0 +1,82 @@
+from consts import FPS, TIME, FRAME_PACING
+
+
+class FramePacer:
+    """ The FramePacer class is responsible for keeping the game clock running at full speed when the frames take longer than the frame budget.
+        The simulation always runs, but when a frame goes over the budget the next frame is not drawn (frame skipping).
+        When the load is sustained the optional work is lowered as well: the animations advance less often and the HUD labels are rendered less often.
+
+        The class has the following attributes:
+            - frame_budget: The time available for each frame in milliseconds
+            - load: The moving average of the frame time divided by the frame budget
+            - render_frame: A flag indicating whether the next frame is drawn
+            - skipped_frames: The number of frames that were not drawn (metric)
+            - consecutive_skips: The number of frames not drawn in a row
+            - degraded: A flag indicating whether the optional work is lowered
+            - animation_delay_scale: The factor applied to the delay between animation frames
+            - hud_refresh_interval: The number of frames between two renders of the HUD labels
+    """
+
+    def __init__(self, fps=FPS) -> None:
+        """ Initializes a new instance of the FramePacer class
+
+            Args:
+                - fps (int): The frames per second of the game
+        """
+        self.frame_budget = TIME["ONE_SECOND"] / fps
+        self.load = 0.0
+        self.render_frame = True
+        self.skipped_frames = 0
+        self.consecutive_skips = 0
+        self.degraded = False
+        self.animation_delay_scale = 1
+        self.hud_refresh_interval = 1
+
+    def register_frame(self, frame_time):
+        """ The register_frame method is responsible for measuring the headroom of the last frame and deciding whether the next frame is drawn.
+
+            Args:
+                - frame_time (int): The time spent in the last frame without the time waiting for the frame cap, in milliseconds
+
+            Returns:
+                - bool: A flag indicating whether the level of optional work changed
+        """
+        self.load += (frame_time / self.frame_budget - self.load) * FRAME_PACING["SMOOTHING"]
+
+        # Skip the drawing of the next frame when the last one went over the budget, but never too many frames in a row
+        if frame_time > self.frame_budget and self.consecutive_skips < FRAME_PACING["MAX_CONSECUTIVE_SKIPS"]:
+            self.render_frame = False
+            self.skipped_frames += 1
+            self.consecutive_skips += 1
+        else:
+            self.render_frame = True
+            self.consecutive_skips = 0
+
+        # The thresholds are different to avoid switching the level of optional work on every frame
+        if not self.degraded and self.load > FRAME_PACING["HIGH_LOAD"]:
+            self.set_degraded(True)
+            return True
+
+        if self.degraded and self.load < FRAME_PACING["LOW_LOAD"]:
+            self.set_degraded(False)
+            return True
+
+        return False
+
+    def set_degraded(self, degraded):
+        """ The set_degraded method is responsible for lowering or restoring the optional work.
+
+            Args:
+                - degraded (bool): A flag indicating whether the optional work is lowered
+        """
+        self.degraded = degraded
+        self.animation_delay_scale = FRAME_PACING["ANIMATION_DELAY_SCALE"] if degraded else 1
+        self.hud_refresh_interval = FRAME_PACING["HUD_REFRESH_INTERVAL"] if degraded else 1
+
+    def get_metrics(self):
+        """ The get_metrics method is responsible for returning the metrics of the frame pacing.
+
+            Returns:
+                - dict: The number of skipped frames, the load and whether the optional work is lowered
+        """
+        return {"skipped_frames": self.skipped_frames, "load": self.load, "degraded": self.degraded}
@@ -1,23 +1,41 @@
+from startup_trace import STARTUP_TRACE, PROCESS_START
 import pygame as pg
 import finite_state_machine as fsm
 from game_map import Map
 from player import Player
 from kirby import Kirby
 from observer import Observer
-from sound_player import SoundPlayer
+from sound_player import SoundPlayer, MusicPlayer
 from camera import Camera
-from consts import SCREEN_DIMENSIONS, FPS, TIME, GAME_EVENTS, FONT_PATH, FONT_SIZE, COLORS, KIRBIES_SPAWN_POSITIONS, MENUS_TEXT_FILE_PATHS
+from consts import SCREEN_DIMENSIONS, FPS, TIME, GAME_EVENTS, FONT_PATH, FONT_SIZE, COLORS, LEVEL_PATHS, KIRBY_MOVEMENT, KIRBY_COLLIDER, KIRBY_AI_MODES, MENUS_TEXT_FILE_PATHS, MUSIC, SOUND_EFFECTS, METRICS, SCALE_MODES, RENDER_LAYERS
 from game_ui import UI
-from command import InputHandler
+from command import InputHandler, ACTION_BITS
 from peach import Peach
+from animator import Animator
+from frame_pacer import FramePacer
+from render_backend import RENDER_BACKENDS
+from metrics import MetricsExporter
+from spectator import SpectatorServer
+from frame_capture import FrameCapture, CAPTURE_FORMATS
+from state_hash import StateHashRecorder
+from scheduler import Scheduler
+from animation_system import AnimationSystem
+from sprite_registry import SpriteRegistry
+from particles import ParticleSystem
+from render_queue import RenderQueue
+from navigation import Navigator
+import argparse
 import os
 import json
+import threading
+from pygame import mixer
 
 class Game:
     """ This class represents the game and manages the game states,and its atributtes.
 
         Attributes:
-            - window: The game window.
+            - window: The surface where the game is drawn.
+            - render_backend: The rendering backend that draws the level and shows the frames on the window.
             - clock: The game clock.
             - map: The game map.
             - fsm: The game finite state machine.
@@ -25,15 +43,31 @@ class Game:
             - ui: The game user interface.
             - audio_players: The game audio players.
             - camera: The game camera.
-            - delta_time: The game delta time.
-            - all_sprites: The game sprites.
+            - scheduler: The scheduler of the timers of the level, its time is the simulation time of the level.
+            - animation_system: The system that advances the animations of the sprites with the simulation time of the level.
+            - particles: The particle effects of the level (stomps, deaths and jumps).
+            - render_queue: The queue that gathers everything drawn in a frame of the level and draws it with one blits call.
+            - clock_type: The class used to create the game clock (pygame.time.Clock by default).
+            - frame_pacer: The frame pacer, it decides which frames are drawn and the level of optional work.
+            - all_sprites: The game sprites, a registry that keeps the sprites of each type.
+            - peach: The peach sprite of the level.
+            - kirbies: The kirbies of the level in spawn order (the dead kirbies are removed from all_sprites but kept here for restarts).
+            - kirby_ai: The behavior of the kirbies (patrol, or chase the player through the map).
+            - navigator: The navigator that finds the paths of the kirbies when they chase the player (None when they patrol).
             - _instance: The game instance.
             - start_menu_text: The game start menu text.
             - end_game_text: The game end game text.
+            - fonts: The fonts of the menus (title and text), loaded once.
+            - input_handler: The input handler, it keeps the pressed actions updated from the keyboard events.
+            - audio_loader: The thread that initializes the mixer and decodes the sound effects in the background.
+            - metrics: The metrics exporter, it records the runtime telemetry when the game is started with --metrics (None otherwise).
+            - frame_capture: The recorder of the frames shown when the game is started with --capture (None otherwise).
+            - state_hash: The recorder of the checksum of the simulation state of every tick when the game is started with --state-hash (None otherwise).
+            - spectator_server: The server that streams the state of the game to the spectators when the game is started with --spectator-port or --spectator-socket (None otherwise).
     """
     _instance = None
 
-    def __new__(cls):
+    def __new__(cls, *args, **kwargs):
         """
         Creates a new instance of the game if it does not exist.
         
@@ -48,13 +82,19 @@ class Game:
 
         return cls._instance
     
-    def __init__(self) -> None:
+    def __init__(self, render_backend="surface", scale_mode="window") -> None:
         """
         Initializes a new instance of the game, and setups the window, cllock, fsm, atributtes.
+
+        Args:
+            - render_backend (str): The name of the rendering backend (surface or texture).
+            - scale_mode (str): How the frame is shown on the window (window, resizable or fullscreen).
         """
         if not self.__initialized:
-            self.window = self.setup_pygame()
+            self.window = self.setup_pygame(render_backend, scale_mode)
             self.clock = None
+            self.clock_type = pg.time.Clock
+            self.frame_pacer = FramePacer()
             self.map = None
             self.fsm = fsm.FSM(self.set_states(), self.set_transitions())
             self.__initialized = True
@@ -62,21 +102,65 @@ class Game:
             self.ui = None
             self.audio_players = None
             self.camera = None
-            self.delta_time = 0
+            self.scheduler = Scheduler()
+            self.animation_system = AnimationSystem()
+            self.particles = ParticleSystem()
+            self.render_queue = RenderQueue()
             self.all_sprites = None
+            self.peach = None
+            self.kirbies = None
+            self.kirby_ai = "patrol"
+            self.navigator = None
             self.menu_text = None
             self.final_score_text = None
             self.player_won = False
+            self.metrics = None
+            self.spectator_server = None
+            self.frame_capture = None
+            self.state_hash = None
+
+            self.input_handler = InputHandler()
+
+            with STARTUP_TRACE.phase("fonts"):
+                self.fonts = self.load_fonts()
 
-    def setup_pygame(self):
+            self.audio_loader = threading.Thread(target=load_audio, name="audio_loader", daemon=True)
+            self.audio_loader.start()
+
+    def setup_pygame(self, render_backend, scale_mode="window"):
         """
-        The setup_pygame method initializes the pygame and its windows with the screen dimensions and title.
+        The setup_pygame method initializes the pygame and the rendering backend, that opens the window with the screen dimensions and title.
+
+        Args:
+            - render_backend (str): The name of the rendering backend (surface or texture).
+            - scale_mode (str): How the frame is shown on the window (window, resizable or fullscreen).
+
+        Returns:
+            - window (pygame.Surface): The surface where the game is drawn.
         """
-        pg.init()
-        window = pg.display.set_mode((SCREEN_DIMENSIONS["WIDTH"], SCREEN_DIMENSIONS["HEIGHT"]))
-        pg.display.set_caption("Super Bowser")
+        # Only the subsystems used by the game are initialized, the audio is initialized in the background (load_audio)
+        with STARTUP_TRACE.phase("pg.init"):
+            pg.display.init()
+            pg.font.init()
+
+        with STARTUP_TRACE.phase("display"):
+            self.render_backend = RENDER_BACKENDS[render_backend](scale_mode)
     
-        return window
+        return self.render_backend.surface
+
+    def load_fonts(self):
+        """
+        The load_fonts method is responsible for loading the fonts of the menus.
+
+        Returns:
+            - fonts (dict): The title and text fonts.
+        """
+        font_path = os.path.join(os.path.dirname(__file__), FONT_PATH)
+
+        title_font = pg.font.Font(font_path, FONT_SIZE)
+        title_font.bold = True
+
+        return {"TITLE": title_font, "TEXT": pg.font.Font(font_path, FONT_SIZE - 1)}
     
     def set_states(self):
         """
@@ -114,37 +198,70 @@ class Game:
 
         An observer is used to observe the game , and if a event is triggered, the observer will notify the game.
         """
+        # The paths requested by the kirbies in the last tick are searched within the budget of the tick
+        if self.navigator is not None:
+            self.navigator.update()
+
         self.all_sprites.update()
         self.camera.update(self.player)
-        self.delta_time += self.clock.tick(FPS)
+        elapsed_time = self.clock.tick(FPS)
+        self.pace_frame()
+
+        if self.metrics is not None:
+            self.metrics.record_frame(self.clock.get_rawtime())
         self.observer.observe(self.all_sprites)
-     
-        if self.delta_time >= TIME["ONE_SECOND"]:
-            self.ui.update_timer()
-            game_time = self.ui.time
-            self.observer.observe_time_envents(game_time)
-            self.delta_time -= TIME["ONE_SECOND"]
+
+        # The timers of the level (countdown, time alert and timeout) and the animations only advance while the level is played
+        self.scheduler.advance(elapsed_time)
+        self.animation_system.update(elapsed_time, self.all_sprites)
+        self.particles.update(elapsed_time)
+
+        # The sprites despawned during the tick (e.g. the killed kirbies) are removed once the group is not iterated
+        self.all_sprites.flush()
+
+        if self.state_hash is not None:
+            self.state_hash.record(self)
+
+    def schedule_level_timers(self):
+        """
+        The schedule_level_timers method is responsible for rewinding the scheduler and the animations time, removing the particles and scheduling the timers of the level:
+        the countdown of the HUD every second, and the time alert and timeout events.
+        """
+        self.scheduler.clear()
+        self.animation_system.reset()
+        self.particles.clear()
+        self.scheduler.schedule(TIME["ONE_SECOND"], self.ui.update_timer, repeat=True)
+        self.observer.schedule_time_events(self.scheduler)
+
+    def pace_frame(self):
+        """
+        The pace_frame method is responsible for registering the time of the last frame in the frame pacer.
+        When the level of optional work changes, the animations delay and the HUD refresh interval are updated.
+        """
+        if self.frame_pacer.register_frame(self.clock.get_rawtime()):
+            Animator.delay_scale = self.frame_pacer.animation_delay_scale
+            self.ui.refresh_interval = self.frame_pacer.hud_refresh_interval
 
     def setup_sprites(self):
         """
         The setup_sprites method is responsible for adding the sprites of the player and the enemies (kirbies).
 
         Returns:
-            - all_sprites (pygame.sprite.Group): The group of all game sprites.
+            - all_sprites (SpriteRegistry): The group of all game sprites.
         """
-        all_sprites = pg.sprite.Group()
+        all_sprites = SpriteRegistry()
     
         player = Player()
         all_sprites.add(player)
 
 
-        peach = Peach()
+        peach = Peach(self.map.level.peach_position)
         all_sprites.add(peach)
        
         first_kirby = None
 
-        for kirby_position in KIRBIES_SPAWN_POSITIONS:
-            if KIRBIES_SPAWN_POSITIONS.index(kirby_position) == 0:
+        for index, kirby_position in enumerate(self.map.level.kirbies_positions):
+            if index == 0:
                 first_kirby = Kirby(kirby_position)
                 all_sprites.add(first_kirby)
             else:
@@ -154,19 +271,145 @@ class Game:
 
         return all_sprites       
      
-    def setup_game_level(self):
+    def setup_game_level(self, level=0):
         """
         The setup_game_level method is responsible for setting up the game level by initializing the map, sprites, player, camera, observer, and audio players.
+
+        Args:
+            - level (int): The index of the level played.
         """
-        self.map = Map()
-        self.all_sprites = self.setup_sprites()  
-        self.player = next(sprite for sprite in self.all_sprites if isinstance(sprite, Player)) 
-        self.camera = Camera(SCREEN_DIMENSIONS["WIDTH"], SCREEN_DIMENSIONS["HEIGHT"])
-        self.observer = Observer()
-        self.audio_players = get_audio_players()
-        self.delta_time = 0
-        self.ui = UI()
-        self.clock = pg.time.Clock()
+        with STARTUP_TRACE.phase("assets"):
+            self.map = Map()
+
+            if self.map.level.index != level:
+                self.map.change_level(level)
+
+            self.all_sprites = self.setup_sprites()  
+            self.player = self.all_sprites.get_first(Player)
+            self.peach = self.all_sprites.get_first(Peach)
+            self.kirbies = self.all_sprites.get_sprites(Kirby)
+            self.camera = Camera(SCREEN_DIMENSIONS["WIDTH"], SCREEN_DIMENSIONS["HEIGHT"])
+            self.observer = Observer()
+            self.ui = UI()
+
+            if self.kirby_ai == "chase":
+                self.navigator = Navigator(self.map, KIRBY_MOVEMENT["CHASE_SPEED"], KIRBY_MOVEMENT["JUMP_SPEED"], KIRBY_COLLIDER[0])
+                Kirby.navigator = self.navigator
+                Kirby.target = self.player
+
+        # Wait until the mixer is initialized in the background
+        with STARTUP_TRACE.phase("audio wait"):
+            self.audio_loader.join()
+            self.audio_players = get_audio_players()
+
+        self.schedule_level_timers()
+        self.player.commands_provider = self.input_handler.get_active_commands
+        self.clock = self.clock_type()
+        self.preload_textures()
+        self.map.preload_level(self.get_next_level())
+
+    def restart_level(self, level=0):
+        """
+        The restart_level method is responsible for restarting the game in place from a level (the first one by default), restoring every entity to its spawn state
+        and rewinding the HUD and timers. The sprites, the map, the clock, the audio players and every loaded asset are reused, so the restart takes less than a frame.
+
+        Args:
+            - level (int): The index of the level played.
+        """
+        if self.map.level.index != level:
+            self.map.change_level(level)
+            self.map.preload_level(self.get_next_level())
+
+        self.spawn_level_entities()
+        self.ui.reset_labels_values()
+        self.schedule_level_timers()
+        self.player_won = False
+
+        # Discard the time spent in the menu
+        self.clock.tick()
+
+        self.audio_players[0].play("overworld_theme", MUSIC["FADE_MS"])
+
+    def spawn_level_entities(self):
+        """
+        The spawn_level_entities method is responsible for restoring the player, the peach and the kirbies to the spawn state of the level loaded in the map.
+        The kirbies are reused (cloned when the level has more kirbies, released when it has less), the list is changed in place.
+        """
+        level = self.map.level
+        self.player.reset()
+        self.peach.rect.topleft = level.peach_position
+
+        while len(self.kirbies) < len(level.kirbies_positions):
+            self.kirbies.append(self.kirbies[0].clone())
+
+        for kirby in self.kirbies[len(level.kirbies_positions):]:
+            kirby.release()
+
+        del self.kirbies[len(level.kirbies_positions):]
+
+        for kirby, kirby_position in zip(self.kirbies, level.kirbies_positions):
+            kirby.reset(kirby_position)
+
+        # The dead kirbies were removed from the group, the sprites are added again in the same order as in setup_sprites
+        self.all_sprites.empty()
+        self.all_sprites.add(self.player, self.peach, *self.kirbies)
+
+        if self.navigator is not None:
+            self.navigator.clear()
+
+        self.camera.update(self.player)
+
+    def get_next_level(self):
+        """
+        The get_next_level method returns the index of the level played after the current one, the first level after the last one (the game is restarted from it).
+
+        Returns:
+            - int: The index of the next level.
+        """
+        return (self.map.level.index + 1) % len(LEVEL_PATHS)
+
+    def has_next_level(self):
+        """
+        The has_next_level method checks if the current level is not the last one.
+
+        Returns:
+            - bool: A flag indicating whether there is a next level.
+        """
+        return self.map.level.index + 1 < len(LEVEL_PATHS)
+
+    def start_next_level(self):
+        """
+        The start_next_level method is responsible for moving to the next level when the player reaches the peach, without a load screen:
+        the next level was prepared in the background while this one was played, the map swaps it in and the entities are moved to its spawn positions.
+        The score is kept, the timer and the timers of the level are rewound, and the level after it starts being prepared.
+        """
+        self.map.change_level(self.get_next_level())
+        self.spawn_level_entities()
+        self.ui.reset_timer()
+        self.schedule_level_timers()
+        self.map.preload_level(self.get_next_level())
+
+    def is_level_loaded(self):
+        """
+        The is_level_loaded method checks if a level was set up and can be restarted in place.
+
+        Returns:
+            - bool: A flag indicating whether the level is loaded.
+        """
+        return self.player is not None and self.all_sprites is not None
+
+    def preload_textures(self):
+        """
+        The preload_textures method is responsible for giving the rendering backend the surfaces of the map, the sprites and the animations cache,
+        so a texture backend uploads them once before the level is drawn.
+        """
+        surfaces = [self.map.floor_block_sprite] + [sprite.image for sprite in self.all_sprites]
+
+        for frames, flipped_frames in Animator._animations.values():
+            surfaces.extend(frames)
+            surfaces.extend(flipped_frames)
+
+        self.render_backend.preload(surfaces)
  
     def display_start_menu(self):
         """
@@ -188,10 +431,8 @@ class Game:
 
         y_offset = SCREEN_DIMENSIONS["HEIGHT"] // 2 - 100
         
-        title_font = pg.font.Font(os.path.join(os.path.dirname(__file__), FONT_PATH),FONT_SIZE)
-        title_font.bold = True
-       
-        text_font = pg.font.Font(os.path.join(os.path.dirname(__file__), FONT_PATH), FONT_SIZE - 1)
+        title_font = self.fonts["TITLE"]
+        text_font = self.fonts["TEXT"]
 
         for line in self.menu_text:
             if title_font is not None:
@@ -238,8 +479,6 @@ class Game:
         if self.final_score_text is None and self.player_won:
             self.load_score_text()
 
-        self.clear_level()
-
         if self.menu_text is None:
             text_path = MENUS_TEXT_FILE_PATHS["END_GAME_MENU"] if self.player_won else MENUS_TEXT_FILE_PATHS["GAME_OVER_MENU"]
             self.load_menu_text_file(text_path)
@@ -284,13 +523,24 @@ class Game:
     def clear_level(self):
         """
         Clears the current game level by resetting the map, sprites, player, camera, observer, and audio players.
+        The game over screen keeps the level loaded to restart it in place (restart_level), this method unloads it.
         """
         self.map = None
+
+        # The dead kirbies are not in the group anymore, their images are released too
+        for sprite in set(self.all_sprites) | set(self.kirbies or ()):
+            sprite.release()
+
         self.all_sprites.empty()
         self.player = None
+        self.peach = None
+        self.kirbies = None
+        self.navigator = None
+        Kirby.navigator = None
+        Kirby.target = None
         self.camera = None
         self.observer = None
-        self.delta_time = None
+        self.scheduler.clear()
         self.game_over_text = None
         self.clock = None
   
@@ -301,38 +551,67 @@ def update_display(game):
     Updates the game display based on the current FSM state.
     """
     if game.fsm.current == game.playing:
-        game.window.fill(COLORS["BACKGROUND"])
-        game.map.draw(game.window, game.camera)
+        # The frame pacer skips the drawing (not the simulation) of a frame when the last frame went over the budget
+        if not game.frame_pacer.render_frame:
+            return
+
+        render_backend = game.render_backend
+        render_queue = game.render_queue
+
+        render_backend.fill(COLORS["BACKGROUND"])
+
+        # The map, the sprites, the particles and the HUD are drawn in layer order with one blits call
+        game.map.queue_tiles(render_queue, game.camera)
+        render_queue.extend(RENDER_LAYERS["SPRITES"], [(sprite.image, sprite.rect) for sprite in game.all_sprites])
+        game.particles.queue_particles(render_queue)
+        game.ui.queue_labels(render_queue)
 
-        for sprite in game.all_sprites:
-            game.window.blit(sprite.image, game.camera.apply(sprite))
-        game.ui.draw_labels(game.window)
+        render_queue.flush(render_backend, game.camera.get_offset())
 
-    pg.display.flip()
+        # The frame is captured before it is presented (the renderer of the texture backend can only be read before)
+        if game.frame_capture is not None:
+            game.frame_capture.capture(render_backend.get_frame())
+
+        render_backend.present()
+    else:
+        if game.frame_capture is not None:
+            game.frame_capture.capture(game.window)
+
+        # The menus are drawn on the game window surface
+        game.render_backend.present_surface(game.window)
 
 def event_handler(running, game):
     """
     Handles game events such as key presses and custom game events.
     """
-    input_handler = InputHandler()
     for event in pg.event.get(): 
         if event.type == pg.QUIT:
             running = False
 
+        game.input_handler.handle_event(event)
+
+        if game.metrics is not None:
+            game.metrics.count_event(event.type)
+
         if event.type == pg.KEYDOWN:
-            input_handler.handle_input(event.key, game.player)
+            action = game.input_handler.get_action(event.key)
             
-            if event.key == pg.K_RETURN and game.fsm.current == game.game_over:
-                game.ui.reset_labels_values()
+            if action == ACTION_BITS["confirm"] and game.fsm.current == game.game_over:
                 game.final_score_text = None
-                game.setup_game_level()
+
+                if game.is_level_loaded():
+                    game.restart_level()
+                else:
+                    game.ui.reset_labels_values()
+                    game.setup_game_level()
+
                 game.fsm.update("restart_game", game)
 
-            elif event.key == pg.K_RETURN and game.fsm.current == game.start_menu:
+            elif action == ACTION_BITS["confirm"] and game.fsm.current == game.start_menu:
                 game.setup_game_level()
                 game.fsm.update("start_game", game)
 
-            elif event.key == pg.K_ESCAPE:
+            elif action == ACTION_BITS["quit"]:
                 running = False
 
         elif event.type == GAME_EVENTS["QUIT_GAME_EVENT"]:
@@ -341,16 +620,15 @@ def event_handler(running, game):
 
         elif event.type == GAME_EVENTS["PLAYER_DEATH_EVENT"]: 
             game.audio_players[1].play("bowser_death")
-            player = next(sprite for sprite in game.all_sprites if isinstance(sprite, Player))
-            player.respawn()
+            game.particles.emit("DEATH", event.position)
+            game.player.respawn()
             game.ui.update_score(-50)
 
         elif event.type == GAME_EVENTS["TIMEOUT_EVENT"]:
-            game.clear_level()
             game.fsm.update("game_over", game)
             game.menu_text = None
 
-            game.audio_players[0].stop()
+            game.audio_players[0].stop(MUSIC["FADE_MS"])
             game.audio_players[1].play("game_over")
 
         elif event.type == GAME_EVENTS["TIME_ALERT_EVENT"]:
@@ -360,24 +638,39 @@ def event_handler(running, game):
 
         elif event.type == GAME_EVENTS["PLAYER_JUMP_EVENT"]:
             game.audio_players[1].play("jump")
+            game.particles.emit("JUMP", event.position)
+
+        elif event.type == GAME_EVENTS["END_GAME_EVENT"] and game.has_next_level():
+            game.start_next_level()
 
         elif event.type == GAME_EVENTS["END_GAME_EVENT"]:
             game.fsm.update("game_over", game)
             game.player_won = True
             game.menu_text = None
 
-            game.audio_players[0].stop()
+            game.audio_players[0].stop(MUSIC["FADE_MS"])
 
             game.audio_players[1].play("end_game")
     
         elif event.type == GAME_EVENTS["ENEMY_KILLED_EVENT"]:
+            # The killed kirby was despawned by the observer
             game.audio_players[1].play("enemy_killed")
+            game.particles.emit("STOMP", event.position)
+            game.ui.update_score(100)
 
-            for sprite in game.all_sprites:
-                if isinstance(sprite, Kirby) and sprite.dead: 
-                    game.all_sprites.remove(sprite)
+        elif event.type == GAME_EVENTS["MUSIC_END_EVENT"] and game.audio_players is not None:
+            game.audio_players[0].on_music_end()
 
-            game.ui.update_score(100)
+        # Pause the music while the game window is not focused
+        elif event.type == pg.WINDOWFOCUSLOST and game.audio_players is not None:
+            game.audio_players[0].pause()
+
+        elif event.type == pg.WINDOWFOCUSGAINED and game.audio_players is not None:
+            game.audio_players[0].resume()
+
+        # The scaled frame is fitted to the new window size
+        elif event.type == pg.VIDEORESIZE:
+            game.render_backend.resize(event.size)
 
     return running
 
@@ -385,11 +678,22 @@ def get_audio_players():
     """
     Initializes and returns the audio players for music and sound effects.
     """
-    music_player = SoundPlayer(["overworld_theme"], True)
-    music_player.play("overworld_theme")
-    sound_effecter = SoundPlayer(["jump","bowser_death","time_warning", "enemy_killed", "end_game","game_over"], False)
+    music_player = MusicPlayer(["overworld_theme"])
+    music_player.play("overworld_theme", MUSIC["FADE_MS"])
+    sound_effecter = SoundPlayer(SOUND_EFFECTS, False)
     return [music_player, sound_effecter]
 
+def load_audio():
+    """
+    Initializes the mixer and decodes the sound effects, it runs in a background thread while the start menu is shown.
+    """
+    with STARTUP_TRACE.phase("audio"):
+        mixer.init()
+        sound_effecter = SoundPlayer(SOUND_EFFECTS, False)
+
+        for sound_effect in SOUND_EFFECTS:
+            sound_effecter.get_sound(sound_effect)
+
 def game_loop(game):
     """
     Main game loop that handles the game states and updates the display.
@@ -408,14 +712,81 @@ def game_loop(game):
 
         running = event_handler(running, game)
         update_display(game)
-        
+
+        if game.metrics is not None:
+            game.metrics.update()
+
+        if game.spectator_server is not None:
+            game.spectator_server.publish(game)
+
+        STARTUP_TRACE.mark("first frame")
+
+        # The game is playable when the first frame of the level is drawn
+        if game.fsm.current == game.playing and game.frame_pacer.render_frame:
+            STARTUP_TRACE.mark("playable")
+            STARTUP_TRACE.report()
+
+    STARTUP_TRACE.report()
+
+    if game.metrics is not None:
+        game.metrics.close()
+
+    if game.spectator_server is not None:
+        game.spectator_server.close()
+
+    if game.frame_capture is not None:
+        game.frame_capture.close()
+
+    if game.state_hash is not None:
+        game.state_hash.close()
+
     pg.quit()
 
+def parse_arguments():
+    """
+    Parses the command line arguments of the game.
+    """
+    parser = argparse.ArgumentParser(description="Super Bowser")
+    parser.add_argument("--renderer", choices=RENDER_BACKENDS.keys(), default="surface", help="rendering backend (surface blits or SDL2 textures)")
+    parser.add_argument("--scale-mode", choices=SCALE_MODES, default="window", help="show the frame in a window of the screen size, or scaled to a resizable window or to the full screen")
+    parser.add_argument("--kirby-ai", choices=KIRBY_AI_MODES, default="patrol", help="the kirbies patrol their platforms or chase the player through the map")
+    parser.add_argument("--trace-startup", action="store_true", help="print the time spent in each phase of the startup")
+    parser.add_argument("--metrics", metavar="PATH", help="write the runtime metrics periodically to this file")
+    parser.add_argument("--metrics-format", choices=["json", "prometheus"], default="json", help="format of the metrics file (JSON lines or Prometheus text)")
+    parser.add_argument("--metrics-interval", type=float, default=METRICS["INTERVAL"], help="seconds between two snapshots of the metrics")
+    parser.add_argument("--capture", metavar="DIRECTORY", help="record the frames shown in this directory")
+    parser.add_argument("--capture-format", choices=CAPTURE_FORMATS, default="png", help="format of the recording (a PNG file per frame or a raw RGB24 video stream)")
+    parser.add_argument("--capture-every", type=int, default=1, metavar="N", help="record one frame of every N frames")
+    parser.add_argument("--state-hash", metavar="PATH", help="write the checksum of the simulation state of every tick to this trace (compared with python state_hash.py)")
+    parser.add_argument("--spectator-port", type=int, metavar="PORT", help="stream the state of the game to the spectators connected to this local TCP port")
+    parser.add_argument("--spectator-socket", metavar="PATH", help="stream the state of the game to the spectators connected to this Unix socket")
+
+    return parser.parse_args()
+
 def main():
     """
     Entry point for the game. Initializes the game and starts the game loop.
     """
-    game = Game()
+    STARTUP_TRACE.record("imports", PROCESS_START)
+
+    arguments = parse_arguments()
+    STARTUP_TRACE.enabled = arguments.trace_startup
+
+    game = Game(arguments.renderer, arguments.scale_mode)
+    game.kirby_ai = arguments.kirby_ai
+
+    if arguments.metrics:
+        game.metrics = MetricsExporter(game, arguments.metrics, arguments.metrics_format, arguments.metrics_interval)
+
+    if arguments.capture:
+        game.frame_capture = FrameCapture(arguments.capture, arguments.capture_format, arguments.capture_every)
+
+    if arguments.state_hash:
+        game.state_hash = StateHashRecorder(arguments.state_hash)
+
+    if arguments.spectator_port is not None or arguments.spectator_socket:
+        game.spectator_server = SpectatorServer(arguments.spectator_port, arguments.spectator_socket)
+
     game_loop(game)
 
 if __name__ == "__main__":
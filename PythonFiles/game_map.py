@@ -1,7 +1,10 @@
-import pygame as pg
 import os
+import bisect
 
-from consts import FLOOR_TILE_DIMENSIONS, FLOOR_BLOCK, FLOOR_BLOCK_SPRITE_PATH, PEACH_SPRITE_PATH
+from physics import TileCollisionSolver
+from image_cache import ImageCache
+from level_loader import LevelLoader, build_floor_blocks_colliders, build_floor_blocks_entries
+from consts import FLOOR_TILE_DIMENSIONS, FLOOR_BLOCK, FLOOR_BLOCK_SPRITE_PATH, PEACH_SPRITE_PATH, RENDER_LAYERS
 
 class Map:
     """ The Map class is responsible for creating the game map and drawing it on the screen.
@@ -14,7 +17,13 @@ class Map:
             - tile_per_row (int): The number of tiles per row
             - tile_per_col (int): The number of tiles per column
             - map (list of lists): The game map
+            - level (Level): The level loaded in the map
+            - level_loader (LevelLoader): The loader that prepares the levels in the background
             - floor_blocks_colliders (list): The list of floor block colliders
+            - floor_blocks_entries (list): The floor block sprite and the position of each floor block, sorted by column (render queue entries)
+            - floor_blocks_columns (list): The column (x) of each entry of floor_blocks_entries
+            - collision_solver (TileCollisionSolver): The solver that moves the entities through the tile grid of the map
+            - version (int): The number of changes of the map tiles, the data built from the tiles is built again when it changes
     """
 
     _instance = None
@@ -45,50 +54,115 @@ class Map:
         if hasattr(self, '_initialized') and self._initialized:
             return
         
-        self.floor_block_sprite = pg.image.load(os.path.join(os.path.dirname(__file__), FLOOR_BLOCK_SPRITE_PATH)).convert_alpha()
-        self.peach = pg.image.load(os.path.join(os.path.dirname(__file__), PEACH_SPRITE_PATH)).convert_alpha()
-
-        self.map = [[],
-                    [],
-                    [],
-                    [],
-                    [],
-                    [None] * 60 + [FLOOR_BLOCK] * 10,
-                    [],
-                    [], 
-                    [None] * 47 + [FLOOR_BLOCK] * 10 + [None] * 16 + [FLOOR_BLOCK] * 10,
-                    [], 
-                    [],
-                    [None] * 34 + [FLOOR_BLOCK] * 10 + [None] * 16 + [FLOOR_BLOCK] * 10, 
-                    [],
-                    [None] * 90,
-                    [FLOOR_BLOCK] * 31 + [None] * 56 + [FLOOR_BLOCK] * 5,
-        ]
-
-        self.floor_blocks_colliders = []
+        # The images are shared with the sprites through the image cache (e.g. the peach image of the map and of the Peach sprite)
+        self.floor_block_sprite = ImageCache.acquire(os.path.join(os.path.dirname(__file__), FLOOR_BLOCK_SPRITE_PATH))
+        self.peach = ImageCache.acquire(os.path.join(os.path.dirname(__file__), PEACH_SPRITE_PATH))
+
+        # The map starts with the first level, the next levels are prepared in the background and swapped in (change_level)
+        self.collision_solver = TileCollisionSolver([], one_way_tiles=(FLOOR_BLOCK,))
+        self.version = 0
+        self.level_loader = LevelLoader(self.floor_block_sprite)
+        self.load_level(self.level_loader.get(0))
         self.peach_collider = None
         self._initialized = True
 
+    def load_level(self, level):
+        """ The load_level method is responsible for swapping in a prepared level: its tiles, colliders, render entries and collision grid.
+            Nothing is built here, so the swap takes a few microseconds. The tiles and the collision grid are copied (set_tile changes them in place),
+            the collision solver is kept, so the entities that share it move through the new level. The version of the map is increased.
+
+            Args:
+                - level (Level): The prepared level
+        """
+        self.level = level
+        self.map = [row[:] for row in level.tiles]
+        self.floor_blocks_colliders = level.floor_blocks_colliders
+        self.floor_blocks_entries = level.floor_blocks_entries
+        self.floor_blocks_columns = level.floor_blocks_columns
+        self.collision_solver.cells = [row[:] for row in level.cells]
+        self.version += 1
+
+    def change_level(self, index):
+        """ The change_level method is responsible for loading a level, it waits for the level loader if the level is not prepared yet.
+
+            Args:
+                - index (int): The index of the level
+        """
+        self.load_level(self.level_loader.get(index))
+
+    def preload_level(self, index):
+        """ The preload_level method is responsible for preparing a level in the background (e.g. the next level while the current one is played).
+
+            Args:
+                - index (int): The index of the level
+        """
+        self.level_loader.preload(index)
+
+    def build_floor_blocks_entries(self):
+        """ The build_floor_blocks_entries method is responsible for creating the render queue entries of the floor blocks, sorted by column
+            so the visible blocks are found with a binary search.
+        """
+        self.floor_blocks_entries, self.floor_blocks_columns = build_floor_blocks_entries(self.floor_block_sprite, self.floor_blocks_colliders)
+
+    def set_tile(self, column, row, tile):
+        """ The set_tile method is responsible for changing a tile of the map (e.g. a block added or broken).
+            The colliders, the render entries and the collision grid are updated, and the version of the map is increased
+            so the data built from the map (e.g. the navigation grid) is built again.
+
+            Args:
+                - column (int): The column of the tile
+                - row (int): The row of the tile
+                - tile (object): The new tile (FLOOR_BLOCK, or None to remove the tile)
+        """
+        while row >= len(self.map):
+            self.map.append([])
+
+        tiles_row = self.map[row]
+
+        if column >= len(tiles_row):
+            tiles_row.extend([None] * (column + 1 - len(tiles_row)))
+
+        tiles_row[column] = tile
+
+        self.floor_blocks_colliders = self.build_floor_blocks_colliders()
+        self.build_floor_blocks_entries()
+        self.collision_solver.set_tile(column, row, tile)
+        self.version += 1
+
+    def build_floor_blocks_colliders(self):
+        """ The build_floor_blocks_colliders method is responsible for creating the colliders of the floor blocks of the map (FLOOR_BLOCK).
+            The colliders are created once, so the collisions don't depend on the map being drawn (e.g. headless sessions).
+
+            Returns:
+                - list: The list of floor block colliders
+        """
+        return build_floor_blocks_colliders(self.map)
+
     def draw(self, window, camera):
         """ The draw method is responsible for drawing the game map on the screen.
-            It iterates over the map list and draws the tiles in their positions (FLOOR_BLOCK) on the screen.
-            The list with the floor block colliders is also updated in this method.
+            It draws the floor block sprite in the position of each floor block collider.
 
             Args:
                 - window (Surface): The game window
                 - camera (Camera): The camera object
         """
-        for row_index, row in enumerate(self.map):
-            for column_index, floor_block__index in enumerate(row):
+        for floor_block_collider in self.floor_blocks_colliders:
+            window.blit(self.floor_block_sprite, camera.apply(floor_block_collider))
 
-                if floor_block__index is FLOOR_BLOCK:  
-                    x, y = column_index * FLOOR_TILE_DIMENSIONS["WIDTH"], row_index * FLOOR_TILE_DIMENSIONS["HEIGHT"]
+    def queue_tiles(self, render_queue, camera):
+        """ The queue_tiles method is responsible for adding the floor blocks visible by the camera to the render queue.
 
-                    floor_block_collider = pg.Rect(x, y, FLOOR_TILE_DIMENSIONS["WIDTH"], FLOOR_TILE_DIMENSIONS["HEIGHT"])
+            Args:
+                - render_queue (RenderQueue): The render queue of the frame
+                - camera (Camera): The camera object
+        """
+        left = -camera.camera.x
+        right = left + camera.width
 
-                    self.floor_blocks_colliders.append(floor_block_collider)
+        first = bisect.bisect_right(self.floor_blocks_columns, left - FLOOR_TILE_DIMENSIONS["WIDTH"])
+        last = bisect.bisect_left(self.floor_blocks_columns, right)
 
-                    window.blit(self.floor_block_sprite, camera.apply(floor_block_collider))
+        render_queue.extend(RENDER_LAYERS["MAP"], self.floor_blocks_entries[first:last])
 
 
     def get_peach_position(self):
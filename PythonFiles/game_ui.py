@@ -1,4 +1,4 @@
-from consts import TIME, FONT_PATH, FONT_SIZE, COLORS
+from consts import TIME, FONT_PATH, FONT_SIZE, COLORS, RENDER_LAYERS
 import pygame as pg
 import os
 
@@ -13,6 +13,8 @@ class UI:
             - font (Font): The font used for the text
             - score_text_color (tuple): The color of the score text
             - timer_text_color (tuple): The color of the timer text
+            - refresh_interval (int): The number of frames between two renders of the labels, it is raised by the frame pacer when the game is under load
+            - labels (list): The rendered labels and their positions, reused until the next render
     """
 
     _instance = None
@@ -50,6 +52,9 @@ class UI:
         self.font  = pg.font.Font(os.path.join(os.path.dirname(__file__), FONT_PATH ), FONT_SIZE)
         self.score_text_color =  COLORS["WHITE"]
         self.timer_text_color =  COLORS["WHITE"]
+        self.refresh_interval = 1
+        self.frames_until_refresh = 0
+        self.labels = []
 
 
     def change_timer_text_color(self):
@@ -74,58 +79,76 @@ class UI:
         self.score  = self.score + points if self.score + points > 0 else 0
 
     def reset_labels_values(self):
+        self.reset_timer()
+        self.score = 0
+
+    def reset_timer(self):
+        """ The reset_timer function is responsible for restoring the time of a level and the color of the timer (e.g. when the next level starts), the score is kept."""
         self.time = TIME["GAME_TIME"]
         self.timer_text_color = COLORS["WHITE"]
-        self.score = 0
+        self.frames_until_refresh = 0
 
 
     def update_timer(self):
         """ The update_timer function is responsible for updating the time remaining in the game.
-            It decrements the time by the delta time.
-
-            Args:
-                - delta_time (int): The time elapsed since the last frame.
+            It decrements the time by one second, it is called every second of the level by the scheduler.
         """
 
         self.time = self.time - 1 if self.time - 1 > 0 else 0
 
-    def draw_timer_label(self,window):
-        """ The draw_timer_label function is responsible for drawing the timer label on the screen after 1 second has passed.
-            It also changes the color of the timer label when the time is running out, and plays a warning sound effect and the version of the music speed up.
-            It stops the music player and decremeting the time when the time is up.
+    def render_timer_label(self):
+        """ The render_timer_label function is responsible for rendering the timer label.
+            The color of the timer label changes when the time is running out.
 
-            Args:
-                - window (Surface): The game window object.
-                - delta_time (int): The time elapsed since the last frame.
+            Returns:
+                - list: The rendered labels and their positions
         """
 
         time_label = self.font.render(f"TIME", True, self.timer_text_color)
         timer_label = self.font.render(f"{self.time:03}", True, self.timer_text_color)
-            
-        window.blit(time_label, (700, 10))
-        window.blit(timer_label, (705, 25))
 
+        return [(time_label, (700, 10)), (timer_label, (705, 25))]
 
-    def draw_score_label(self,window):
-        """ The draw_score_label function is responsible for drawing the score label on the screen.
+    def render_score_label(self):
+        """ The render_score_label function is responsible for rendering the score label.
 
-            Args:
-                - window (Surface): The game window object.
+            Returns:
+                - list: The rendered labels and their positions
         """
 
         player_text = self.font.render("Bowser", True, self.score_text_color)
         score_label = self.font.render(f"{self.score:07}", True, self.score_text_color)
 
-        window.blit(player_text, (10, 10))
-        window.blit(score_label, (10, 25))
+        return [(player_text, (10, 10)), (score_label, (10, 25))]
+
+    def get_labels(self):
+        """ The get_labels function returns the score and timer labels drawn in a frame.
+            The labels are rendered again every refresh_interval frames, in the other frames the last rendered labels are returned.
+
+            Returns:
+                - list: The rendered labels and their positions
+        """
+        if self.frames_until_refresh <= 0:
+            self.labels = self.render_score_label() + self.render_timer_label()
+            self.frames_until_refresh = self.refresh_interval
+
+        self.frames_until_refresh -= 1
+
+        return self.labels
 
     def draw_labels(self,window):
-        """ The draw_ui_labels function is responsible for calling the methods to draw the score and timer labels on the screen.
+        """ The draw_ui_labels function is responsible for drawing the score and timer labels on the screen.
 
             Args:
                 - window (Surface): The game window object.
-                - delta_time (int): The time elapsed since the last frame.
         """
-        self.draw_score_label(window)
-        self.draw_timer_label(window)
+        for label, position in self.get_labels():
+            window.blit(label, position)
+
+    def queue_labels(self, render_queue):
+        """ The queue_labels function is responsible for adding the score and timer labels to the HUD layer of the render queue.
 
+            Args:
+                - render_queue (RenderQueue): The render queue of the frame
+        """
+        render_queue.extend(RENDER_LAYERS["HUD"], self.get_labels())
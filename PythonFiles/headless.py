@@ -0,0 +1,245 @@
+import os
+
+# The SDL drivers must be chosen before pygame is initialized, the dummy drivers don't open a window or an audio device
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import json
+import random
+import time
+import pygame as pg
+from consts import FPS, TIME, LEVEL_PATHS
+from game import Game, event_handler, update_display
+from command import ACTION_COMMANDS
+from state_hash import StateHashRecorder
+
+# Levels that can be played by a headless session (a session starts in its level and moves to the next ones as the game does)
+LEVELS = list(range(len(LEVEL_PATHS)))
+
+DEFAULT_MAX_FRAMES = (TIME["GAME_TIME"] + 1) * FPS
+
+
+class FixedStepClock:
+    """ The FixedStepClock class replaces the pygame.time.Clock in headless sessions.
+        Each tick advances the game time by exactly one frame (1000 / FPS milliseconds) without waiting, so the sessions run as fast as possible
+        and the game time does not depend on the speed of the machine. The frames are reported without any real cost (get_rawtime), so the frame pacer
+        never skips a draw or lowers the animations and HUD refresh rates and the output of a session only depends on its script and seed, not on the load of the machine.
+
+        The class has the following attributes:
+            - elapsed_time: The time of the last frame in milliseconds
+            - remainder: The fraction of millisecond carried to the next frame (pygame clocks work with integer milliseconds)
+    """
+
+    def __init__(self) -> None:
+        """ Initializes a new instance of the FixedStepClock class"""
+        self.elapsed_time = 0
+        self.remainder = 0
+
+    def tick(self, framerate=FPS):
+        """ The tick method is responsible for advancing the clock by one frame.
+
+            Args:
+                - framerate (int): The frames per second of the game
+
+            Returns:
+                - int: The duration of the frame in milliseconds
+        """
+        frame_time, self.remainder = divmod(TIME["ONE_SECOND"] + self.remainder, framerate)
+        self.elapsed_time = frame_time
+
+        return frame_time
+
+    def get_time(self):
+        """ Returns the duration of the last frame in milliseconds"""
+        return self.elapsed_time
+
+    def get_rawtime(self):
+        """ Returns the time spent in the last frame without waiting, always 0 so the frame pacing of the sessions is deterministic"""
+        return 0
+
+
+class ScriptedInput:
+    """ The ScriptedInput class replaces the input handler of the player in headless sessions, it gives the commands of the actions of an input script.
+
+        The script is a list of steps, each one with the number of frames it lasts and the actions held during those frames, e.g.:
+            [{"frames": 60, "actions": ["move_right"]}, {"frames": 10, "actions": ["move_right", "jump"]}]
+        When the script ends no action is held.
+
+        The class has the following attributes:
+            - steps: The steps of the script (number of frames and commands)
+            - held_commands: The commands of the actions held in the current frame
+            - frame: The current frame
+    """
+
+    def __init__(self, script) -> None:
+        """ Initializes a new instance of the ScriptedInput class
+
+            Args:
+                - script (list): The steps of the input script
+        """
+        self.steps = []
+
+        for step in script:
+            commands = tuple(command for action, command in ACTION_COMMANDS.items() if action in step["actions"])
+            self.steps.append((step["frames"], commands))
+
+        self.held_commands = ()
+        self.frame = 0
+        self.step_index = 0
+        self.step_end = self.steps[0][0] if self.steps else 0
+
+    def advance(self):
+        """ The advance method is responsible for moving the script to the next frame and updating the held commands."""
+        while self.step_index < len(self.steps) and self.frame >= self.step_end:
+            self.step_index += 1
+
+            if self.step_index < len(self.steps):
+                self.step_end += self.steps[self.step_index][0]
+
+        self.held_commands = self.steps[self.step_index][1] if self.step_index < len(self.steps) else ()
+        self.frame += 1
+
+    def hold(self, commands):
+        """ The hold method is responsible for replacing the held commands, it is used to drive the player step by step instead of following the script.
+
+            Args:
+                - commands (tuple): The commands held in the next frames
+        """
+        self.step_index = len(self.steps)
+        self.held_commands = commands
+
+    def __call__(self):
+        """ Returns the held commands, so the object can be used as the player's commands provider"""
+        return self.held_commands
+
+
+def load_input_script(script):
+    """ The load_input_script function is responsible for loading an input script.
+
+        Args:
+            - script (list | str | None): The steps of the script, or the path to a json file with them
+
+        Returns:
+            - list: The steps of the input script
+    """
+    if script is None:
+        return []
+
+    if isinstance(script, str):
+        with open(script, "r") as file:
+            return json.load(file)
+
+    return script
+
+
+class HeadlessSession:
+    """ The HeadlessSession class is responsible for playing one game session without a window, sound device or frame cap.
+        The Game, Map, Camera and UI classes are singletons, so only one session can be played at a time in each process.
+
+        The class has the following attributes:
+            - level: The level played in the session
+            - seed: The seed of the random number generator
+            - input_script: The steps of the input script
+            - max_frames: The maximum number of frames of the session
+            - render: A flag indicating whether the frames are drawn (on the dummy display)
+            - state_hash: The path of the state hash trace written by the session (None to not write it)
+            - game: The game instance
+    """
+
+    def __init__(self, level=0, seed=None, input_script=None, max_frames=DEFAULT_MAX_FRAMES, render=False, state_hash=None) -> None:
+        """ Initializes a new instance of the HeadlessSession class
+
+            Args:
+                - level (int): The level played in the session
+                - seed (int): The seed of the random number generator
+                - input_script (list | str): The steps of the input script, or the path to a json file with them
+                - max_frames (int): The maximum number of frames of the session
+                - render (bool): A flag indicating whether the frames are drawn
+                - state_hash (str): The path of the state hash trace written by the session
+        """
+        if level not in LEVELS:
+            raise ValueError(f"Unknown level: {level}")
+
+        self.level = level
+        self.seed = seed
+        self.input_script = load_input_script(input_script)
+        self.max_frames = max_frames
+        self.render = render
+        self.state_hash = state_hash
+        self.game = Game()
+        self.game.clock_type = FixedStepClock
+
+    def start(self):
+        """ The start method is responsible for resetting the state left by a previous session and starting the level."""
+        game = self.game
+
+        random.seed(self.seed)
+        pg.event.clear()
+
+        if game.ui is not None:
+            game.ui.reset_labels_values()
+
+        game.player_won = False
+        game.final_score_text = None
+        game.menu_text = None
+
+        if game.is_level_loaded():
+            game.restart_level(self.level)
+        else:
+            game.setup_game_level(self.level)
+
+        game.player.commands_provider = ScriptedInput(self.input_script)
+
+        event = "start_game" if game.fsm.current == game.start_menu else "restart_game"
+        game.fsm.update(event, game)
+
+    def run(self):
+        """ The run method is responsible for playing the session until the game ends or the maximum number of frames is reached.
+
+            Returns:
+                - dict: The outcome, score, number of frames and duration of the session
+        """
+        start_time = time.perf_counter()
+        self.start()
+
+        game = self.game
+        scripted_input = game.player.commands_provider
+        outcome = "max_frames"
+        frame = 0
+
+        # The checksums are written by play_level, after the simulation of each tick
+        if self.state_hash is not None:
+            game.state_hash = StateHashRecorder(self.state_hash)
+
+        try:
+            while frame < self.max_frames:
+                scripted_input.advance()
+                game.play_level()
+                frame += 1
+
+                if not event_handler(True, game):
+                    outcome = "quit"
+                    break
+
+                if game.fsm.current == game.game_over:
+                    outcome = "won" if game.player_won else "timeout"
+                    break
+
+                if self.render:
+                    update_display(game)
+        finally:
+            if game.state_hash is not None:
+                game.state_hash.close()
+                game.state_hash = None
+
+        duration = time.perf_counter() - start_time
+
+        return {"level": self.level,
+                "final_level": game.map.level.index,
+                "seed": self.seed,
+                "outcome": outcome,
+                "score": game.ui.score + game.ui.time,
+                "frames": frame,
+                "seconds": duration,
+                "frames_per_second": frame / duration if duration > 0 else 0
+               }
@@ -0,0 +1,90 @@
+import os
+import pygame as pg
+
+
+class ImageCache:
+    """ The ImageCache class is responsible for loading the images of the sprites and the map. It uses the Flyweight pattern (as the Animator) to decode each image once.
+        The images are keyed by their absolute path and reference counted: acquire returns the shared image and adds a reference, release removes it
+        and the image is dropped when it has no references, so the next acquire decodes it again.
+        The shared images must not be drawn on, the entities replace their image instead (e.g. the flipped and animation frames).
+
+        The class has the following attributes:
+            - _images: A dictionary that stores the shared images by path (Flyweight storage)
+            - _references: A dictionary that stores the number of references of each image
+            - loads: The number of images decoded from disk
+    """
+
+    _images = {}
+    _references = {}
+    loads = 0
+
+    @staticmethod
+    def get_key(path):
+        """ The get_key method returns the key of an image, the same file has the same key from any relative path
+
+            Args:
+                - path (str): The path to the image file
+
+            Returns:
+                - str: The key of the image
+        """
+        return os.path.abspath(path)
+
+    @classmethod
+    def acquire(cls, path):
+        """ The acquire method is responsible for returning the shared image of a file and adding a reference to it, the image is loaded the first time
+
+            Args:
+                - path (str): The path to the image file
+
+            Returns:
+                - Surface: The shared image
+        """
+        key = cls.get_key(path)
+        image = cls._images.get(key)
+
+        if image is None:
+            image = pg.image.load(key).convert_alpha()
+            cls._images[key] = image
+            cls._references[key] = 0
+            cls.loads += 1
+
+        cls._references[key] += 1
+
+        return image
+
+    @classmethod
+    def release(cls, path):
+        """ The release method is responsible for removing a reference to the image of a file, the image is dropped when it has no references
+
+            Args:
+                - path (str): The path to the image file
+        """
+        key = cls.get_key(path)
+
+        if key not in cls._references:
+            return
+
+        cls._references[key] -= 1
+
+        if cls._references[key] <= 0:
+            del cls._references[key]
+            del cls._images[key]
+
+    @classmethod
+    def get_references(cls, path):
+        """ The get_references method returns the number of references of the image of a file (0 if it is not cached)
+
+            Args:
+                - path (str): The path to the image file
+
+            Returns:
+                - int: The number of references
+        """
+        return cls._references.get(cls.get_key(path), 0)
+
+    @classmethod
+    def clear(cls):
+        """ The clear method is responsible for dropping every cached image (e.g. when the display is recreated)"""
+        cls._images.clear()
+        cls._references.clear()
@@ -1,11 +1,34 @@
 import os
 import copy
-import pygame as pg
 import finite_state_machine as fsm
 from sprite  import Sprite
-from consts import KIRBY_COLLIDER, KIRBY_PATHS, KIRBY_MOVEMENT
+from image_cache import ImageCache
+from animator import Animator
+from game_map import Map
+from navigation import JUMP
+from physics import to_pixels
+from consts import KIRBY_COLLIDER, KIRBY_PATHS, KIRBY_MOVEMENT, GRAVITY
 
 class Kirby(Sprite):
+    # Only the data that changes between the kirbies is stored in each instance, the rest is shared by the class
+    __slots__ = ("walked_distance", "turned_right", "dead", "velocity_x", "velocity_y", "collision_solver")
+
+    name = "Kirby"
+    speed = KIRBY_MOVEMENT["SPEED"]
+
+    # The navigator and the target of the kirbies when they chase the player (None when they patrol), shared by every Kirby
+    navigator = None
+    target = None
+
+    # The states and transitions are shared by every Kirby, the FSM of each Kirby only keeps its current state
+    idle = fsm.Idle()
+    walk = fsm.Walk()
+    states = [idle, walk]
+    transitions = {
+        "walk": fsm.Transition(idle, walk),
+        "idle": fsm.Transition(walk, idle)
+    }
+
     def __init__(self, position): 
         """
         Initializes a new instance of the Kirby class, calling the Entity and Prototype constructors.
@@ -16,10 +39,11 @@ class Kirby(Sprite):
 
         # Set up Kirby's attributes
         self.walked_distance = 0
-        self.speed = KIRBY_MOVEMENT["SPEED"]
         self.turned_right = True
-        self.name = "Kirby"
         self.dead = False
+        self.velocity_x = 0
+        self.velocity_y = 0
+        self.collision_solver = Map().collision_solver
 
         # Initialize FSM and states
         self.fsm = fsm.FSM(self.set_states(), self.set_transitions())
@@ -34,7 +58,7 @@ class Kirby(Sprite):
 
     def __deepcopy__(self, memo):
         """
-        Custom deepcopy method to handle pygame.Surface objects.
+        Custom deepcopy method to handle the slots of the instance, the clone shares the cached image of the prototype.
         """
         # Create a new instance of Kirby
         cls = self.__class__
@@ -42,48 +66,189 @@ class Kirby(Sprite):
         memo[id(self)] = result
 
         # Copy attributes
-        for k, v in self.__dict__.items():
+        for k in self.get_slots():
+            if not hasattr(self, k):
+                continue
+
+            v = getattr(self, k)
+
             if k == 'image':
-                # Manually copy the pygame.Surface object
-                result.__dict__[k] = self.image.copy()
+                # The images are never drawn on, so the clone shares the surface instead of copying it
+                setattr(result, k, v)
+            elif k == 'image_path':
+                # The clone holds its own reference to the cached image
+                if v is not None:
+                    ImageCache.acquire(v)
+
+                setattr(result, k, v)
+            elif k == 'collision_solver':
+                # The collision solver is shared by every entity of the map
+                setattr(result, k, v)
+            elif k == 'rect':
+                # Rect.copy avoids the pickle protocol of pygame.Rect (copyreg), whose allocations are never released
+                setattr(result, k, v.copy())
+            elif k == 'animator':
+                # The clone has its own animator, it pins the animation it plays (the pin of the prototype animation is not copied)
+                setattr(result, k, Animator())
+            elif k == 'fsm':
+                # The new FSM shares the states and transitions of the class
+                setattr(result, k, copy.copy(v))
             else:
-                result.__dict__[k] = copy.deepcopy(v, memo)
+                setattr(result, k, copy.deepcopy(v, memo))
         
         return result
     
     def set_states(self):
-        """Sets Kirby's FSM states."""
-        self.idle = fsm.Idle()
-        self.walk = fsm.Walk()
-        return [self.idle, self.walk]
+        """Returns Kirby's FSM states (shared by every Kirby)."""
+        return self.states
     
     def set_transitions(self):
-        """Sets Kirby's FSM transitions."""
-        return {
-            "walk": fsm.Transition(self.idle, self.walk),
-            "idle": fsm.Transition(self.walk, self.idle)
-        }
+        """Returns Kirby's FSM transitions (shared by every Kirby)."""
+        return self.transitions
     
+    def reset(self, position):
+        """
+        Restores Kirby to its spawn state (position, patrol, state and animation).
+
+        Args:
+            - position (tuple): The spawn position
+        """
+        self.rect.topleft = position
+        self.walked_distance = 0
+        self.turned_right = True
+        self.dead = False
+        self.velocity_x = 0
+        self.velocity_y = 0
+        self.is_on_ground = True
+
+        self.fsm.reset()
+        self.animator.reset()
+
     def update(self):
-        """Updates Kirby's FSM and handles animations."""
-        self.patrol()
+        """Updates Kirby's FSM, applies gravity and handles animations."""
+        if not self.is_on_ground:
+            self.velocity_y += GRAVITY
+
+        if self.navigator is None or not self.chase():
+            self.patrol()
+
         self.animator.play_animation(self.fsm.current.name, self)
+
+    def chase(self):
+        """
+        Handles Kirby's chase behavior, Kirby follows the path of the navigator to the node where the target stands (or lands).
+        Kirby walks to the next node of the path and jumps when the next edge is a jump, in the air it keeps its movement.
+        While the path is being searched Kirby keeps its movement, but it stops at the end of its platform (it doesn't walk off a ledge without a path).
+
+        Returns:
+            - bool: A flag indicating whether Kirby is chasing, False if the target can't be reached (Kirby patrols instead)
+        """
+        if self.is_on_ground:
+            grid = self.navigator.grid
+            start = grid.get_node(self.rect)
+            goal = grid.get_landing_node(self.target.rect)
+
+            if start is None or goal is None:
+                return False
+
+            path = self.navigator.get_path(start, goal)
+
+            if path == () and start != goal:
+                return False
+
+            if path:
+                (column, _), kind = path[0]
+                tile_width = grid.solver.tile_width
+                self.face(column * tile_width + tile_width // 2)
+
+                if kind == JUMP and self.is_at_take_off(start[0], column, tile_width):
+                    self.velocity_y = -KIRBY_MOVEMENT["JUMP_SPEED"]
+            elif path is not None:
+                self.face(self.target.rect.centerx)
+            elif self.is_at_ledge(grid):
+                self.velocity_x = 0
+
+        if self.fsm.current == self.idle:
+            self.fsm.update("walk", self)
+
+        self.collision_solver.move(self, self.velocity_x, self.velocity_y)
+
+        return True
+
+    def face(self, x):
+        """
+        Turns Kirby to a position of the map and sets its chase velocity, Kirby stops when it is over the position.
+
+        Args:
+            - x (int): The position of the map (pixels)
+        """
+        distance = x - self.rect.centerx
+
+        if abs(distance) < KIRBY_MOVEMENT["CHASE_SPEED"]:
+            self.velocity_x = 0
+            return
+
+        if (distance > 0) != self.turned_right:
+            self.turned_right = distance > 0
+            self.animator.show_frame(self)
+
+        self.velocity_x = KIRBY_MOVEMENT["CHASE_SPEED"] if self.turned_right else -KIRBY_MOVEMENT["CHASE_SPEED"]
+
+    def is_at_ledge(self, grid):
+        """
+        Checks if the next move of Kirby takes its feet off the platform where it stands (no node of the grid under them after the move).
+
+        Args:
+            - grid (NavigationGrid): The navigation grid of the map
+
+        Returns:
+            - bool: A flag indicating whether Kirby walks off a ledge in the next move
+        """
+        tile_width = grid.solver.tile_width
+        step = to_pixels(self.velocity_x)
+        row = self.rect.bottom // grid.solver.tile_height
+
+        return all((column, row) not in grid.edges
+                   for column in range((self.rect.left + step) // tile_width, (self.rect.right - 1 + step) // tile_width + 1))
+
+    def is_at_take_off(self, column, landing_column, tile_width):
+        """
+        Checks if Kirby must jump now to follow a jump edge: its trailing foot leaves the take-off column in the next move
+        (the reach of the jump edges is computed from there) or its leading foot is already over the landing column.
+
+        Args:
+            - column (int): The take-off column
+            - landing_column (int): The landing column
+            - tile_width (int): The width of a tile
+
+        Returns:
+            - bool: A flag indicating whether Kirby jumps
+        """
+        step = to_pixels(abs(self.velocity_x))
+
+        if self.turned_right:
+            return self.rect.left + step >= (column + 1) * tile_width or (self.rect.right - 1) // tile_width >= landing_column
+
+        return self.rect.right - 1 - step < column * tile_width or self.rect.left // tile_width <= landing_column
     
     def patrol(self):
-        """Handles Kirby's patrol behavior."""
-        if self.turned_right:
-            if self.fsm.current == self.idle:
-                self.fsm.update("walk", self)
-            self.walked_distance += self.speed
-            self.rect.x += self.speed
-        else:
-            if self.fsm.current == self.idle:
-                self.fsm.update("walk", self)
-            self.walked_distance += self.speed
-            self.rect.x -= self.speed
-
-        if self.walked_distance >= KIRBY_MOVEMENT["PATROL_MAX_DISTANCE"]:
+        """Handles Kirby's patrol behavior, Kirby turns around when it walks the patrol distance or hits a wall.
+        A chasing Kirby that lost its target patrols from wherever it is, so it also turns around at the end of its platform instead of walking off."""
+        if self.fsm.current == self.idle:
+            self.fsm.update("walk", self)
+
+        self.velocity_x = self.speed if self.turned_right else -self.speed
+        self.walked_distance += self.speed
+
+        at_ledge = self.navigator is not None and self.is_on_ground and self.is_at_ledge(self.navigator.grid)
+
+        if at_ledge:
+            self.velocity_x = 0
+
+        hit_wall = self.collision_solver.move(self, self.velocity_x, self.velocity_y)
+
+        if hit_wall or at_ledge or self.walked_distance >= KIRBY_MOVEMENT["PATROL_MAX_DISTANCE"]:
             self.turned_right = not self.turned_right
             self.walked_distance = 0
-            self.image = pg.transform.flip(self.image, not self.turned_right, False)
+            self.animator.show_frame(self)
             self.fsm.update("idle", self)
\ No newline at end of file
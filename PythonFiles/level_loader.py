@@ -0,0 +1,183 @@
+import json
+import os
+import threading
+import pygame as pg
+from physics import TileCollisionSolver
+from consts import FLOOR_TILE_DIMENSIONS, FLOOR_BLOCK, LEVEL_PATHS, LEVEL_TILES, MAX_KIRBIES
+
+
+def build_floor_blocks_colliders(tiles):
+    """ The build_floor_blocks_colliders function is responsible for creating the colliders of the floor blocks of a tile map (a rect for each FLOOR_BLOCK).
+
+        Args:
+            - tiles (list): The rows of tiles of the map
+
+        Returns:
+            - list: The floor block colliders
+    """
+    floor_blocks_colliders = []
+
+    for row_index, row in enumerate(tiles):
+        for column_index, tile in enumerate(row):
+            if tile is FLOOR_BLOCK:
+                x, y = column_index * FLOOR_TILE_DIMENSIONS["WIDTH"], row_index * FLOOR_TILE_DIMENSIONS["HEIGHT"]
+
+                floor_blocks_colliders.append(pg.Rect(x, y, FLOOR_TILE_DIMENSIONS["WIDTH"], FLOOR_TILE_DIMENSIONS["HEIGHT"]))
+
+    return floor_blocks_colliders
+
+
+def build_floor_blocks_entries(floor_block_sprite, floor_blocks_colliders):
+    """ The build_floor_blocks_entries function is responsible for creating the render queue entries of the floor blocks, sorted by column
+        so the visible blocks are found with a binary search.
+
+        Args:
+            - floor_block_sprite (Surface): The sprite of the floor blocks
+            - floor_blocks_colliders (list): The floor block colliders
+
+        Returns:
+            - tuple: The entries (sprite and position) and the column (x) of each entry
+    """
+    floor_blocks_entries = [(floor_block_sprite, position) for position in sorted(collider.topleft for collider in floor_blocks_colliders)]
+
+    return floor_blocks_entries, [position[0] for _, position in floor_blocks_entries]
+
+
+class Level:
+    """ The Level class holds the data of a level decoded from its file and everything the map builds from it (colliders, render entries and collision grid),
+        so the map swaps in a level by assigning its attributes. A level is never changed after it is prepared, the map copies what it changes (the tiles and the grid).
+
+        The class has the following attributes:
+            - index: The index of the level in LEVEL_PATHS
+            - name: The name of the level
+            - tiles: The rows of tiles of the level
+            - floor_blocks_colliders: The colliders of the floor blocks
+            - floor_blocks_entries: The render queue entries of the floor blocks, sorted by column
+            - floor_blocks_columns: The column (x) of each entry of floor_blocks_entries
+            - cells: The collision types of the cells of the tile grid
+            - peach_position: The position of the peach
+            - kirbies_positions: The spawn positions of the kirbies, in spawn order
+    """
+
+    def __init__(self, index, name, tiles, floor_block_sprite, peach_position, kirbies_positions) -> None:
+        """ Initializes a new instance of the Level class and builds the data of the map
+
+            Args:
+                - index (int): The index of the level
+                - name (str): The name of the level
+                - tiles (list): The rows of tiles of the level
+                - floor_block_sprite (Surface): The sprite of the floor blocks
+                - peach_position (tuple): The position of the peach
+                - kirbies_positions (list): The spawn positions of the kirbies
+        """
+        self.index = index
+        self.name = name
+        self.tiles = tiles
+        self.floor_blocks_colliders = build_floor_blocks_colliders(tiles)
+        self.floor_blocks_entries, self.floor_blocks_columns = build_floor_blocks_entries(floor_block_sprite, self.floor_blocks_colliders)
+        self.cells = TileCollisionSolver(tiles, one_way_tiles=(FLOOR_BLOCK,)).cells
+        self.peach_position = peach_position
+        self.kirbies_positions = kirbies_positions
+
+
+def read_level(index, floor_block_sprite):
+    """ The read_level function is responsible for reading a level file and preparing the level.
+        The tiles of a level file are rows of symbols (LEVEL_TILES), the peach and the kirbies are given by their positions.
+
+        Args:
+            - index (int): The index of the level in LEVEL_PATHS
+            - floor_block_sprite (Surface): The sprite of the floor blocks
+
+        Returns:
+            - Level: The level
+    """
+    with open(os.path.join(os.path.dirname(__file__), LEVEL_PATHS[index]), "r") as file:
+        data = json.load(file)
+
+    kirbies_positions = [tuple(position) for position in data["kirbies"]]
+
+    if len(kirbies_positions) > MAX_KIRBIES:
+        raise ValueError(f"The level {data['name']} has {len(kirbies_positions)} kirbies, the maximum is {MAX_KIRBIES}")
+
+    tiles = [[LEVEL_TILES.get(symbol) for symbol in row] for row in data["tiles"]]
+
+    return Level(index, data["name"], tiles, floor_block_sprite, tuple(data["peach"]), kirbies_positions)
+
+
+class LevelLoader:
+    """ The LevelLoader class is responsible for preparing the levels in a background thread, so the next level is ready when the current one ends
+        and the map swaps it in without loading anything in the game loop. The prepared levels are kept (they are small), so a level is read once.
+        If a level is needed before it is prepared, get waits for the background thread or prepares it in the calling thread.
+
+        The class has the following attributes:
+            - floor_block_sprite: The sprite of the floor blocks of the levels
+            - levels: The prepared levels by index
+            - thread: The thread preparing a level (None when no level is being prepared)
+            - lock: The lock of the prepared levels
+    """
+
+    def __init__(self, floor_block_sprite) -> None:
+        """ Initializes a new instance of the LevelLoader class
+
+            Args:
+                - floor_block_sprite (Surface): The sprite of the floor blocks
+        """
+        self.floor_block_sprite = floor_block_sprite
+        self.levels = {}
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def prepare(self, index):
+        """ The prepare method is responsible for reading a level and adding it to the prepared levels.
+
+            Args:
+                - index (int): The index of the level
+        """
+        level = read_level(index, self.floor_block_sprite)
+
+        with self.lock:
+            self.levels.setdefault(index, level)
+
+    def preload(self, index):
+        """ The preload method is responsible for preparing a level in the background, it does nothing if the level is prepared or being prepared.
+
+            Args:
+                - index (int): The index of the level
+        """
+        with self.lock:
+            if index in self.levels:
+                return
+
+        if self.thread is not None and self.thread.is_alive():
+            self.thread.join()
+
+            if index in self.levels:
+                return
+
+        self.thread = threading.Thread(target=self.prepare, args=(index,), name="level_loader", daemon=True)
+        self.thread.start()
+
+    def get(self, index):
+        """ The get method returns a prepared level, waiting for the background thread if it is preparing it.
+
+            Args:
+                - index (int): The index of the level
+
+            Returns:
+                - Level: The level
+        """
+        with self.lock:
+            level = self.levels.get(index)
+
+        if level is not None:
+            return level
+
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+        with self.lock:
+            if index not in self.levels:
+                self.levels[index] = read_level(index, self.floor_block_sprite)
+
+            return self.levels[index]
@@ -0,0 +1,201 @@
+import threading
+from collections import OrderedDict
+from pygame import mixer
+
+
+def get_surface_size(surface):
+    """ The get_surface_size function returns the number of bytes of the pixels of a surface (the subsurfaces use the pixels of their parent).
+
+        Args:
+            - surface (Surface): The surface
+
+        Returns:
+            - int: The size in bytes
+    """
+    return 0 if surface.get_parent() is not None else surface.get_pitch() * surface.get_height()
+
+
+def get_frames_size(frames):
+    """ The get_frames_size function returns the number of bytes of the pixels of the frames of an animation.
+
+        Args:
+            - frames (list): The frames of the animation
+
+        Returns:
+            - int: The size in bytes
+    """
+    return sum(get_surface_size(frame) for frame in frames)
+
+
+def get_sound_size(sound):
+    """ The get_sound_size function returns the number of bytes of the decoded samples of a sound, computed from its length and the mixer format
+        (Sound.get_raw would copy the samples).
+
+        Args:
+            - sound (Sound): The sound
+
+        Returns:
+            - int: The size in bytes
+    """
+    frequency, sample_format, channels = mixer.get_init()
+
+    return int(sound.get_length() * frequency) * channels * (abs(sample_format) // 8)
+
+
+class LRUCache:
+    """ The LRUCache class is the storage of the flyweight caches (e.g. the animations of the Animator and the sounds of the SoundPlayer).
+        It keeps the entries while their total size is within a byte budget, when a new entry goes over the budget the least recently used entries are evicted.
+        An entry is never evicted while it is in use: while it is pinned (e.g. the animation that an animator is playing) or while the in_use function returns True
+        (e.g. a sound that is playing). If every entry is in use the cache goes over the budget until they are released.
+
+        The class has the following attributes:
+            - name: The name of the cache (used in the reports)
+            - budget: The maximum number of bytes of the entries
+            - measure: The function that returns the size in bytes of a value
+            - in_use: The function that checks if a value is in use, besides the pins (optional)
+            - entries: The entries of the cache (key -> (value, size)), from the least to the most recently used
+            - pins: The number of pins of each pinned key
+            - size: The total size of the entries in bytes
+            - hits: The number of lookups that found the entry
+            - misses: The number of lookups that didn't find the entry
+            - evictions: The number of evicted entries
+    """
+
+    def __init__(self, name, budget, measure, in_use=None) -> None:
+        """ Initializes a new instance of the LRUCache class
+
+            Args:
+                - name (str): The name of the cache
+                - budget (int): The maximum number of bytes of the entries
+                - measure (function): The function that returns the size in bytes of a value
+                - in_use (function): The function that checks if a value is in use
+        """
+        self.name = name
+        self.budget = budget
+        self.measure = measure
+        self.in_use = in_use
+        self.entries = OrderedDict()
+        self.pins = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """ The get method is responsible for returning the value of a key and marking it as the most recently used.
+
+            Args:
+                - key (hashable): The key of the entry
+
+            Returns:
+                - object: The value of the entry or None if it is not cached
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.entries.move_to_end(key)
+
+            return entry[0]
+
+    def put(self, key, value):
+        """ The put method is responsible for storing a value as the most recently used entry and evicting entries until the cache is within the budget.
+
+            Args:
+                - key (hashable): The key of the entry
+                - value (object): The value of the entry
+        """
+        with self.lock:
+            if key in self.entries:
+                self.size -= self.entries.pop(key)[1]
+
+            size = self.measure(value)
+            self.entries[key] = (value, size)
+            self.size += size
+
+            self.evict(keep=key)
+
+    def evict(self, keep=None):
+        """ The evict method is responsible for removing the least recently used entries that are not in use until the cache is within the budget.
+
+            Args:
+                - keep (hashable): A key that must not be evicted (the entry that was just stored)
+        """
+        if self.size <= self.budget:
+            return
+
+        for key, (value, size) in list(self.entries.items()):
+            if self.size <= self.budget:
+                break
+
+            if key == keep or key in self.pins or (self.in_use is not None and self.in_use(value)):
+                continue
+
+            del self.entries[key]
+            self.size -= size
+            self.evictions += 1
+
+    def pin(self, key):
+        """ The pin method is responsible for marking an entry as in use, a pinned entry is not evicted.
+
+            Args:
+                - key (hashable): The key of the entry
+        """
+        with self.lock:
+            self.pins[key] = self.pins.get(key, 0) + 1
+
+    def unpin(self, key):
+        """ The unpin method is responsible for removing a pin of an entry, the entry can be evicted when it has no pins.
+
+            Args:
+                - key (hashable): The key of the entry
+        """
+        with self.lock:
+            pins = self.pins.get(key, 0) - 1
+
+            if pins > 0:
+                self.pins[key] = pins
+            else:
+                self.pins.pop(key, None)
+
+            self.evict()
+
+    def values(self):
+        """ The values method returns the values of the entries, from the least to the most recently used.
+
+            Returns:
+                - list: The values of the entries
+        """
+        with self.lock:
+            return [value for value, _ in self.entries.values()]
+
+    def clear(self):
+        """ The clear method is responsible for removing every entry, the pins and the counters are kept."""
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def get_stats(self):
+        """ The get_stats method returns the counters of the cache.
+
+            Returns:
+                - dict: The number of entries, size, budget, hits, misses and evictions of the cache
+        """
+        return {"entries": len(self.entries),
+                "bytes": self.size,
+                "budget": self.budget,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+               }
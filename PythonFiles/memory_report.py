@@ -0,0 +1,155 @@
+import sys
+import argparse
+import tracemalloc
+from types import ModuleType, FunctionType, MethodType, BuiltinFunctionType
+import pygame as pg
+
+# Objects that are not data of the entities (the code they run is shared by the whole game)
+NOT_DATA_TYPES = (type, ModuleType, FunctionType, MethodType, BuiltinFunctionType)
+
+
+def get_attributes(obj):
+    """ The get_attributes function returns the values of the attributes of an object, stored in its slots or in its __dict__.
+
+        Args:
+            - obj (object): The object
+
+        Returns:
+            - list: The values of the attributes
+    """
+    values = []
+
+    for klass in type(obj).__mro__:
+        for name in getattr(klass, "__slots__", ()):
+            if name not in ("__dict__", "__weakref__") and hasattr(obj, name):
+                values.append(getattr(obj, name))
+
+    if hasattr(obj, "__dict__"):
+        values.extend(vars(obj).values())
+
+    return values
+
+
+def get_size(obj, seen):
+    """ The get_size function is responsible for measuring the memory of an object and of the objects it references.
+        The pixels of the surfaces are included (the subsurfaces use the pixels of their parent), each object is measured once.
+
+        Args:
+            - obj (object): The object to be measured
+            - seen (set): The ids of the objects already measured, they are skipped
+
+        Returns:
+            - int: The size in bytes
+    """
+    if id(obj) in seen or isinstance(obj, NOT_DATA_TYPES):
+        return 0
+
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, pg.Surface):
+        if obj.get_parent() is None:
+            size += obj.get_pitch() * obj.get_height()
+    elif isinstance(obj, dict):
+        size += sum(get_size(key, seen) + get_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(get_size(item, seen) for item in obj)
+    elif not isinstance(obj, (str, bytes, int, float, bool, pg.Rect)):
+        if hasattr(obj, "__dict__"):
+            size += sys.getsizeof(obj.__dict__)
+
+        size += sum(get_size(value, seen) for value in get_attributes(obj))
+
+    return size
+
+
+def entity_memory_report(entities):
+    """ The entity_memory_report function is responsible for measuring the memory used by each entity type.
+        An attribute value referenced by more than one entity (e.g. the collision solver or the shared animation frames) is counted once as shared memory,
+        the rest is the memory owned by each entity.
+
+        Args:
+            - entities (iterable): The entities to be measured (e.g. the sprites of the game)
+
+        Returns:
+            - dict: For each entity type, the number of entities, the bytes per entity, the total bytes and the shared bytes
+    """
+    entities = list(entities)
+    references = {}
+
+    for entity in entities:
+        for value in get_attributes(entity):
+            if not isinstance(value, (str, int, float, type(None))):
+                references[id(value)] = references.get(id(value), 0) + 1
+
+    shared_ids = {value_id for value_id, count in references.items() if count > 1}
+    shared_seen = set()
+    report = {}
+
+    for entity in entities:
+        entry = report.setdefault(type(entity).__name__, {"count": 0, "total_bytes": 0, "shared_bytes": 0})
+        entry["count"] += 1
+        entry["total_bytes"] += get_size(entity, set(shared_ids))
+
+        for value in get_attributes(entity):
+            if id(value) in shared_ids:
+                entry["shared_bytes"] += get_size(value, shared_seen)
+
+    for entry in report.values():
+        entry["bytes_per_entity"] = entry["total_bytes"] // entry["count"]
+
+    return report
+
+
+def print_memory_report(report):
+    """ The print_memory_report function is responsible for printing the memory report of the entity types.
+
+        Args:
+            - report (dict): The report returned by entity_memory_report
+    """
+    print(f"{'Entity':<12}{'Count':>8}{'Bytes/entity':>14}{'Total':>12}{'Shared':>12}")
+
+    for name, entry in report.items():
+        print(f"{name:<12}{entry['count']:>8}{entry['bytes_per_entity']:>14}{entry['total_bytes']:>12}{entry['shared_bytes']:>12}")
+
+
+def parse_arguments():
+    """ The parse_arguments function is responsible for parsing the command line arguments of the memory report.
+
+        Returns:
+            - Namespace: The parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Prints the memory used by each entity type of a level.")
+    parser.add_argument("--level", type=int, default=0, help="level to be loaded")
+    parser.add_argument("--kirbies", type=int, default=1000, help="number of extra kirbies cloned to measure the memory of many entities")
+
+    return parser.parse_args()
+
+
+def main():
+    """ The main function loads a level without window, clones the extra kirbies and prints the memory report of every entity."""
+    from headless import HeadlessSession
+    from kirby import Kirby
+
+    arguments = parse_arguments()
+
+    session = HeadlessSession(level=arguments.level)
+    session.start()
+
+    entities = list(session.game.all_sprites)
+    prototype = session.game.all_sprites.get_first(Kirby)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    clones = [prototype.clone() for _ in range(arguments.kirbies)]
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    print_memory_report(entity_memory_report(entities + clones))
+
+    if clones:
+        print(f"Allocated per Kirby clone (tracemalloc): {allocated // len(clones)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+import os
+import json
+import time
+import queue
+import threading
+import pygame as pg
+from animator import Animator
+from sound_player import SoundPlayer
+from consts import GAME_EVENTS, METRICS
+
+# Names of the custom events of the game (the pygame events are named by pygame.event.event_name)
+GAME_EVENT_NAMES = {event_type: name for name, event_type in GAME_EVENTS.items()}
+
+# Caches whose size and counters are exported
+CACHES = {"animations": Animator._animations,
+          "sounds": SoundPlayer._sounds
+         }
+
+# Quantiles of the frame time exported
+FRAME_TIME_QUANTILES = (0.5, 0.95, 0.99)
+
+# Prefix of the Prometheus metrics
+METRIC_PREFIX = "super_bowser"
+
+
+def get_event_name(event_type):
+    """ The get_event_name function returns the name of an event type.
+
+        Args:
+            - event_type (int): The type of the event
+
+        Returns:
+            - str: The name of the event
+    """
+    return GAME_EVENT_NAMES.get(event_type) or pg.event.event_name(event_type)
+
+
+def get_rss():
+    """ The get_rss function returns the resident set size of the process in bytes (0 where /proc is not available).
+
+        Returns:
+            - int: The resident memory of the process
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def get_quantile(sorted_values, quantile):
+    """ The get_quantile function returns a quantile of sorted values (nearest rank).
+
+        Args:
+            - sorted_values (list): The values in ascending order
+            - quantile (float): The quantile between 0 and 1
+
+        Returns:
+            - float: The value of the quantile (0 if there are no values)
+    """
+    if not sorted_values:
+        return 0
+
+    return sorted_values[min(len(sorted_values) - 1, int(quantile * len(sorted_values)))]
+
+
+class MetricsExporter:
+    """ The MetricsExporter class is responsible for recording the runtime telemetry of the game and writing it periodically to a local file.
+        The game loop only appends the frame times and counts the events, every interval a snapshot of the counters is taken (a few len calls)
+        and given to a writer thread, that computes the percentiles, reads the RSS, formats the metrics and writes the file.
+        If the writer is behind, the snapshot is dropped instead of blocking the game loop.
+
+        The file has one JSON object per line (json) or the last snapshot in the Prometheus text format (prometheus), replaced atomically.
+
+        The class has the following attributes:
+            - game: The game whose metrics are recorded
+            - path: The path of the metrics file
+            - format: The format of the file (json or prometheus)
+            - interval: The time between two snapshots in seconds
+            - frame_times: The frame times (without the frame cap wait) recorded since the last snapshot, in milliseconds
+            - frames: The number of frames recorded since the start
+            - event_counts: The number of events handled by event type since the start
+            - last_snapshot: The time of the last snapshot (time.perf_counter)
+            - snapshots: The queue of snapshots waiting to be written
+            - writer: The thread that writes the snapshots
+    """
+
+    def __init__(self, game, path, format="json", interval=METRICS["INTERVAL"]) -> None:
+        """ Initializes a new instance of the MetricsExporter class and starts the writer thread
+
+            Args:
+                - game (Game): The game whose metrics are recorded
+                - path (str): The path of the metrics file
+                - format (str): The format of the file (json or prometheus)
+                - interval (float): The time between two snapshots in seconds
+        """
+        self.game = game
+        self.path = path
+        self.format = format
+        self.interval = interval
+        self.frame_times = []
+        self.frames = 0
+        self.event_counts = {}
+        self.last_snapshot = time.perf_counter()
+        self.snapshots = queue.Queue(maxsize=METRICS["QUEUE_SIZE"])
+        self.writer = threading.Thread(target=self.write_snapshots, name="metrics_writer", daemon=True)
+        self.writer.start()
+
+    def record_frame(self, frame_time):
+        """ The record_frame method is responsible for recording the time of a frame of the level.
+
+            Args:
+                - frame_time (int): The time spent in the frame without the time waiting for the frame cap, in milliseconds
+        """
+        self.frame_times.append(frame_time)
+        self.frames += 1
+
+    def count_event(self, event_type):
+        """ The count_event method is responsible for counting an event handled by the game.
+
+            Args:
+                - event_type (int): The type of the event
+        """
+        self.event_counts[event_type] = self.event_counts.get(event_type, 0) + 1
+
+    def update(self):
+        """ The update method is called once per iteration of the game loop, it takes a snapshot when the interval has elapsed."""
+        now = time.perf_counter()
+
+        if now - self.last_snapshot >= self.interval:
+            self.take_snapshot(now)
+
+    def take_snapshot(self, now):
+        """ The take_snapshot method is responsible for collecting the counters of the game and giving them to the writer thread.
+
+            Args:
+                - now (float): The current time (time.perf_counter)
+        """
+        game = self.game
+        entities = game.all_sprites.get_counts() if game.all_sprites is not None else {}
+
+        snapshot = {"timestamp": time.time(),
+                    "elapsed": now - self.last_snapshot,
+                    "frame_times": self.frame_times,
+                    "frames": self.frames,
+                    "entities": entities,
+                    "colliders": len(game.map.floor_blocks_colliders) if game.map is not None else 0,
+                    "caches": {name: cache.get_stats() for name, cache in CACHES.items()},
+                    "skipped_frames": game.frame_pacer.skipped_frames,
+                    "events": dict(self.event_counts)
+                   }
+
+        self.frame_times = []
+        self.last_snapshot = now
+
+        try:
+            self.snapshots.put_nowait(snapshot)
+        except queue.Full:
+            pass
+
+    def close(self):
+        """ The close method is responsible for writing the last snapshot and stopping the writer thread."""
+        self.take_snapshot(time.perf_counter())
+        self.snapshots.put(None)
+        self.writer.join()
+
+    def write_snapshots(self):
+        """ The write_snapshots method is run by the writer thread, it writes every snapshot until the exporter is closed."""
+        while True:
+            snapshot = self.snapshots.get()
+
+            if snapshot is None:
+                break
+
+            metrics = self.build_metrics(snapshot)
+
+            try:
+                if self.format == "prometheus":
+                    self.write_prometheus(metrics)
+                else:
+                    with open(self.path, "a") as file:
+                        file.write(json.dumps(metrics) + "\n")
+            except OSError as error:
+                print(f"The metrics could not be written: {error}")
+
+    def build_metrics(self, snapshot):
+        """ The build_metrics method is responsible for computing the metrics of a snapshot (frame time percentiles, FPS, RSS and event names).
+
+            Args:
+                - snapshot (dict): The snapshot taken by the game loop
+
+            Returns:
+                - dict: The metrics
+        """
+        frame_times = sorted(snapshot["frame_times"])
+
+        return {"timestamp": snapshot["timestamp"],
+                "fps": len(frame_times) / snapshot["elapsed"] if snapshot["elapsed"] > 0 else 0,
+                "frame_time_ms": {str(quantile): get_quantile(frame_times, quantile) for quantile in FRAME_TIME_QUANTILES},
+                "frame_time_max_ms": frame_times[-1] if frame_times else 0,
+                "frames": snapshot["frames"],
+                "skipped_frames": snapshot["skipped_frames"],
+                "entities": snapshot["entities"],
+                "colliders": snapshot["colliders"],
+                "caches": snapshot["caches"],
+                "rss_bytes": get_rss(),
+                "events": {get_event_name(event_type): count for event_type, count in snapshot["events"].items()}
+               }
+
+    def write_prometheus(self, metrics):
+        """ The write_prometheus method is responsible for writing the metrics in the Prometheus text format (e.g. for the node exporter textfile collector).
+            The file is written next to the metrics file and renamed, so a reader never sees a partial file.
+
+            Args:
+                - metrics (dict): The metrics
+        """
+        lines = [f"# TYPE {METRIC_PREFIX}_frame_time_ms summary"]
+        lines += [f'{METRIC_PREFIX}_frame_time_ms{{quantile="{quantile}"}} {value}' for quantile, value in metrics["frame_time_ms"].items()]
+        lines += [f"# TYPE {METRIC_PREFIX}_fps gauge", f"{METRIC_PREFIX}_fps {metrics['fps']:.2f}",
+                  f"# TYPE {METRIC_PREFIX}_frames_total counter", f"{METRIC_PREFIX}_frames_total {metrics['frames']}",
+                  f"# TYPE {METRIC_PREFIX}_skipped_frames_total counter", f"{METRIC_PREFIX}_skipped_frames_total {metrics['skipped_frames']}",
+                  f"# TYPE {METRIC_PREFIX}_colliders gauge", f"{METRIC_PREFIX}_colliders {metrics['colliders']}",
+                  f"# TYPE {METRIC_PREFIX}_rss_bytes gauge", f"{METRIC_PREFIX}_rss_bytes {metrics['rss_bytes']}",
+                  f"# TYPE {METRIC_PREFIX}_entities gauge"]
+        lines += [f'{METRIC_PREFIX}_entities{{type="{name}"}} {count}' for name, count in metrics["entities"].items()]
+
+        for stat in ("entries", "bytes", "budget", "hits", "misses", "evictions"):
+            metric_type = "counter" if stat in ("hits", "misses", "evictions") else "gauge"
+            metric_name = f"{METRIC_PREFIX}_cache_{stat}" + ("_total" if metric_type == "counter" else "")
+
+            lines.append(f"# TYPE {metric_name} {metric_type}")
+            lines += [f'{metric_name}{{cache="{name}"}} {stats[stat]}' for name, stats in metrics["caches"].items()]
+
+        lines.append(f"# TYPE {METRIC_PREFIX}_events_total counter")
+        lines += [f'{METRIC_PREFIX}_events_total{{type="{name}"}} {count}' for name, count in metrics["events"].items()]
+
+        temporary_path = f"{self.path}.tmp"
+
+        with open(temporary_path, "w") as file:
+            file.write("\n".join(lines) + "\n")
+
+        os.replace(temporary_path, self.path)
@@ -0,0 +1,310 @@
+import heapq
+import math
+from collections import OrderedDict
+from lru_cache import LRUCache
+from physics import EMPTY_CELL, SOLID_CELL, to_pixels
+from consts import NAVIGATION, GRAVITY
+
+# Kinds of the edges of the navigation grid, the way an entity moves from a node to the next one
+WALK = "walk"
+DROP = "drop"
+JUMP = "jump"
+
+
+def get_jump_reach(rows, speed, jump_speed, width, tile_width, tile_height):
+    """ The get_jump_reach function returns the number of columns that an entity can cross with a running jump to land a number of rows higher (or lower).
+        The jump is stepped frame by frame as the entities move (the velocity is rounded to pixels and GRAVITY is added after each move) until the entity
+        falls through the landing height. The entity takes off with its trailing foot on the last pixel of the take-off tile and it can land
+        with its leading foot on the first pixel of the landing tile, so its width is added to the horizontal distance.
+
+        Args:
+            - rows (int): The rows between the take-off and the landing tiles (positive upwards)
+            - speed (float): The horizontal speed of the entity in pixels per frame
+            - jump_speed (float): The initial vertical speed of the jump in pixels per frame
+            - width (int): The width of the entity in pixels
+            - tile_width (int): The width of a tile
+            - tile_height (int): The height of a tile
+
+        Returns:
+            - int: The number of columns reached, or -1 if the landing height can't be reached
+    """
+    height = rows * tile_height
+    step_x = to_pixels(speed)
+    velocity_y = -jump_speed
+    x = y = 0
+
+    while True:
+        previous_y = y
+        x += step_x
+        y += to_pixels(velocity_y)
+
+        if velocity_y > 0:
+            # The entity lands when its feet fall through the landing height, if it is already below the height the apex was too low
+            if previous_y <= -height <= y:
+                break
+
+            if previous_y > -height:
+                return -1
+
+        velocity_y += GRAVITY
+
+    return (x + width + tile_width - 2) // tile_width
+
+
+class NavigationGrid:
+    """ The NavigationGrid class is responsible for the graph where the enemies find their paths, built from the collision grid of the map.
+        The nodes are the cells where an entity can stand (a floor block without a solid cell over it), the edges are the ways of moving between them:
+        walking to the next cell of the same platform, dropping from the end of a platform to the first platform below, and jumping to a platform
+        in the reach of the jump arc of the entity (the platforms are one-way, so an entity can jump through them from below).
+        The paths are found with A*, the heuristic is the number of columns to the goal (every edge costs at least the columns it crosses).
+
+        The class has the following attributes:
+            - solver: The collision solver of the map, its grid of collision types
+            - speed: The horizontal speed of the entities that use the grid
+            - jump_speed: The initial vertical speed of their jumps
+            - width: The width of the entities
+            - edges: The edges of each node (neighbor node, cost and kind)
+    """
+
+    def __init__(self, solver, speed, jump_speed, width) -> None:
+        """ Initializes a new instance of the NavigationGrid class and builds the graph
+
+            Args:
+                - solver (TileCollisionSolver): The collision solver of the map
+                - speed (float): The horizontal speed of the entities in pixels per frame
+                - jump_speed (float): The initial vertical speed of their jumps in pixels per frame
+                - width (int): The width of the entities in pixels
+        """
+        self.solver = solver
+        self.speed = speed
+        self.jump_speed = jump_speed
+        self.width = width
+        self.edges = self.build_edges()
+
+    def is_standable(self, column, row):
+        """ The is_standable method checks if an entity can stand on a cell (the cell is a floor block and the cell over it is not solid).
+
+            Args:
+                - column (int): The column of the cell
+                - row (int): The row of the cell
+
+            Returns:
+                - bool: A flag indicating whether the cell is a node of the grid
+        """
+        return self.solver.get_cell(column, row) != EMPTY_CELL and self.solver.get_cell(column, row - 1) != SOLID_CELL
+
+    def build_edges(self):
+        """ The build_edges method is responsible for finding the nodes of the grid and the walk, drop and jump edges between them.
+
+            Returns:
+                - dict: The edges of each node
+        """
+        solver = self.solver
+        nodes = [(column, row) for row, cells_row in enumerate(solver.cells) for column in range(len(cells_row)) if self.is_standable(column, row)]
+        edges = {node: [] for node in nodes}
+        rows = len(solver.cells)
+
+        reaches = {up: get_jump_reach(up, self.speed, self.jump_speed, self.width, solver.tile_width, solver.tile_height)
+                   for up in range(-NAVIGATION["JUMP_DOWN_ROWS"], rows)}
+
+        for column, row in nodes:
+            node_edges = edges[(column, row)]
+
+            for side in (-1, 1):
+                if (column + side, row) in edges:
+                    node_edges.append(((column + side, row), 1, WALK))
+                    continue
+
+                # The entity walks off the end of the platform and falls to the first platform below
+                for landing_row in range(row + 1, rows):
+                    if (column + side, landing_row) in edges:
+                        node_edges.append(((column + side, landing_row), 1 + (landing_row - row) * NAVIGATION["DROP_ROW_COST"], DROP))
+                        break
+
+            for up, reach in reaches.items():
+                if reach < 0:
+                    continue
+
+                landing_row = row - up
+
+                for landing_column in range(column - reach, column + reach + 1):
+                    landing = (landing_column, landing_row)
+
+                    # The cells of the same platform are reached walking
+                    if landing not in edges or (landing_row == row and abs(landing_column - column) <= 1):
+                        continue
+
+                    node_edges.append((landing, NAVIGATION["JUMP_COST"] + abs(landing_column - column), JUMP))
+
+        return edges
+
+    def get_node(self, rect):
+        """ The get_node method returns the node where an entity stands (the cell under its center, or under one of its feet at the end of a platform).
+
+            Args:
+                - rect (Rect): The rect of the entity
+
+            Returns:
+                - tuple: The node (column, row), or None if the entity is not on a node
+        """
+        row = rect.bottom // self.solver.tile_height
+
+        for x in (rect.centerx, rect.left, rect.right - 1):
+            node = (x // self.solver.tile_width, row)
+
+            if node in self.edges:
+                return node
+
+        return None
+
+    def get_landing_node(self, rect):
+        """ The get_landing_node method returns the node where an entity lands if it falls straight down (e.g. the goal of a target that is jumping).
+
+            Args:
+                - rect (Rect): The rect of the entity
+
+            Returns:
+                - tuple: The node (column, row), or None if there is no floor under the entity
+        """
+        column = rect.centerx // self.solver.tile_width
+
+        for row in range(rect.bottom // self.solver.tile_height, len(self.solver.cells)):
+            if (column, row) in self.edges:
+                return (column, row)
+
+        return None
+
+    def find_path(self, start, goal):
+        """ The find_path method is responsible for finding the cheapest path between two nodes with A*.
+
+            Args:
+                - start (tuple): The start node
+                - goal (tuple): The goal node
+
+            Returns:
+                - tuple: The steps of the path (node and kind of the edge that reaches it), empty if the goal can't be reached
+        """
+        if start not in self.edges or goal not in self.edges:
+            return ()
+
+        # The entries are (estimated cost, cost, sequence, node), the sequence breaks the ties in insertion order
+        frontier = [(abs(goal[0] - start[0]), 0, 0, start)]
+        costs = {start: 0}
+        came_from = {start: None}
+        sequence = 1
+
+        while frontier:
+            _, cost, _, node = heapq.heappop(frontier)
+
+            if node == goal:
+                break
+
+            if cost > costs[node]:
+                continue
+
+            for neighbor, edge_cost, kind in self.edges[node]:
+                neighbor_cost = cost + edge_cost
+
+                if neighbor_cost < costs.get(neighbor, math.inf):
+                    costs[neighbor] = neighbor_cost
+                    came_from[neighbor] = (node, kind)
+                    heapq.heappush(frontier, (neighbor_cost + abs(goal[0] - neighbor[0]), neighbor_cost, sequence, neighbor))
+                    sequence += 1
+        else:
+            return ()
+
+        steps = []
+        node = goal
+
+        while came_from[node] is not None:
+            previous, kind = came_from[node]
+            steps.append((node, kind))
+            node = previous
+
+        return tuple(reversed(steps))
+
+
+class Navigator:
+    """ The Navigator class is responsible for giving paths to the enemies without spiking the frame time.
+        The paths are cached by (start node, goal node), the requests that are not cached are queued and at most SEARCHES_PER_TICK searches
+        run in each tick (update), the enemy keeps its last movement until its path is found.
+        When a path is found, its suffixes are cached as well (the rest of a cheapest path is the cheapest path from its nodes),
+        so an enemy that follows a path finds the next steps in the cache. The cache is emptied and the grid is built again when the map changes (its version).
+
+        The class has the following attributes:
+            - map: The map of the level
+            - version: The version of the map when the grid was built
+            - grid: The navigation grid of the map
+            - paths: The cache of the paths, bounded by the number of steps of the cached paths (least recently used eviction)
+            - pending: The requests waiting for a search, in order
+            - searches: The number of searches run (metric)
+    """
+
+    def __init__(self, game_map, speed, jump_speed, width) -> None:
+        """ Initializes a new instance of the Navigator class and builds the navigation grid of the map
+
+            Args:
+                - game_map (Map): The map of the level
+                - speed (float): The horizontal speed of the enemies in pixels per frame
+                - jump_speed (float): The initial vertical speed of their jumps in pixels per frame
+                - width (int): The width of the enemies in pixels
+        """
+        self.map = game_map
+        self.speed = speed
+        self.jump_speed = jump_speed
+        self.width = width
+        self.paths = LRUCache("paths", NAVIGATION["PATH_CACHE_STEPS"], len)
+        self.pending = OrderedDict()
+        self.searches = 0
+        self.build()
+
+    def build(self):
+        """ The build method is responsible for building the navigation grid from the current map and emptying the cache of paths."""
+        self.version = self.map.version
+        self.grid = NavigationGrid(self.map.collision_solver, self.speed, self.jump_speed, self.width)
+        self.paths.clear()
+        self.pending.clear()
+
+    def get_path(self, start, goal):
+        """ The get_path method returns the cached path between two nodes, or queues its search.
+
+            Args:
+                - start (tuple): The start node
+                - goal (tuple): The goal node
+
+            Returns:
+                - tuple: The steps of the path (empty if the goal can't be reached), or None if the path is not searched yet
+        """
+        if self.map.version != self.version:
+            self.build()
+
+        key = (start, goal)
+        path = self.paths.get(key)
+
+        if path is None:
+            self.pending[key] = None
+
+        return path
+
+    def update(self):
+        """ The update method is responsible for running the queued searches of the tick, at most SEARCHES_PER_TICK."""
+        if self.map.version != self.version:
+            self.build()
+
+        for _ in range(min(NAVIGATION["SEARCHES_PER_TICK"], len(self.pending))):
+            (start, goal), _ = self.pending.popitem(last=False)
+
+            if (start, goal) in self.paths:
+                continue
+
+            path = self.grid.find_path(start, goal)
+            self.searches += 1
+            self.paths.put((start, goal), path)
+
+            # The rest of the path from each of its nodes
+            for index, (node, _) in enumerate(path[:-1]):
+                self.paths.put((node, goal), path[index + 1:])
+
+    def clear(self):
+        """ The clear method is responsible for emptying the queued searches (e.g. when the level is restarted), the cached paths are kept."""
+        self.pending.clear()
@@ -3,7 +3,6 @@ from consts import TIME, GAME_EVENTS, SCREEN_DIMENSIONS,PLAYER_MOVEMENT
 from player import Player
 from kirby import Kirby
 from peach import Peach
-from game_map import Map
 
 class Observer:
  """The Score class acts as game observer, because to update the score it needs to listen to the game events.
@@ -11,7 +10,6 @@ class Observer:
 
       Attributes:
          - player (Player): The player object.
-         - game_map (GameMap): The game map object.
          - enemies (list): The list of enemy sprites.
  """
 
@@ -19,7 +17,6 @@ class Observer:
     """ Initializes a new instance of the Observer class and sets up the attributes of the class.
     """
     self.player = None  
-    self.game_map = Map()
     self.enemies = None
 
  def observe(self, all_sprites):	
@@ -31,15 +28,15 @@ class Observer:
 
 
       Args:
-         - all_sprites (Group): The group of all the sprites in the game.
+         - all_sprites (SpriteRegistry): The group of all the sprites in the game, the sprites are found by their type.
    """
 
    if self.player is None:
-      self.player = next(sprite for sprite in all_sprites if isinstance(sprite, Player))
+      self.player = all_sprites.get_first(Player)
 
-   enemies = [sprite for sprite in all_sprites if isinstance(sprite, Kirby)]
+   enemies = all_sprites.get_sprites(Kirby)
 
-   peach = next(sprite for sprite in all_sprites if isinstance(sprite, Peach))
+   peach = all_sprites.get_first(Peach)
 
    self.observe_player_jumped()
 
@@ -47,38 +44,54 @@ class Observer:
 
    self.check_endgame(peach)
 
-   self.observe_floor_collisions()
-
    if len(enemies) > 0:
-      self.observe_enemy_collision(enemies)
+      self.observe_enemies_in_void(enemies, all_sprites)
+      self.observe_enemy_collision(enemies, all_sprites)
 
  def observe_player_jumped(self):
    """ The observe_player_jumped method checks if the player has jumped in the game, if it has, it posts an event of player jump.""" 
    # Check if the player has jumped
    if self.player.velocity_y == -PLAYER_MOVEMENT["JUMP_SPEED"] :
-      pg.event.post(pg.event.Event(GAME_EVENTS["PLAYER_JUMP_EVENT"]))
+      pg.event.post(pg.event.Event(GAME_EVENTS["PLAYER_JUMP_EVENT"], position=self.player.rect.midbottom))
     
  def observe_player_in_void(self):
    """ The observe_player_in_void method checks if the player has fallen into the void in the game map, if it has, it posts an event of player death.""" 
 
    if self.player.rect.y > SCREEN_DIMENSIONS["HEIGHT"]:
-      pg.event.post(pg.event.Event(GAME_EVENTS["PLAYER_DEATH_EVENT"]))
+      pg.event.post(pg.event.Event(GAME_EVENTS["PLAYER_DEATH_EVENT"], position=self.player.rect.center))
 
+ def observe_enemies_in_void(self, enemies, all_sprites):
+   """ The observe_enemies_in_void method checks if any enemy has fallen into the void in the game map (e.g. a chasing kirby), the fallen enemies are killed
+      and despawned, so they are not updated nor pathfound anymore. No event is posted, the player doesn't score them.
 
- def observe_time_envents(self, game_time):  
-   """ The observe_time method checks if the game time is equal to the alert time or the timeout time, and posts the corresponding event.
-   
       Args:
-         - game_time (int): The current game time.
-         
-   """   
+         - enemies (list): The list of enemy sprites.
+         - all_sprites (SpriteRegistry): The group of all the sprites in the game, the fallen enemies are removed from it at the end of the tick.
+   """
+
+   for enemy in enemies:
+      if enemy.rect.y > SCREEN_DIMENSIONS["HEIGHT"]:
+         enemy.dead = True
+         all_sprites.despawn(enemy)
+
+ def schedule_time_events(self, scheduler):
+   """ The schedule_time_events method schedules the time alert and the timeout of the level, they are posted when the game time reaches the alert time and the timeout time.
+
+      Args:
+         - scheduler (Scheduler): The scheduler of the level, its time starts when the level starts.
+   """
+
+   scheduler.schedule((TIME["GAME_TIME"] - TIME["ALERT_TIME"]) * TIME["ONE_SECOND"], self.post_time_alert)
+   scheduler.schedule((TIME["GAME_TIME"] - TIME["TIMEOUT"]) * TIME["ONE_SECOND"], self.post_timeout)
+
+ def post_time_alert(self):
+   """ The post_time_alert method posts the event of time alert, it is called by the scheduler."""
+   pg.event.post(pg.event.Event(GAME_EVENTS["TIME_ALERT_EVENT"]))
+
+ def post_timeout(self):
+   """ The post_timeout method posts the event of timeout, it is called by the scheduler."""
+   pg.event.post(pg.event.Event(GAME_EVENTS["TIMEOUT_EVENT"]))
 
-   if game_time == TIME["ALERT_TIME"]:
-      pg.event.post(pg.event.Event(GAME_EVENTS["TIME_ALERT_EVENT"]))
-     
-   if game_time <= TIME["TIMEOUT"]:
-      pg.event.post(pg.event.Event(GAME_EVENTS["TIMEOUT_EVENT"]))
-  
 
  def check_endgame(self, peach):
     """ The check_endgame method checks if the player has collided with the peach sprite in the game map, if it has, it posts an event to end the game."""
@@ -87,36 +100,14 @@ class Observer:
       pg.event.post(pg.event.Event(GAME_EVENTS["END_GAME_EVENT"]))
    
 
- def observe_floor_collisions(self):
-    """ The observe_floor_collisions method checks if the player has collided with any of the floor blocks in the game map.
-         If the player has collided with a floor block, it sets the player's velocity_y to 0 and sets the player's is_on_ground attribute to True.
-         Otherwise, it sets the player's is_on_ground attribute to False (the player is in the air).
-    """
-
-    floor_block_index = self.player.rect.collidelist(self.game_map.floor_blocks_colliders)
-
-    if floor_block_index != -1:
-      block = self.game_map.floor_blocks_colliders[floor_block_index]
-      
-      # Check if the player is above the block
-      if self.player.velocity_y > 0  and self.player.rect.bottom > block.top and self.player.rect.top < block.top:
-         self.player.rect.bottom = block.top 
-
-         self.player.on_block = None
-   
-         self.player.velocity_y = 0
-      
-         self.player.is_on_ground = True
-    else:
-         self.player.is_on_ground = False
-  
- def observe_enemy_collision(self, enemies):
+ def observe_enemy_collision(self, enemies, all_sprites):
       """ The observe_enemy_collision method checks if the player has collided with any of the enemies in the game.
             If the player has collided with an enemy, it checks if the player is above the enemy.
-            If the player is above the enemy, it posts an event to kill the enemy otherwise the player dies and posts and event of player death.
+            If the player is above the enemy, it posts an event to kill the enemy and despawns it, otherwise the player dies and posts and event of player death.
 
          Args:
             - enemies (list): The list of enemy sprites.
+            - all_sprites (SpriteRegistry): The group of all the sprites in the game, the killed enemy is removed from it at the end of the tick.
       """
 
       enemies_colliders = [enemy.rect for enemy in enemies]
@@ -128,8 +119,9 @@ class Observer:
          kirby_collider = enemies_colliders[enemy_collider_index]
 
          if self.player.rect.bottom >= kirby_collider.top and  not self.player.is_on_ground:
-            pg.event.post(pg.event.Event(GAME_EVENTS["ENEMY_KILLED_EVENT"]))
+            pg.event.post(pg.event.Event(GAME_EVENTS["ENEMY_KILLED_EVENT"], position=enemy.rect.center))
             enemy.dead = True
+            all_sprites.despawn(enemy)
          else:
-            pg.event.post(pg.event.Event(GAME_EVENTS["PLAYER_DEATH_EVENT"]))
+            pg.event.post(pg.event.Event(GAME_EVENTS["PLAYER_DEATH_EVENT"], position=self.player.rect.center))
     
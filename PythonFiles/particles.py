@@ -0,0 +1,150 @@
+import numpy as np
+import pygame as pg
+from consts import PARTICLES, PARTICLE_EFFECTS, RENDER_LAYERS
+
+
+def create_particle_sprites(color, size, levels=PARTICLES["FADE_LEVELS"]):
+    """ The create_particle_sprites function creates the sprites of a particle effect, one for each alpha level (from opaque to almost transparent).
+
+        Args:
+            - color (tuple): The color of the particles
+            - size (int): The size of the particles in pixels
+            - levels (int): The number of alpha levels
+
+        Returns:
+            - list: The sprites of the particles
+    """
+    sprites = []
+
+    for level in range(levels):
+        sprite = pg.Surface((size, size), pg.SRCALPHA)
+        sprite.fill((*color, 255 * (levels - level) // levels))
+        sprites.append(sprite.convert_alpha())
+
+    return sprites
+
+
+class ParticleSystem:
+    """ The ParticleSystem class is responsible for the particle effects of the moments signaled by the game (a kirby stomped, the player death and jump).
+        The particles are stored in preallocated NumPy arrays (position, velocity, life and sprite of each slot), the free slots are kept in a stack (free list),
+        so emitting and expiring particles doesn't create Python objects and the particles are updated with a few vectorized operations per tick.
+        The particles are added to the render queue (drawn with one Surface.blits call), with sprites created once per effect and alpha level (the particles fade out as their life ends).
+        When every slot is alive the new particles are not emitted.
+
+        The particles use their own random generator, so the effects don't change the random numbers of the game (e.g. headless sessions with a seed).
+
+        The class has the following attributes:
+            - capacity: The number of particles that can be alive at the same time
+            - positions: The position of each particle in the map, in pixels
+            - velocities: The velocity of each particle, in pixels per millisecond
+            - displacements: The displacement of each particle in the last tick (preallocated, so the update doesn't allocate it)
+            - lives: The remaining life of each particle in milliseconds
+            - max_lives: The life of each particle when it was emitted in milliseconds
+            - effects: The effect of each particle (its index in effect_names)
+            - alive: A flag indicating whether each slot has a particle
+            - free: The stack of the free slots
+            - free_count: The number of free slots (the top of the stack)
+            - effect_names: The names of the particle effects
+            - sprites: The sprites of the particles, the alpha levels of each effect in a row (the sprite of a particle is effect * FADE_LEVELS + level)
+            - random: The random generator of the particles
+    """
+
+    def __init__(self, capacity=PARTICLES["CAPACITY"]) -> None:
+        """ Initializes a new instance of the ParticleSystem class and allocates the arrays of the particles
+
+            Args:
+                - capacity (int): The number of particles that can be alive at the same time
+        """
+        self.capacity = capacity
+        self.positions = np.zeros((capacity, 2), dtype=np.float32)
+        self.velocities = np.zeros((capacity, 2), dtype=np.float32)
+        self.displacements = np.zeros((capacity, 2), dtype=np.float32)
+        self.lives = np.zeros(capacity, dtype=np.float32)
+        self.max_lives = np.ones(capacity, dtype=np.float32)
+        self.effects = np.zeros(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.free = np.arange(capacity - 1, -1, -1, dtype=np.int32)
+        self.free_count = capacity
+        self.effect_names = list(PARTICLE_EFFECTS)
+        self.sprites = [sprite for effect in PARTICLE_EFFECTS.values() for sprite in create_particle_sprites(effect["COLOR"], effect["SIZE"])]
+        self.random = np.random.default_rng(PARTICLES["SEED"])
+
+    def __len__(self):
+        return self.capacity - self.free_count
+
+    def emit(self, effect_name, position):
+        """ The emit method is responsible for emitting the particles of an effect from a position, in random directions and speeds of the effect ranges.
+
+            Args:
+                - effect_name (str): The name of the effect (e.g. STOMP, DEATH, JUMP)
+                - position (tuple): The position of the effect in the map
+        """
+        effect = PARTICLE_EFFECTS[effect_name]
+        count = min(effect["COUNT"], self.free_count)
+
+        if count == 0:
+            return
+
+        # The slots are taken from the top of the free stack
+        self.free_count -= count
+        slots = self.free[self.free_count:self.free_count + count]
+
+        angles = np.radians(self.random.uniform(*effect["DIRECTION"], count))
+        speeds = self.random.uniform(*effect["SPEED"], count)
+
+        self.positions[slots] = position
+        self.velocities[slots, 0] = np.cos(angles) * speeds
+        self.velocities[slots, 1] = np.sin(angles) * speeds
+        self.lives[slots] = effect["LIFE"]
+        self.max_lives[slots] = effect["LIFE"]
+        self.effects[slots] = self.effect_names.index(effect_name)
+        self.alive[slots] = True
+
+    def update(self, elapsed_time):
+        """ The update method is responsible for moving the particles, applying gravity and freeing the slots of the expired particles.
+
+            Args:
+                - elapsed_time (float): The simulation time elapsed since the last tick in milliseconds
+        """
+        if self.free_count == self.capacity:
+            return
+
+        alive = self.alive
+
+        # Every slot is updated, the operations on the whole arrays are faster than selecting the particles alive (the free slots are overwritten when they are emitted)
+        self.velocities[:, 1] += PARTICLES["GRAVITY"] * elapsed_time
+        np.multiply(self.velocities, elapsed_time, out=self.displacements)
+        self.positions += self.displacements
+        self.lives -= elapsed_time
+
+        expired = np.flatnonzero(alive & (self.lives <= 0))
+
+        if len(expired):
+            # The expired slots are pushed on the free stack
+            alive[expired] = False
+            self.free[self.free_count:self.free_count + len(expired)] = expired
+            self.free_count += len(expired)
+
+    def queue_particles(self, render_queue):
+        """ The queue_particles method is responsible for adding the particles alive to the effects layer of the render queue, the alpha level of each particle depends on its remaining life.
+
+            Args:
+                - render_queue (RenderQueue): The render queue of the frame
+        """
+        if self.free_count == self.capacity:
+            return
+
+        slots = np.flatnonzero(self.alive)
+        levels = PARTICLES["FADE_LEVELS"]
+
+        fade = ((1 - self.lives[slots] / self.max_lives[slots]) * levels).astype(np.int32).clip(0, levels - 1)
+        sprite_indexes = self.effects[slots] * levels + fade
+        positions = self.positions[slots].astype(np.int32)
+
+        render_queue.extend(RENDER_LAYERS["EFFECTS"], zip(map(self.sprites.__getitem__, sprite_indexes.tolist()), positions.tolist()))
+
+    def clear(self):
+        """ The clear method is responsible for removing every particle (e.g. when the level is restarted)."""
+        self.alive[:] = False
+        self.free[:] = np.arange(self.capacity - 1, -1, -1, dtype=np.int32)
+        self.free_count = self.capacity
@@ -1,5 +1,6 @@
+import os
 from sprite import Sprite
-from consts import PEACH_SPRITE_PATH, PEACH_SPAWN_POSITION, PEACH_COLLIDER
+from consts import PEACH_SPRITE_PATH, PEACH_COLLIDER
 
 class Peach(Sprite):
     """
@@ -9,8 +10,15 @@ class Peach(Sprite):
            
     """
 
-    def __init__(self):
-        """ Initializes a new instance of the Peach class"""
-        super().__init__(PEACH_SPRITE_PATH, PEACH_SPAWN_POSITION, PEACH_COLLIDER)
+    __slots__ = ()
+
+    def __init__(self, position):
+        """ Initializes a new instance of the Peach class
+
+            Args:
+                - position (tuple): The position of the peach in the level
+        """
+        # The path is resolved as the map does, so both share the image in the cache
+        super().__init__(os.path.join(os.path.dirname(__file__), PEACH_SPRITE_PATH), position, PEACH_COLLIDER)
 
 
@@ -0,0 +1,198 @@
+from consts import FLOOR_TILE_DIMENSIONS
+
+# Collision types of the cells of the tile grid
+EMPTY_CELL = 0
+ONE_WAY_CELL = 1
+SOLID_CELL = 2
+
+
+def to_pixels(velocity):
+    """ The to_pixels function is responsible for converting a velocity into the number of pixels moved in a frame.
+        It rounds half away from zero, as pygame does when a float is added to a Rect coordinate.
+
+        Args:
+            - velocity (float): The velocity in pixels per frame
+
+        Returns:
+            - int: The number of pixels moved
+    """
+    return int(velocity + 0.5) if velocity >= 0 else -int(-velocity + 0.5)
+
+
+class TileCollisionSolver:
+    """ The TileCollisionSolver class is responsible for moving the entities through the tile grid of the map, resolving their collisions with the floor blocks.
+        The movement of an entity is swept: the cells between its current edge and its new edge are converted to grid coordinates with integer math
+        (FLOOR_TILE_DIMENSIONS) and only those cells are tested, so the entity never goes through a tile and the cost is O(cells touched).
+        The X and Y axes are resolved separately (first X, then Y), it works for any entity with a rect, velocity_x, velocity_y and is_on_ground.
+
+        The solid tiles block the entities from every side. The one-way tiles (the platforms of the levels) only block the entities that fall on them from above,
+        so the entities can jump through them from below and walk through their sides.
+
+        The class has the following attributes:
+            - solid_tiles: The tiles that block the entities from every side
+            - one_way_tiles: The tiles that only block the entities falling on them
+            - cells: The grid of collision types of the cells (a list of rows, the rows can have different lengths)
+            - tile_width: The width of a tile
+            - tile_height: The height of a tile
+    """
+
+    def __init__(self, tile_map, solid_tiles=(), one_way_tiles=()) -> None:
+        """ Initializes a new instance of the TileCollisionSolver class
+
+            Args:
+                - tile_map (list of lists): The tile grid of the map
+                - solid_tiles (tuple): The tiles that block the entities from every side
+                - one_way_tiles (tuple): The tiles that only block the entities falling on them
+        """
+        self.solid_tiles = solid_tiles
+        self.one_way_tiles = one_way_tiles
+        self.cells = [[self.get_cell_type(tile) for tile in row] for row in tile_map]
+        self.tile_width = FLOOR_TILE_DIMENSIONS["WIDTH"]
+        self.tile_height = FLOOR_TILE_DIMENSIONS["HEIGHT"]
+
+    def get_cell_type(self, tile):
+        """ The get_cell_type method returns the collision type of a tile of the map.
+
+            Args:
+                - tile (object): The tile (None for an empty cell)
+
+            Returns:
+                - int: The collision type of the tile
+        """
+        return SOLID_CELL if tile in self.solid_tiles else ONE_WAY_CELL if tile in self.one_way_tiles else EMPTY_CELL
+
+    def set_tile(self, column, row, tile):
+        """ The set_tile method is responsible for changing the collision type of a cell when a tile of the map changes.
+            The grid is changed in place, so every entity that shares the solver sees the change.
+
+            Args:
+                - column (int): The column of the cell
+                - row (int): The row of the cell
+                - tile (object): The new tile (None for an empty cell)
+        """
+        while row >= len(self.cells):
+            self.cells.append([])
+
+        cells_row = self.cells[row]
+
+        if column >= len(cells_row):
+            cells_row.extend([EMPTY_CELL] * (column + 1 - len(cells_row)))
+
+        cells_row[column] = self.get_cell_type(tile)
+
+    def get_cell(self, column, row):
+        """ The get_cell method returns the collision type of a cell of the grid, the cells outside the grid are empty.
+
+            Args:
+                - column (int): The column of the cell
+                - row (int): The row of the cell
+
+            Returns:
+                - int: The collision type of the cell
+        """
+        if row < 0 or row >= len(self.cells) or column < 0:
+            return EMPTY_CELL
+
+        cells_row = self.cells[row]
+
+        return cells_row[column] if column < len(cells_row) else EMPTY_CELL
+
+    def is_row_blocked(self, row, first_column, last_column, min_cell=SOLID_CELL):
+        """ The is_row_blocked method checks if any cell of a row between two columns has at least a collision type."""
+        return any(self.get_cell(column, row) >= min_cell for column in range(first_column, last_column + 1))
+
+    def is_column_blocked(self, column, first_row, last_row):
+        """ The is_column_blocked method checks if any cell of a column between two rows is solid."""
+        return any(self.get_cell(column, row) == SOLID_CELL for row in range(first_row, last_row + 1))
+
+    def move(self, entity, velocity_x, velocity_y):
+        """ The move method is responsible for moving an entity by its velocity, first on the X axis and then on the Y axis.
+            When the entity hits a wall its velocity_x is set to 0, when it lands or hits a ceiling its velocity_y is set to 0.
+            The is_on_ground attribute of the entity is updated.
+
+            Args:
+                - entity (Sprite): The entity to be moved
+                - velocity_x (float): The horizontal velocity in pixels per frame
+                - velocity_y (float): The vertical velocity in pixels per frame
+
+            Returns:
+                - bool: A flag indicating whether the entity hit a wall
+        """
+        hit_wall = self.move_x(entity, to_pixels(velocity_x))
+
+        if hit_wall:
+            entity.velocity_x = 0
+
+        self.move_y(entity, to_pixels(velocity_y))
+
+        return hit_wall
+
+    def move_x(self, entity, distance):
+        """ The move_x method is responsible for moving an entity horizontally, stopping it at the first solid column.
+
+            Args:
+                - entity (Sprite): The entity to be moved
+                - distance (int): The number of pixels to move (negative to the left)
+
+            Returns:
+                - bool: A flag indicating whether the entity hit a wall
+        """
+        rect = entity.rect
+
+        if distance == 0:
+            return False
+
+        first_row = rect.top // self.tile_height
+        last_row = (rect.bottom - 1) // self.tile_height
+
+        if distance > 0:
+            for column in range(rect.right // self.tile_width, (rect.right + distance - 1) // self.tile_width + 1):
+                if self.is_column_blocked(column, first_row, last_row):
+                    rect.right = max(column * self.tile_width, rect.right)
+                    return True
+        else:
+            for column in range((rect.left - 1) // self.tile_width, (rect.left + distance) // self.tile_width - 1, -1):
+                if self.is_column_blocked(column, first_row, last_row):
+                    rect.left = min((column + 1) * self.tile_width, rect.left)
+                    return True
+
+        rect.x += distance
+
+        return False
+
+    def move_y(self, entity, distance):
+        """ The move_y method is responsible for moving an entity vertically, stopping it at the first solid row.
+            The one-way cells only stop the entities whose feet are above them before the move.
+            An entity that does not move vertically is on the ground when its feet rest on the top of a blocked row.
+
+            Args:
+                - entity (Sprite): The entity to be moved
+                - distance (int): The number of pixels to move (negative upwards)
+        """
+        rect = entity.rect
+        first_column = rect.left // self.tile_width
+        last_column = (rect.right - 1) // self.tile_width
+
+        if distance == 0:
+            entity.is_on_ground = rect.bottom % self.tile_height == 0 and self.is_row_blocked(rect.bottom // self.tile_height, first_column, last_column, ONE_WAY_CELL)
+            return
+
+        entity.is_on_ground = False
+
+        if distance > 0:
+            for row in range(rect.bottom // self.tile_height, (rect.bottom + distance - 1) // self.tile_height + 1):
+                min_cell = ONE_WAY_CELL if row * self.tile_height >= rect.bottom else SOLID_CELL
+
+                if self.is_row_blocked(row, first_column, last_column, min_cell):
+                    rect.bottom = row * self.tile_height
+                    entity.velocity_y = 0
+                    entity.is_on_ground = True
+                    return
+        else:
+            for row in range((rect.top - 1) // self.tile_height, (rect.top + distance) // self.tile_height - 1, -1):
+                if self.is_row_blocked(row, first_column, last_column):
+                    rect.top = (row + 1) * self.tile_height
+                    entity.velocity_y = 0
+                    return
+
+        rect.y += distance
@@ -1,8 +1,7 @@
-import pygame as pg
 from sprite import Sprite
+from game_map import Map
 import finite_state_machine as fsm
 import os
-from command import InputHandler
 from consts import GRAVITY, PLAYER_SPAWN_POSITION , PLAYER_COLLIDER, PLAYER_MOVEMENT, PLAYER_PATHS
 
 
@@ -14,8 +13,25 @@ class Player(Sprite):
             - jump_speed: The speed of the player's jump
             - sound_player: The sound player of the player
             - last_key_pressed: The last key pressed by the player
+            - collision_solver: The solver that moves the player through the tile grid of the map
     """
 
+    __slots__ = ("turned_right", "velocity_x", "velocity_y", "collision_solver", "commands_provider")
+
+    name = "Bowser"
+
+    # The states and transitions don't keep data of the player, they are stored in the class as the ones of the other entities
+    idle = fsm.Idle()
+    walk = fsm.Walk()
+    jump = fsm.Jump()
+    states = [idle, walk, jump]
+    transitions = {
+        "walk": fsm.Transition(idle, walk),
+        "jump": fsm.Transition(idle, jump),
+        "idle": fsm.Transition(walk, idle),
+        "fall": fsm.Transition(jump, idle)
+    }
+
     def __init__(self): 
         """
             Initializes a new instance of the Player class, and calls the constructor of the Entity class (the parent class)
@@ -32,79 +48,69 @@ class Player(Sprite):
             
             self.is_on_ground = True
             self.turned_right = True
-            self.name = "Bowser"
             self.velocity_x = 0
             self.velocity_y = 0
+            self.collision_solver = Map().collision_solver
+
+            # Function that returns the commands of the pressed actions, the game connects it to its input handler
+            # It can be replaced to drive the player without a keyboard (e.g. headless sessions), until then no command is executed
+            self.commands_provider = tuple
 
             # Initialize FSM and states
             self.fsm = fsm.FSM(self.set_states(), self.set_transitions())
 
-            self.input_handler = InputHandler()
-
 
     def set_states(self):
-        """ The set_states method is responsible for setting the states of the player e.g. (idle, walk, jump)
+        """ The set_states method is responsible for returning the states of the player e.g. (idle, walk, jump)
             Returns:
                 - states (list): A list of the player's states
         """
-        self.idle = fsm.Idle()
-        self.walk = fsm.Walk()
-        self.jump = fsm.Jump()
-
-        return [self.idle, self.walk, self.jump]
+        return self.states
     
     def set_transitions(self):
-        """ The set_transitions method is responsible for setting the transitions between the player's states
+        """ The set_transitions method is responsible for returning the transitions between the player's states
 
             Returns:
                 - transitions (dict): A dictionary of the player's transitions
         """
-        return {
-            "walk": fsm.Transition(self.idle, self.walk),
-            "jump": fsm.Transition(self.idle, self.jump),
-            "idle": fsm.Transition(self.walk, self.idle),
-            "fall": fsm.Transition(self.jump, self.idle)
-        }
+        return self.transitions
                 
     def update(self):
-        """ The update method is responsible for move the player based on pressed keys, applying gravity, and playing animations
+        """ The update method is responsible for move the player based on the active commands, applying gravity, and playing animations
            Calling respectively this methods: move, apply_gravity, play_animation (from the animator attribute)
         """
-        pressed_keys = pg.key.get_pressed()
+        commands = self.commands_provider()
     
         if not self.is_on_ground:
             self.apply_gravity()
       
 
-        self.move(pressed_keys)
+        self.move(commands)
         
         self.animator.play_animation(self.fsm.current.name, self )
 
-    def move(self, keys):
-        """ The move method is responsible for moving the player based on the pressed keys and sets the player idle if no movement key is pressed.
-            If the player presses the space key, W key, or UP key, the initiate_jump method is called to make the player jump.
-            If the player presses the D key or RIGHT key, the move_right method is called to move the player to the right.
-            If the player presses the A key or LEFT key, the move_left method is called to move the player to the left.
+    def move(self, commands):
+        """ The move method is responsible for moving the player based on the active commands and sets the player idle if no movement key is pressed.
+            The jump command calls the initiate_jump method to make the player jump.
+            The move right command calls the move_right method to move the player to the right.
+            The move left command calls the move_left method to move the player to the left.
 
             Args:
-                - keys (list): A list of the pressed keys
+                - commands (tuple): The commands of the pressed actions
         """
-        handled_movement = False
-
-        for key, command in self.input_handler.commands.items():
-            if keys[key]:
-                command.execute(self)
-                handled_movement = True
+        for command in commands:
+            command.execute(self)
 
         # Transition to idle state if no movement key is pressed
-        if not handled_movement:
+        if not commands:
             self.velocity_x *= PLAYER_MOVEMENT["FRICTION"]
             self.fsm.update("idle", self)
 
 
-        self.rect.x += self.velocity_x  if self.rect.x + self.velocity_x > 0 else 0
+        # The player can't move beyond the left limit of the map
+        velocity_x = self.velocity_x if self.rect.x + self.velocity_x > 0 else 0
 
-        self.rect.y += self.velocity_y
+        self.collision_solver.move(self, velocity_x, self.velocity_y)
 
     def move_right(self):
         """ The move_right method is responsible for moving the player to the right  and sprite flip.
@@ -116,8 +122,8 @@ class Player(Sprite):
         self.velocity_x = PLAYER_MOVEMENT["SPEED"]
 
         if not self.turned_right:
-            self.image = pg.transform.flip(self.image, True, False)
             self.turned_right = True
+            self.animator.show_frame(self)
 
     def move_left(self):
         """ The move_left method is responsible for moving the player to the left  and sprite flip.
@@ -129,8 +135,8 @@ class Player(Sprite):
         self.velocity_x = -PLAYER_MOVEMENT["SPEED"]
 
         if self.turned_right:
-            self.image = pg.transform.flip(self.image, True, False)
             self.turned_right = False
+            self.animator.show_frame(self)
 
     def initiate_jump(self):
         """ The initiate_jump method is responsible for making the player jump if it is on the ground.
@@ -154,6 +160,14 @@ class Player(Sprite):
         self.rect.x = PLAYER_SPAWN_POSITION[0]
         self.rect.y = PLAYER_SPAWN_POSITION[1]
 
-    def quit_game(self):
-        """ The quit_game method is responsible for quitting the game"""
-        pg.quit()
\ No newline at end of file
+    def reset(self):
+        """ The reset method is responsible for restoring the player to its spawn state (position, velocity, direction, state and animation)"""
+        self.respawn()
+
+        self.velocity_x = 0
+        self.velocity_y = 0
+        self.is_on_ground = True
+        self.turned_right = True
+
+        self.fsm.reset()
+        self.animator.reset()
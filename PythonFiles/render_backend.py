@@ -0,0 +1,278 @@
+import weakref
+import pygame as pg
+from consts import SCREEN_DIMENSIONS, GAME_TITLE, SCALING
+
+
+def get_scaled_rect(window_size):
+    """ The get_scaled_rect function returns the area of the window where the frame is shown when it is scaled.
+        The frame is scaled by the largest integer factor that fits in the window (so every pixel has the same size),
+        if the window is smaller than the frame it is shrunk keeping its aspect ratio. The area is centered (letterbox).
+
+        Args:
+            - window_size (tuple): The size of the window
+
+        Returns:
+            - Rect: The area of the window where the frame is shown
+    """
+    width, height = SCREEN_DIMENSIONS["WIDTH"], SCREEN_DIMENSIONS["HEIGHT"]
+    scale = min(window_size[0] // width, window_size[1] // height)
+
+    if scale >= 1:
+        size = (width * scale, height * scale)
+    else:
+        fit = min(window_size[0] / width, window_size[1] / height)
+        size = (max(1, int(width * fit)), max(1, int(height * fit)))
+
+    rect = pg.Rect((0, 0), size)
+    rect.center = (window_size[0] // 2, window_size[1] // 2)
+
+    return rect
+
+
+class SurfaceBackend:
+    """ The SurfaceBackend class is the default rendering backend, it draws every frame with Surface.blit (software rendering).
+        In the window scale mode the frame is drawn on the display surface. In the resizable and fullscreen scale modes the frame is drawn once
+        on an offscreen surface with the screen dimensions, and it is scaled to the window with one nearest neighbour scale (pygame.transform.scale) per frame.
+        The scale writes into a subsurface of the display surface, preallocated when the window size changes, so it doesn't allocate in each frame.
+
+        The class has the following attributes:
+            - surface: The surface where the menus and the level are drawn (the display surface or the offscreen surface)
+            - scale_mode: The scale mode (window, resizable or fullscreen)
+            - target: The area of the display surface where the frame is scaled (None in the window scale mode)
+    """
+
+    def __init__(self, scale_mode="window") -> None:
+        """ Initializes a new instance of the SurfaceBackend class and opens the game window
+
+            Args:
+                - scale_mode (str): The scale mode (window, resizable or fullscreen)
+        """
+        self.scale_mode = scale_mode
+        self.target = None
+        size = (SCREEN_DIMENSIONS["WIDTH"], SCREEN_DIMENSIONS["HEIGHT"])
+
+        if scale_mode == "window":
+            self.surface = pg.display.set_mode(size)
+        else:
+            if scale_mode == "fullscreen":
+                display = pg.display.set_mode((0, 0), pg.FULLSCREEN)
+            else:
+                display = pg.display.set_mode((size[0] * SCALING["WINDOW_SCALE"], size[1] * SCALING["WINDOW_SCALE"]), pg.RESIZABLE)
+
+            # The offscreen surface has the pixel format of the display, pygame.transform.scale needs the same format in both surfaces
+            self.surface = pg.Surface(size).convert(display)
+            self.resize(display.get_size())
+
+        pg.display.set_caption(GAME_TITLE)
+
+    def resize(self, window_size):
+        """ The resize method is responsible for preparing the area of the window where the frame is scaled, it is called when the window size changes.
+
+            Args:
+                - window_size (tuple): The new size of the window
+        """
+        if self.scale_mode == "window":
+            return
+
+        display = pg.display.get_surface()
+        display.fill(SCALING["LETTERBOX_COLOR"])
+
+        self.target = display.subsurface(get_scaled_rect(display.get_size()))
+
+    def fill(self, color):
+        """ The fill method is responsible for clearing the frame with a color.
+
+            Args:
+                - color (tuple): The color of the background
+        """
+        self.surface.fill(color)
+
+    def blit(self, source, dest):
+        """ The blit method is responsible for drawing a surface on the frame.
+
+            Args:
+                - source (Surface): The surface to be drawn
+                - dest (Rect | tuple): The position of the surface on the frame
+        """
+        self.surface.blit(source, dest)
+
+    def blits(self, sequence):
+        """ The blits method is responsible for drawing many surfaces on the frame with one call (e.g. the particles).
+
+            Args:
+                - sequence (iterable): The surfaces to be drawn and their positions on the frame
+        """
+        self.surface.blits(sequence, doreturn=False)
+
+    def preload(self, surfaces):
+        """ The preload method does nothing, the surfaces are drawn directly."""
+        pass
+
+    def present(self):
+        """ The present method is responsible for showing the frame on the window, scaling it when the backend draws offscreen."""
+        if self.target is not None:
+            pg.transform.scale(self.surface, self.target.get_size(), self.target)
+
+        pg.display.flip()
+
+    def present_surface(self, surface):
+        """ The present_surface method is responsible for showing a frame drawn on a surface (e.g. the menus).
+
+            Args:
+                - surface (Surface): The surface with the frame, it is the surface of this backend
+        """
+        self.present()
+
+    def get_frame(self):
+        """ The get_frame method returns the surface with the frame drawn, before it is scaled to the window (e.g. to capture it).
+
+            Returns:
+                - Surface: The surface with the frame
+        """
+        return self.surface
+
+
+class TextureBackend:
+    """ The TextureBackend class draws the level with the SDL2 Renderer and Texture objects (pygame._sdl2.video).
+        Each surface is uploaded to a texture the first time it is drawn (or when it is preloaded) and the texture is reused while the surface exists,
+        so the frames are composed with texture copies, hardware accelerated when the driver supports it and by SDL's software renderer otherwise.
+        The menus are drawn on an offscreen surface that is uploaded to a streaming texture.
+        In the resizable and fullscreen scale modes the renderer has a logical size equal to the screen dimensions, so SDL scales every copy to the window
+        (letterboxed, nearest neighbour) in the same pass that draws it.
+
+        The class has the following attributes:
+            - window: The SDL2 window
+            - renderer: The SDL2 renderer of the window
+            - surface: The offscreen surface where the menus are drawn
+            - textures: The textures of the surfaces drawn, the entries are removed when the surfaces are destroyed
+            - screen_texture: The streaming texture where the offscreen surface is uploaded
+            - frame: The surface where the frame is read back when it is captured (created the first time)
+    """
+
+    def __init__(self, scale_mode="window") -> None:
+        """ Initializes a new instance of the TextureBackend class, opens the game window and creates its renderer
+
+            Args:
+                - scale_mode (str): The scale mode (window, resizable or fullscreen)
+        """
+        from pygame._sdl2 import video
+
+        self.video = video
+        size = (SCREEN_DIMENSIONS["WIDTH"], SCREEN_DIMENSIONS["HEIGHT"])
+
+        # Surface.convert_alpha needs a display mode, a hidden 1x1 display gives the pixel format without showing a second window
+        pg.display.set_mode((1, 1), pg.HIDDEN)
+
+        if scale_mode == "window":
+            self.window = video.Window(GAME_TITLE, size)
+        else:
+            self.window = video.Window(GAME_TITLE, (size[0] * SCALING["WINDOW_SCALE"], size[1] * SCALING["WINDOW_SCALE"]), resizable=True)
+
+            if scale_mode == "fullscreen":
+                self.window.set_fullscreen(desktop=True)
+
+        self.renderer = video.Renderer(self.window)
+
+        if scale_mode != "window":
+            self.renderer.logical_size = size
+
+        self.surface = pg.Surface(size)
+        self.textures = weakref.WeakKeyDictionary()
+        self.screen_texture = video.Texture(self.renderer, size, streaming=True)
+        self.frame = None
+
+    def resize(self, window_size):
+        """ The resize method does nothing, the renderer scales the frame to the new window size.
+
+            Args:
+                - window_size (tuple): The new size of the window
+        """
+        pass
+
+    def get_texture(self, surface):
+        """ The get_texture method is responsible for returning the texture of a surface, uploading it if it was not uploaded yet.
+
+            Args:
+                - surface (Surface): The surface
+
+            Returns:
+                - Texture: The texture of the surface
+        """
+        texture = self.textures.get(surface)
+
+        if texture is None:
+            texture = self.video.Texture.from_surface(self.renderer, surface)
+            self.textures[surface] = texture
+
+        return texture
+
+    def fill(self, color):
+        """ The fill method is responsible for clearing the frame with a color.
+
+            Args:
+                - color (tuple): The color of the background
+        """
+        self.renderer.draw_color = pg.Color(color)
+        self.renderer.clear()
+
+    def blit(self, source, dest):
+        """ The blit method is responsible for copying the texture of a surface to the frame, the camera offset is already applied to the position.
+
+            Args:
+                - source (Surface): The surface to be drawn
+                - dest (Rect | tuple): The position of the surface on the frame
+        """
+        texture = self.get_texture(source)
+        texture.draw(dstrect=(dest[0], dest[1], texture.width, texture.height))
+
+    def blits(self, sequence):
+        """ The blits method is responsible for copying the textures of many surfaces to the frame (e.g. the particles), the renderer has no batched copy.
+
+            Args:
+                - sequence (iterable): The surfaces to be drawn and their positions on the frame
+        """
+        for source, dest in sequence:
+            self.blit(source, dest)
+
+    def preload(self, surfaces):
+        """ The preload method is responsible for uploading surfaces before they are drawn (e.g. the animations and map caches).
+
+            Args:
+                - surfaces (iterable): The surfaces to be uploaded
+        """
+        for surface in surfaces:
+            self.get_texture(surface)
+
+    def present(self):
+        """ The present method is responsible for showing the frame on the window."""
+        self.renderer.present()
+
+    def present_surface(self, surface):
+        """ The present_surface method is responsible for showing a frame drawn on a surface (e.g. the menus).
+
+            Args:
+                - surface (Surface): The surface with the frame
+        """
+        self.screen_texture.update(surface)
+        self.screen_texture.draw()
+        self.renderer.present()
+
+    def get_frame(self):
+        """ The get_frame method returns the frame composed by the renderer, it is read back into a surface (a slow copy, only used to capture the frames).
+            It must be called before the frame is presented.
+
+            Returns:
+                - Surface: The surface with the frame
+        """
+        size = self.renderer.get_viewport().size
+
+        if self.frame is None or self.frame.get_size() != size:
+            self.frame = pg.Surface(size)
+
+        return self.renderer.to_surface(self.frame)
+
+
+# Rendering backends that can be chosen when the game starts
+RENDER_BACKENDS = {"surface": SurfaceBackend,
+                   "texture": TextureBackend
+                  }
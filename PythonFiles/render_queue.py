@@ -0,0 +1,78 @@
+from consts import RENDER_LAYERS
+
+# Layers drawn in screen coordinates, the camera offset is not applied to them (e.g. the HUD labels)
+SCREEN_SPACE_LAYERS = (RENDER_LAYERS["HUD"],)
+
+
+class RenderQueue:
+    """ The RenderQueue class is responsible for gathering everything drawn in a frame of the level (the map tiles, the sprites, the particles and the HUD)
+        and submitting it to the rendering backend with one blits call.
+        The entries (surface and position) are gathered in a list per layer, so they are sorted by layer without sorting them (the layers are drawn in order
+        and the entries of a layer in the order they were added). The positions are in map coordinates, except in the screen space layers,
+        and the camera offset is applied with integer math into a list of destinations reused in every frame, so drawing doesn't create a Rect per entry.
+        A position can be any object indexed by x and y (e.g. the rect of a sprite, or a tuple).
+
+        The class has the following attributes:
+            - layers: The entries of each layer gathered since the last flush
+            - sources: The surfaces submitted in the last flush, in drawing order (reused)
+            - destinations: The positions on the frame of the surfaces submitted (reused, it grows to the largest frame)
+    """
+
+    def __init__(self) -> None:
+        """ Initializes a new instance of the RenderQueue class"""
+        self.layers = [[] for _ in RENDER_LAYERS]
+        self.sources = []
+        self.destinations = []
+
+    def __len__(self):
+        return sum(len(entries) for entries in self.layers)
+
+    def add(self, layer, surface, position):
+        """ The add method is responsible for adding a surface to be drawn in a layer.
+
+            Args:
+                - layer (int): The layer of the surface (a value of RENDER_LAYERS)
+                - surface (Surface): The surface to be drawn
+                - position (Rect | tuple): The position of the surface
+        """
+        self.layers[layer].append((surface, position))
+
+    def extend(self, layer, entries):
+        """ The extend method is responsible for adding many surfaces to be drawn in a layer.
+
+            Args:
+                - layer (int): The layer of the surfaces (a value of RENDER_LAYERS)
+                - entries (iterable): The surfaces to be drawn and their positions
+        """
+        self.layers[layer].extend(entries)
+
+    def flush(self, render_backend, camera_offset):
+        """ The flush method is responsible for drawing the entries of every layer in order with one blits call and emptying the queue.
+
+            Args:
+                - render_backend (SurfaceBackend | TextureBackend): The rendering backend that draws the frame
+                - camera_offset (tuple): The offset of the camera added to the positions in map coordinates
+        """
+        sources = self.sources
+        destinations = self.destinations
+        sources.clear()
+        count = 0
+
+        for layer, entries in enumerate(self.layers):
+            offset_x, offset_y = (0, 0) if layer in SCREEN_SPACE_LAYERS else camera_offset
+
+            for surface, position in entries:
+                if count == len(destinations):
+                    destinations.append([0, 0])
+
+                destination = destinations[count]
+                destination[0] = position[0] + offset_x
+                destination[1] = position[1] + offset_y
+
+                sources.append(surface)
+                count += 1
+
+            entries.clear()
+
+        # The destinations beyond the entries of this frame are not drawn (zip stops at the last source)
+        render_backend.blits(zip(sources, destinations))
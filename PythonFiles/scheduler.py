@@ -0,0 +1,115 @@
+import heapq
+
+
+class Timer:
+    """ The Timer class is responsible for storing a callback scheduled in the Scheduler.
+
+        The class has the following attributes:
+            - due: The simulation time when the callback is called, in milliseconds
+            - interval: The time between two calls of a repeating timer in milliseconds (None for a one-shot timer)
+            - callback: The function called when the timer expires
+            - sequence: The order in which the timer was scheduled, the timers that expire at the same time are called in this order
+            - cancelled: A flag indicating whether the timer was cancelled
+    """
+
+    __slots__ = ("due", "interval", "callback", "sequence", "cancelled")
+
+    def __init__(self, due, interval, callback, sequence) -> None:
+        """ Initializes a new instance of the Timer class
+
+            Args:
+                - due (float): The simulation time when the callback is called
+                - interval (float): The time between two calls of a repeating timer (None for a one-shot timer)
+                - callback (function): The function called when the timer expires
+                - sequence (int): The order in which the timer was scheduled
+        """
+        self.due = due
+        self.interval = interval
+        self.callback = callback
+        self.sequence = sequence
+        self.cancelled = False
+
+    def __lt__(self, other):
+        return (self.due, self.sequence) < (other.due, other.sequence)
+
+
+class Scheduler:
+    """ The Scheduler class is responsible for calling the timed callbacks of the game (e.g. the countdown, the time alert and the timeout).
+        The time of the scheduler is the simulation time: it only advances when the level is played, so the timers are paused with the game
+        (menus, game over screen) and don't depend on the speed of the machine in headless sessions.
+        The timers are kept in a priority queue (heapq) ordered by their due time, so advancing the time only visits the expired timers.
+        The cancelled timers are discarded when they reach the top of the queue.
+
+        The class has the following attributes:
+            - time: The simulation time in milliseconds
+            - timers: The priority queue of the scheduled timers
+            - sequence: The number of timers scheduled, it orders the timers that expire at the same time
+    """
+
+    def __init__(self) -> None:
+        """ Initializes a new instance of the Scheduler class"""
+        self.time = 0
+        self.timers = []
+        self.sequence = 0
+
+    def __len__(self):
+        return sum(1 for timer in self.timers if not timer.cancelled)
+
+    def schedule(self, delay, callback, repeat=False):
+        """ The schedule method is responsible for calling a function after a delay, once or every time the delay elapses.
+
+            Args:
+                - delay (float): The time until the call in milliseconds (and between the calls of a repeating timer)
+                - callback (function): The function to be called
+                - repeat (bool): A flag indicating whether the function is called repeatedly
+
+            Returns:
+                - Timer: The timer, it can be cancelled
+        """
+        if repeat and delay <= 0:
+            raise ValueError("The interval of a repeating timer must be positive")
+
+        timer = Timer(self.time + delay, delay if repeat else None, callback, self.sequence)
+        self.sequence += 1
+
+        heapq.heappush(self.timers, timer)
+
+        return timer
+
+    def cancel(self, timer):
+        """ The cancel method is responsible for cancelling a timer, its callback is not called anymore.
+
+            Args:
+                - timer (Timer): The timer to be cancelled
+        """
+        timer.cancelled = True
+
+    def advance(self, elapsed_time):
+        """ The advance method is responsible for advancing the simulation time and calling the callbacks of the expired timers in order.
+            A repeating timer that expired more than once in the elapsed time is called once for each expiration.
+
+            Args:
+                - elapsed_time (float): The simulation time elapsed since the last advance in milliseconds
+        """
+        self.time += elapsed_time
+
+        while self.timers and self.timers[0].due <= self.time:
+            timer = heapq.heappop(self.timers)
+
+            if timer.cancelled:
+                continue
+
+            # The repeating timer is scheduled again before the call, so the callback can cancel it
+            if timer.interval is not None:
+                timer.due += timer.interval
+                heapq.heappush(self.timers, timer)
+
+            timer.callback()
+
+    def clear(self):
+        """ The clear method is responsible for cancelling every timer and rewinding the simulation time (e.g. when the level is restarted)."""
+        for timer in self.timers:
+            timer.cancelled = True
+
+        self.timers = []
+        self.time = 0
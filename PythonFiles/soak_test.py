@@ -0,0 +1,180 @@
+import gc
+import sys
+import argparse
+import tracemalloc
+import pygame as pg
+from headless import HeadlessSession, ScriptedInput, DEFAULT_MAX_FRAMES
+from game import event_handler, update_display
+
+# Input script of each cycle: the player walks into the first Kirby (death and respawn) and then waits until the time runs out (game over)
+SOAK_SCRIPT = [{"frames": 150, "actions": ["move_right"]}]
+
+# Ways of restarting the level after the game over, the cycles alternate between them
+RESTART_MODES = ["in_place", "reload"]
+
+
+class SoakTest:
+    """ The SoakTest class is responsible for driving the game without window through many play -> death -> game over -> restart cycles
+        and detecting the memory that is not released between the cycles.
+        The restarts alternate between restarting the level in place (the confirm key on the game over screen) and unloading and loading it again
+        (clear_level and setup_game_level), both finish with fsm.update("restart_game") as the game over screen does.
+
+        The memory is traced from the first cycle, so the objects replaced by every reload are traced in the baseline as well.
+        After the warmup cycles a tracemalloc snapshot is taken as the baseline, then the memory is measured every interval of cycles
+        and the growth per cycle is the growth of the traced memory since the baseline divided by the cycles played since the baseline.
+        The garbage collector is run before each measurement, so the objects kept only by reference cycles are not counted.
+
+        The class has the following attributes:
+            - session: The headless session that loads the level
+            - game: The game instance
+            - cycles: The number of cycles measured
+            - warmup: The number of cycles played before the baseline (the caches are filled in them)
+            - interval: The number of cycles between two snapshots
+            - threshold: The maximum growth per cycle in bytes
+            - render: A flag indicating whether the frames are drawn (on the dummy display)
+            - samples: The cycle, traced memory and growth per cycle of each snapshot
+    """
+
+    def __init__(self, cycles, warmup, interval, threshold, render=True) -> None:
+        """ Initializes a new instance of the SoakTest class
+
+            Args:
+                - cycles (int): The number of cycles measured
+                - warmup (int): The number of cycles played before the baseline
+                - interval (int): The number of cycles between two snapshots
+                - threshold (int): The maximum growth per cycle in bytes
+                - render (bool): A flag indicating whether the frames are drawn
+        """
+        self.session = HeadlessSession(input_script=SOAK_SCRIPT, render=render)
+        self.game = self.session.game
+        self.cycles = cycles
+        self.warmup = warmup
+        self.interval = interval
+        self.threshold = threshold
+        self.render = render
+        self.samples = []
+
+    def play_cycle(self):
+        """ The play_cycle method is responsible for playing the level until the game over screen.
+
+            Returns:
+                - bool: A flag indicating whether the game over screen was reached
+        """
+        game = self.game
+        game.player.commands_provider = ScriptedInput(SOAK_SCRIPT)
+
+        for _ in range(DEFAULT_MAX_FRAMES):
+            game.player.commands_provider.advance()
+            game.play_level()
+            event_handler(True, game)
+
+            if self.render:
+                update_display(game)
+
+            if game.fsm.current == game.game_over:
+                update_display(game)
+                return True
+
+        return False
+
+    def restart(self, mode):
+        """ The restart method is responsible for restarting the level from the game over screen.
+
+            Args:
+                - mode (str): The way of restarting the level (in_place or reload)
+        """
+        game = self.game
+
+        if mode == "reload":
+            game.clear_level()
+
+        # The confirm key restarts the level in place, or loads it again when it was unloaded
+        pg.event.post(pg.event.Event(pg.KEYDOWN, key=pg.K_RETURN))
+        pg.event.post(pg.event.Event(pg.KEYUP, key=pg.K_RETURN))
+        event_handler(True, game)
+
+    def run_cycle(self, cycle):
+        """ The run_cycle method is responsible for playing a cycle and restarting the level.
+
+            Args:
+                - cycle (int): The number of the cycle
+
+            Raises:
+                - RuntimeError: If the game over screen is not reached
+        """
+        if not self.play_cycle():
+            raise RuntimeError(f"The cycle {cycle} did not reach the game over screen")
+
+        self.restart(RESTART_MODES[cycle % len(RESTART_MODES)])
+
+    def run(self):
+        """ The run method is responsible for playing the warmup and measured cycles and taking the snapshots.
+
+            Returns:
+                - tuple: A flag indicating whether the growth is within the threshold, and the statistics of the top allocating sites since the baseline
+        """
+        tracemalloc.start(10)
+        self.session.start()
+
+        for cycle in range(self.warmup):
+            self.run_cycle(cycle)
+
+        gc.collect()
+        baseline = tracemalloc.take_snapshot()
+        baseline_size = tracemalloc.get_traced_memory()[0]
+
+        for cycle in range(1, self.cycles + 1):
+            self.run_cycle(self.warmup + cycle)
+
+            if cycle % self.interval == 0 or cycle == self.cycles:
+                gc.collect()
+                size = tracemalloc.get_traced_memory()[0]
+                self.samples.append((cycle, size, (size - baseline_size) / cycle))
+                print(f"cycle {cycle:>6}  traced {size / 1024:>10.1f} KiB  growth {(size - baseline_size) / cycle:>10.1f} B/cycle")
+
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")]
+        top_sites = snapshot.filter_traces(filters).compare_to(baseline.filter_traces(filters), "lineno")
+
+        growth = self.samples[-1][2] if self.samples else 0
+
+        return growth <= self.threshold, top_sites
+
+
+def parse_arguments():
+    """ The parse_arguments function is responsible for parsing the command line arguments of the soak test.
+
+        Returns:
+            - Namespace: The parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Plays many play -> death -> game over -> restart cycles and fails when the memory grows between them.")
+    parser.add_argument("--cycles", type=int, default=1000, help="number of cycles measured")
+    parser.add_argument("--warmup", type=int, default=4, help="number of cycles played before the baseline snapshot")
+    parser.add_argument("--interval", type=int, default=100, help="number of cycles between two snapshots")
+    parser.add_argument("--threshold", type=int, default=512, help="maximum memory growth per cycle in bytes")
+    parser.add_argument("--top", type=int, default=10, help="number of allocating sites reported")
+    parser.add_argument("--no-render", action="store_true", help="don't draw the frames")
+
+    return parser.parse_args()
+
+
+def main():
+    """ The main function runs the soak test, prints the top allocating sites and exits with an error code when the memory grows."""
+    arguments = parse_arguments()
+
+    soak_test = SoakTest(arguments.cycles, arguments.warmup, arguments.interval, arguments.threshold, not arguments.no_render)
+    passed, top_sites = soak_test.run()
+
+    print(f"Top {arguments.top} allocating sites since the baseline:")
+
+    for statistic in top_sites[:arguments.top]:
+        print(f"  {statistic}")
+
+    print("PASSED" if passed else f"FAILED: the memory grows more than {arguments.threshold} bytes per cycle")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
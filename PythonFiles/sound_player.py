@@ -1,5 +1,7 @@
 from pygame import mixer
 import os
+from lru_cache import LRUCache, get_sound_size
+from consts import GAME_EVENTS, MUSIC, CACHE_BUDGETS
 
 class SoundPlayer:   
     """The SoundPlayer class is responsible for playing sounds in the game. It uses the Flyweight pattern to store shared instances of sounds.
@@ -7,39 +9,43 @@ class SoundPlayer:
          The class has the following attributes:
             - sounds: The list of sounds to be played
             - is_music: A flag indicating whether the sound is music or a sound effect
-            - _sounds: A dictionary that stores the shared instances of sounds (Flyweight storage)
+            - _sounds: A cache that stores the shared instances of sounds (Flyweight storage), bounded by a byte budget (LRU eviction, the sounds that are playing are kept)
     """
-    _sounds = {}
+    _sounds = LRUCache("sounds", CACHE_BUDGETS["SOUNDS"], get_sound_size, in_use=lambda sound: sound.get_num_channels() > 0)
 
     def __init__(self, sounds, is_music):
         """ 
-            Initializes a new instance of the SoundPlayer class, and initializes the mixer module (pygame.mixer) which is responsible for playing sounds.
+            Initializes a new instance of the SoundPlayer class, and initializes the mixer module (pygame.mixer) which is responsible for playing sounds, if it was not initialized yet.
             
             Args:
                 - sounds (list): The list of sounds to be played
                 - is_music (bool): A flag indicating whether the sound is music or a sound effect
         """
-        mixer.init()
+        if mixer.get_init() is None:
+            mixer.init()
+
         self.is_music = is_music
         self.sounds = sounds
 
     def get_sound(self, sound_name):
         """    
             The get_sound method is responsible for returning a shared instance of a sound or creating a new one if it does not exist.
-            These shared instances are stored in a dictionary with the sound name and a flag indicating whether the sound is music or a sound effect.
+            These shared instances are stored in a cache with the sound name and a flag indicating whether the sound is music or a sound effect.
         
             Args:
                 - sound_name (str): The name of the sound file
         """
         sound_key = (sound_name, self.is_music)
+        sound = self._sounds.get(sound_key)
         
-        if sound_key not in self._sounds:
+        if sound is None:
             sound_base_path = os.path.join(os.path.dirname(__file__), "../Assets/SoundTrack/")
             sound_path = os.path.join(sound_base_path, f"{'Music' if self.is_music else 'SoundEffects'}/{sound_name}.wav")
 
-            self._sounds[sound_key] = mixer.Sound(sound_path)
+            sound = mixer.Sound(sound_path)
+            self._sounds.put(sound_key, sound)
         
-        return self._sounds[sound_key]
+        return sound
 
     def play(self, sound_name):
         """ The play method is responsible for playing the sound, setting the volume, and looping the sound if it is music.
@@ -64,3 +70,131 @@ class SoundPlayer:
             raise Exception("SoundEffects cannot be stopped")
         
         mixer.stop()
+
+
+class MusicPlayer:
+    """The MusicPlayer class is responsible for playing the background music of the game.
+       Unlike the SoundPlayer, the tracks are not decoded into Sound objects, they are streamed from disk by pygame.mixer.music.
+       This way only the track that is playing is loaded and the memory used by the music is bounded by the size of the decoding buffer.
+
+         The class has the following attributes:
+            - tracks: The list of tracks that can be played
+            - current_track: The name of the track that is playing
+            - loaded_track: The name of the track loaded in the music stream
+            - next_track: The name of the track that will be played when the current track fades out
+            - paused: A flag indicating whether the music is paused
+    """
+
+    def __init__(self, tracks):
+        """
+            Initializes a new instance of the MusicPlayer class, initializes the mixer module if it was not initialized yet
+            and sets the event posted by pygame.mixer.music when a track ends.
+
+            Args:
+                - tracks (list): The list of tracks that can be played
+        """
+        if mixer.get_init() is None:
+            mixer.init()
+
+        mixer.music.set_endevent(GAME_EVENTS["MUSIC_END_EVENT"])
+
+        self.tracks = tracks
+        self.current_track = None
+        self.loaded_track = None
+        self.next_track = None
+        self.paused = False
+
+    def get_track_path(self, track_name):
+        """ The get_track_path method is responsible for returning the path of a track file.
+
+            Args:
+                - track_name (str): The name of the track file
+
+            Returns:
+                - str: The path of the track file
+        """
+        if track_name not in self.tracks:
+            raise ValueError(f"Unknown music track: {track_name}")
+
+        return os.path.join(os.path.dirname(__file__), f"../Assets/SoundTrack/Music/{track_name}.wav")
+
+    def play(self, track_name, fade_ms=0):
+        """ The play method is responsible for streaming a track in loop, replacing the track that is playing.
+
+            Args:
+                - track_name (str): The name of the track to be played
+                - fade_ms (int): The duration of the fade in, in milliseconds
+        """
+        # Loading or playing while a track fades out blocks until the fade ends, the fade is halted instead
+        if mixer.music.get_busy():
+            mixer.music.stop()
+
+        # The track is loaded again only when it changes (e.g. restarting a level keeps the same track)
+        if self.loaded_track != track_name:
+            mixer.music.load(self.get_track_path(track_name))
+            self.loaded_track = track_name
+
+        # Set volume to 10%
+        mixer.music.set_volume(MUSIC["VOLUME"])
+        mixer.music.play(-1, fade_ms=fade_ms)
+
+        self.current_track = track_name
+        self.next_track = None
+        self.paused = False
+
+    def crossfade(self, track_name, fade_ms=MUSIC["FADE_MS"]):
+        """ The crossfade method is responsible for changing the track that is playing.
+            The current track fades out and, when it ends (MUSIC_END_EVENT), the new track fades in.
+            Only one track is streamed at a time, so the fade out and the fade in happen one after the other.
+
+            Args:
+                - track_name (str): The name of the track to be played
+                - fade_ms (int): The duration of each fade, in milliseconds
+        """
+        if self.current_track is None or not mixer.music.get_busy():
+            self.play(track_name, fade_ms)
+            return
+
+        self.next_track = track_name
+        self.paused = False
+        mixer.music.fadeout(fade_ms)
+
+    def on_music_end(self, fade_ms=MUSIC["FADE_MS"]):
+        """ The on_music_end method is responsible for playing the queued track when the current track ends.
+            It must be called when the MUSIC_END_EVENT is handled.
+
+            Args:
+                - fade_ms (int): The duration of the fade in, in milliseconds
+        """
+        if self.next_track is not None:
+            self.play(self.next_track, fade_ms)
+
+    def pause(self):
+        """ The pause method is responsible for pausing the music, keeping its position in the track."""
+        if self.current_track is not None and not self.paused:
+            mixer.music.pause()
+            self.paused = True
+
+    def resume(self):
+        """ The resume method is responsible for resuming the music from the position where it was paused."""
+        if self.paused:
+            mixer.music.unpause()
+            self.paused = False
+
+    def stop(self, fade_ms=0):
+        """ The stop method is responsible for stopping the music playback and unloading the track.
+
+            Args:
+                - fade_ms (int): The duration of the fade out, in milliseconds
+        """
+        self.next_track = None
+        self.paused = False
+
+        if fade_ms > 0 and mixer.music.get_busy():
+            mixer.music.fadeout(fade_ms)
+        else:
+            mixer.music.stop()
+            mixer.music.unload()
+            self.loaded_track = None
+
+        self.current_track = None
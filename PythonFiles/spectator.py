@@ -0,0 +1,598 @@
+import os
+import json
+import stat
+import queue
+import socket
+import argparse
+import selectors
+import threading
+from collections import OrderedDict
+import pygame as pg
+from consts import SCREEN_DIMENSIONS, FPS, COLORS, MAX_KIRBIES, LEVEL_PATHS, SPECTATOR
+
+# Marker of the keys that are missing in the base state of a delta (None is a valid value)
+MISSING = object()
+
+
+def capture_state(game):
+    """ The capture_state function returns the state of the game published to the spectators, as a flat dictionary of plain values
+        (e.g. "level", "player.x", "kirby.0.alive", "score"). It runs in the game loop, so it only copies the values, the diffs and the serialization are done by the server thread.
+
+        Args:
+            - game (Game): The game
+
+        Returns:
+            - dict: The state of the game
+    """
+    state = {"screen": game.fsm.current.name}
+
+    if not game.is_level_loaded():
+        return state
+
+    state["level"] = game.map.level.index
+
+    player = game.player
+
+    state["player.x"] = player.rect.x
+    state["player.y"] = player.rect.y
+    state["player.velocity_x"] = player.velocity_x
+    state["player.velocity_y"] = player.velocity_y
+    state["player.state"] = player.fsm.current.name
+    state["player.turned_right"] = player.turned_right
+
+    for index, kirby in enumerate(game.kirbies):
+        state[f"kirby.{index}.x"] = kirby.rect.x
+        state[f"kirby.{index}.y"] = kirby.rect.y
+        state[f"kirby.{index}.alive"] = not kirby.dead
+        state[f"kirby.{index}.state"] = kirby.fsm.current.name
+        state[f"kirby.{index}.turned_right"] = kirby.turned_right
+
+    state["score"] = game.ui.score
+    state["time"] = game.ui.time
+    state["timer_color"] = list(game.ui.timer_text_color)
+
+    return state
+
+
+def get_delta(base, state):
+    """ The get_delta function returns the values of a state that changed since a base state and the keys that were removed.
+
+        Args:
+            - base (dict): The base state (None to send the full state)
+            - state (dict): The new state
+
+        Returns:
+            - tuple: The changed values and the removed keys
+    """
+    if base is None:
+        return state, []
+
+    changes = {key: value for key, value in state.items() if base.get(key, MISSING) != value}
+    removed = [key for key in base if key not in state]
+
+    return changes, removed
+
+
+def apply_delta(base, changes, removed):
+    """ The apply_delta function returns the state built from a base state and the values that changed since it (the inverse of get_delta).
+
+        Args:
+            - base (dict): The base state (None for a full state)
+            - changes (dict): The changed values
+            - removed (list): The removed keys
+
+        Returns:
+            - dict: The new state
+    """
+    state = dict(base) if base is not None else {}
+    state.update(changes)
+
+    for key in removed:
+        state.pop(key, None)
+
+    return state
+
+
+def remove_stale_socket(path):
+    """ The remove_stale_socket function removes the Unix socket file left by a spectator server that didn't close (e.g. the game crashed),
+        a socket where a server still listens, or a file that is not a socket, is never removed.
+
+        Args:
+            - path (str): The path of the Unix socket
+    """
+    if not os.path.exists(path):
+        return
+
+    if not stat.S_ISSOCK(os.stat(path).st_mode):
+        raise OSError(f"The spectator socket {path} exists and is not a socket")
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+
+    raise OSError(f"Another spectator server is listening on {path}")
+
+
+def create_listener(port=None, path=None):
+    """ The create_listener function creates the listening socket of the spectator server, on a local TCP port or on a Unix socket.
+
+        Args:
+            - port (int): The TCP port (on the loopback interface)
+            - path (str): The path of the Unix socket
+
+        Returns:
+            - socket: The listening socket
+    """
+    if path is not None:
+        remove_stale_socket(path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(path)
+    else:
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind((SPECTATOR["HOST"], port))
+
+    listener.listen()
+    listener.setblocking(False)
+
+    return listener
+
+
+class SpectatorConnection:
+    """ The SpectatorConnection class is responsible for the state of a spectator connected to the server.
+        The snapshots sent are kept until the spectator acknowledges them, each snapshot is sent as the changes since the last acknowledged snapshot
+        (the full state until the first acknowledgement). The snapshots older than the acknowledged one are dropped.
+
+        The class has the following attributes:
+            - connection: The socket of the spectator
+            - buffer: The bytes received that don't form a complete message yet
+            - acknowledged: The tick of the last snapshot acknowledged by the spectator (None before the first acknowledgement)
+            - history: The snapshots sent and not acknowledged yet, by tick
+    """
+
+    def __init__(self, connection) -> None:
+        """ Initializes a new instance of the SpectatorConnection class
+
+            Args:
+                - connection (socket): The socket of the spectator
+        """
+        self.connection = connection
+        self.buffer = b""
+        self.acknowledged = None
+        self.history = OrderedDict()
+
+    def receive(self, data):
+        """ The receive method is responsible for reading the acknowledgements of the spectator (one JSON object per line, e.g. {"ack": 42}).
+
+            Args:
+                - data (bytes): The bytes received
+        """
+        self.buffer += data
+        *lines, self.buffer = self.buffer.split(b"\n")
+
+        for line in lines:
+            tick = json.loads(line).get("ack")
+
+            if tick in self.history and (self.acknowledged is None or tick > self.acknowledged):
+                self.acknowledged = tick
+
+        # The snapshots older than the acknowledged one are never used as base again
+        while self.history and self.acknowledged is not None and next(iter(self.history)) < self.acknowledged:
+            self.history.popitem(last=False)
+
+    def encode(self, tick, state):
+        """ The encode method is responsible for serializing a snapshot as the changes since the last acknowledged snapshot.
+
+            Args:
+                - tick (int): The tick of the snapshot
+                - state (dict): The state of the game
+
+            Returns:
+                - bytes: The message (a JSON object and a line break)
+        """
+        base = self.history.get(self.acknowledged)
+
+        # The base can't be used when it was dropped (e.g. the spectator didn't acknowledge for too long)
+        base_tick = self.acknowledged if base is not None else None
+        changes, removed = get_delta(base, state)
+
+        self.history[tick] = state
+
+        while len(self.history) > SPECTATOR["HISTORY"]:
+            self.history.popitem(last=False)
+
+        message = {"tick": tick, "base": base_tick, "changes": changes}
+
+        if removed:
+            message["removed"] = removed
+
+        return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+
+class SpectatorServer:
+    """ The SpectatorServer class is responsible for publishing the state of the game every tick to the local spectators (e.g. attract mode screens).
+        The game loop only captures the state (capture_state) and gives it to the server thread, that accepts the spectators, reads their acknowledgements,
+        computes the changes since the state acknowledged by each spectator and sends them. If the server thread is behind, the oldest snapshot is dropped,
+        so the spectators never slow down the game. A spectator that doesn't read its snapshots in time is disconnected.
+
+        The class has the following attributes:
+            - path: The path of the Unix socket (None when the server listens on a TCP port)
+            - listener: The listening socket
+            - selector: The selector of the listening socket and the spectators sockets
+            - spectators: The connected spectators
+            - tick: The number of snapshots published
+            - snapshots: The queue of snapshots waiting to be sent
+            - running: A flag indicating whether the server thread runs
+            - thread: The server thread
+    """
+
+    def __init__(self, port=None, path=None) -> None:
+        """ Initializes a new instance of the SpectatorServer class and starts the server thread
+
+            Args:
+                - port (int): The TCP port (on the loopback interface)
+                - path (str): The path of the Unix socket (instead of the TCP port)
+        """
+        self.path = path
+        self.listener = create_listener(port, path)
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.listener, selectors.EVENT_READ)
+        self.spectators = {}
+        self.tick = 0
+        self.snapshots = queue.Queue(maxsize=SPECTATOR["QUEUE_SIZE"])
+        self.running = True
+        self.thread = threading.Thread(target=self.serve, name="spectator_server", daemon=True)
+        self.thread.start()
+
+    def publish(self, game):
+        """ The publish method is responsible for capturing the state of the game and giving it to the server thread, it is called once per tick.
+
+            Args:
+                - game (Game): The game
+        """
+        self.tick += 1
+        snapshot = (self.tick, capture_state(game))
+
+        try:
+            self.snapshots.put_nowait(snapshot)
+        except queue.Full:
+            # The oldest snapshot is dropped, the next one is sent as the changes since the acknowledged state anyway
+            try:
+                self.snapshots.get_nowait()
+            except queue.Empty:
+                pass
+
+            self.snapshots.put_nowait(snapshot)
+
+    def serve(self):
+        """ The serve method is run by the server thread, it handles the spectators sockets and sends the snapshots until the server is closed.
+            The snapshots still queued when the server is closed (e.g. the game over tick) are sent before the thread ends."""
+        while self.running:
+            try:
+                snapshot = self.snapshots.get(timeout=1 / FPS)
+            except queue.Empty:
+                snapshot = None
+
+            for key, _ in self.selector.select(timeout=0):
+                if key.fileobj is self.listener:
+                    self.accept()
+                else:
+                    self.read(key.fileobj)
+
+            if snapshot is not None:
+                self.send(*snapshot)
+
+        while True:
+            try:
+                snapshot = self.snapshots.get_nowait()
+            except queue.Empty:
+                break
+
+            self.send(*snapshot)
+
+    def accept(self):
+        """ The accept method is responsible for connecting a new spectator."""
+        try:
+            connection, _ = self.listener.accept()
+        except OSError:
+            return
+
+        connection.settimeout(SPECTATOR["SEND_TIMEOUT"])
+        self.spectators[connection] = SpectatorConnection(connection)
+        self.selector.register(connection, selectors.EVENT_READ)
+
+    def read(self, connection):
+        """ The read method is responsible for reading the acknowledgements of a spectator, the spectator is disconnected when it closes the connection.
+
+            Args:
+                - connection (socket): The socket of the spectator
+        """
+        try:
+            data = connection.recv(4096)
+            self.spectators[connection].receive(data)
+        except (OSError, ValueError):
+            data = b""
+
+        if not data:
+            self.disconnect(connection)
+
+    def send(self, tick, state):
+        """ The send method is responsible for sending a snapshot to every spectator.
+
+            Args:
+                - tick (int): The tick of the snapshot
+                - state (dict): The state of the game
+        """
+        for connection, spectator in list(self.spectators.items()):
+            try:
+                connection.sendall(spectator.encode(tick, state))
+            except OSError:
+                # A partial message can't be resumed, the spectator connects again
+                self.disconnect(connection)
+
+    def disconnect(self, connection):
+        """ The disconnect method is responsible for closing the connection of a spectator.
+
+            Args:
+                - connection (socket): The socket of the spectator
+        """
+        if self.spectators.pop(connection, None) is not None:
+            self.selector.unregister(connection)
+            connection.close()
+
+    def close(self):
+        """ The close method is responsible for stopping the server thread, closing every connection and removing the Unix socket file."""
+        self.running = False
+        self.thread.join()
+
+        for connection in list(self.spectators):
+            self.disconnect(connection)
+
+        self.selector.close()
+        self.listener.close()
+
+        if self.path is not None and os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class SpectatorClient:
+    """ The SpectatorClient class is responsible for receiving the snapshots of a spectator server and drawing them with the drawing of the game
+        (the Map, the Camera, the UI and the animations of the sprites).
+        Each snapshot is rebuilt from the snapshot it is based on and acknowledged, so the server sends the next ones as the changes since it.
+
+        The class has the following attributes:
+            - connection: The socket connected to the server
+            - buffer: The bytes received that don't form a complete message yet
+            - states: The snapshots received that can be the base of the next ones, by tick
+            - state: The last snapshot received
+            - acknowledgement: The tick of the last snapshot received that is not acknowledged yet (None when there is none)
+            - outgoing: The bytes of the acknowledgement being sent, the rest of a partial send is sent in the next loop
+            - window: The window where the snapshots are drawn
+            - clock: The clock of the client
+            - map: The map of the level
+            - camera: The camera that follows the player
+            - ui: The HUD of the level
+            - player: The sprite of the player
+            - kirbies: The sprites of the kirbies
+            - animation_system: The system that advances the animations of the sprites
+    """
+
+    def __init__(self, connection) -> None:
+        """ Initializes a new instance of the SpectatorClient class and loads the sprites of the level
+
+            Args:
+                - connection (socket): The socket connected to the server
+        """
+        # The sprites are imported after the display is created (their images are converted to the display format)
+        from game_map import Map
+        from camera import Camera
+        from game_ui import UI
+        from player import Player
+        from peach import Peach
+        from kirby import Kirby
+        from animation_system import AnimationSystem
+
+        self.connection = connection
+        self.connection.setblocking(False)
+        self.buffer = b""
+        self.states = OrderedDict()
+        self.state = {}
+        self.acknowledgement = None
+        self.outgoing = b""
+
+        pg.init()
+        self.window = pg.display.set_mode((SCREEN_DIMENSIONS["WIDTH"], SCREEN_DIMENSIONS["HEIGHT"]))
+        pg.display.set_caption("Super Bowser - Spectator")
+        self.clock = pg.time.Clock()
+
+        self.map = Map()
+        self.camera = Camera(SCREEN_DIMENSIONS["WIDTH"], SCREEN_DIMENSIONS["HEIGHT"])
+        self.ui = UI()
+        self.player = Player()
+        self.peach = Peach(self.map.level.peach_position)
+        self.kirbies = [Kirby(self.map.level.kirbies_positions[0])]
+        self.kirbies += [self.kirbies[0].clone() for _ in range(MAX_KIRBIES - 1)]
+        self.animation_system = AnimationSystem()
+
+    def receive(self):
+        """ The receive method is responsible for reading the snapshots received, rebuilding them and acknowledging them.
+
+            Returns:
+                - bool: A flag indicating whether the server is still connected
+        """
+        try:
+            data = self.connection.recv(65536)
+        except BlockingIOError:
+            return self.send_acknowledgement()
+        except OSError:
+            return False
+
+        if not data:
+            return False
+
+        self.buffer += data
+        *lines, self.buffer = self.buffer.split(b"\n")
+
+        for line in lines:
+            message = json.loads(line)
+            base_tick = message["base"]
+
+            if base_tick is not None and base_tick not in self.states:
+                continue
+
+            state = apply_delta(self.states.get(base_tick), message["changes"], message.get("removed", ()))
+
+            # The server only uses the last acknowledged snapshot as base, the older ones are not needed anymore
+            while self.states and base_tick is not None and next(iter(self.states)) < base_tick:
+                self.states.popitem(last=False)
+
+            self.states[message["tick"]] = state
+            self.state = state
+            self.acknowledgement = message["tick"]
+
+        return self.send_acknowledgement()
+
+    def send_acknowledgement(self):
+        """ The send_acknowledgement method is responsible for acknowledging the last snapshot received without blocking.
+            The server only uses the last acknowledged snapshot as base, so only the last one is sent, once the previous acknowledgement is fully sent
+            (a line is never interrupted, the server would read a corrupt message).
+
+            Returns:
+                - bool: A flag indicating whether the server is still connected
+        """
+        if not self.outgoing and self.acknowledgement is not None:
+            self.outgoing = json.dumps({"ack": self.acknowledgement}).encode() + b"\n"
+            self.acknowledgement = None
+
+        if not self.outgoing:
+            return True
+
+        try:
+            sent = self.connection.send(self.outgoing)
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+
+        self.outgoing = self.outgoing[sent:]
+
+        return True
+
+    def apply_state(self):
+        """ The apply_state method is responsible for moving the sprites to the positions of the last snapshot and playing their animations."""
+        state = self.state
+
+        if "player.x" not in state:
+            return
+
+        # The spectator swaps in the level played as the game does (the levels are prepared by the level loader of the map)
+        if self.map.level.index != state["level"]:
+            self.map.change_level(state["level"])
+            self.map.preload_level((state["level"] + 1) % len(LEVEL_PATHS))
+            self.peach.rect.topleft = self.map.level.peach_position
+
+        self.place_sprite(self.player, state, "player")
+
+        for index, kirby in enumerate(self.kirbies):
+            if f"kirby.{index}.x" in state:
+                self.place_sprite(kirby, state, f"kirby.{index}")
+
+        self.ui.score = state["score"]
+        self.ui.time = state["time"]
+        self.ui.timer_text_color = tuple(state["timer_color"])
+        self.camera.update(self.player)
+
+    def place_sprite(self, sprite, state, prefix):
+        """ The place_sprite method is responsible for moving a sprite to its position in a snapshot, turning it and playing the animation of its state.
+
+            Args:
+                - sprite (Sprite): The sprite
+                - state (dict): The snapshot
+                - prefix (str): The prefix of the keys of the sprite in the snapshot
+        """
+        sprite.rect.topleft = (state[f"{prefix}.x"], state[f"{prefix}.y"])
+
+        if sprite.turned_right != state[f"{prefix}.turned_right"]:
+            sprite.turned_right = state[f"{prefix}.turned_right"]
+            sprite.image = pg.transform.flip(sprite.image, True, False)
+
+        sprite.animator.play_animation(state[f"{prefix}.state"], sprite)
+
+    def get_visible_sprites(self):
+        """ The get_visible_sprites method returns the sprites drawn in the last snapshot (the dead kirbies are not drawn).
+
+            Returns:
+                - list: The sprites
+        """
+        kirbies = [kirby for index, kirby in enumerate(self.kirbies) if self.state.get(f"kirby.{index}.alive")]
+
+        return [self.player, self.peach] + kirbies
+
+    def draw(self):
+        """ The draw method is responsible for drawing the last snapshot as the game draws the level."""
+        self.window.fill(COLORS["BACKGROUND"])
+
+        if "player.x" in self.state:
+            self.map.draw(self.window, self.camera)
+
+            for sprite in self.get_visible_sprites():
+                self.window.blit(sprite.image, self.camera.apply(sprite))
+
+            self.ui.draw_labels(self.window)
+
+        pg.display.flip()
+
+    def run(self):
+        """ The run method is responsible for drawing the snapshots until the window is closed or the server disconnects."""
+        running = True
+
+        while running:
+            for event in pg.event.get():
+                if event.type == pg.QUIT:
+                    running = False
+
+            running = self.receive() and running
+            self.apply_state()
+
+            elapsed_time = self.clock.tick(FPS)
+            self.animation_system.update(elapsed_time, self.get_visible_sprites())
+            self.draw()
+
+        self.connection.close()
+        pg.quit()
+
+
+def parse_arguments():
+    """ The parse_arguments function is responsible for parsing the command line arguments of the spectator client.
+
+        Returns:
+            - Namespace: The parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Draws the game streamed by a spectator server (python game.py --spectator-port).")
+    parser.add_argument("--port", type=int, default=SPECTATOR["PORT"], help="TCP port of the spectator server")
+    parser.add_argument("--socket", metavar="PATH", help="Unix socket of the spectator server (instead of the TCP port)")
+
+    return parser.parse_args()
+
+
+def main():
+    """ The main function connects to a spectator server and draws the game."""
+    arguments = parse_arguments()
+
+    if arguments.socket:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(arguments.socket)
+    else:
+        connection = socket.create_connection((SPECTATOR["HOST"], arguments.port))
+
+    SpectatorClient(connection).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,29 @@
-import pygame as pg
 import pygame.sprite as pgs
 from animator import Animator
+from image_cache import ImageCache
 class Sprite:
     """ The Sprite class is responsible for managing the sprites in the game world
+        The attributes of the sprites are stored in slots instead of a __dict__, the subclasses must declare their own __slots__ (empty if they add no attributes).
+        The data that is the same for every sprite of a type (e.g. name, states and transitions) is stored in class attributes and shared.
 
         The class has the following attributes:
             - image: The image of the sprite
+            - image_path: The path of the image loaded from the image cache, the sprite holds a reference to it until it is released
             - dimensions: The dimensions of the sprite
             - rect: The rectangle of the sprite
-            - add_internal: The add_internal method of the sprite group
-            - remove_internal: The remove_internal method of the sprite group
             - is_on_ground: A boolean that indicates whether the sprite is on the ground
-            - speed: The speed of the sprite
-            - states: The states of the sprite
-            - transitions: The transitions between the sprite's states
             - fsm: The finite state machine of the sprite
-            - name: The name of the sprite
+            - name: The name of the sprite (class attribute)
             - animator: The animator of the sprite
     """
 
+    __slots__ = ("image", "image_path", "dimensions", "rect", "is_on_ground", "fsm", "animator")
+
+    name = None
+
     def __init__(self,sprite_path, position, collider): 
         """ 
-            Initializes a new instance of the Sprite class, loads the sprite image file , sets the dimensions of the sprite, and creates a rectangle for the sprite
+            Initializes a new instance of the Sprite class, gets the sprite image from the image cache (it is loaded once for every sprite), sets the dimensions of the sprite, and creates a rectangle for the sprite
 
             Args:
                 - sprite_path (str): The path to the sprite image file
@@ -29,23 +31,46 @@ class Sprite:
                 - collider (tuple): The collider of the sprite
         """   
 
-        self.image = pg.image.load(sprite_path).convert_alpha()
+        self.image_path = sprite_path
+        self.image = ImageCache.acquire(sprite_path)
         self.dimensions = (self.image.get_width(), self.image.get_height())
 
         self.rect = pgs.Rect(position, collider)
-        
-        # The add_internal and remove_internal methods are implemented to be possible for add and remove instance of the Sprite class from the sprite group define in the game.py
-        self.add_internal = pgs.Group.add
-        self.remove_internal = pgs.Group.remove
 
         self.is_on_ground = True
-        self.speed = None
-        self.states = None
-        self.transitions = None
         self.fsm = None
-        self.name = None
         self.animator = Animator()
 
+    @classmethod
+    def get_slots(cls):
+        """ The get_slots method returns the names of the slots of the class and its parent classes
+
+            Returns:
+                - list: The names of the slots
+        """
+        return [name for klass in cls.__mro__ for name in getattr(klass, "__slots__", ())]
+
+    def release(self):
+        """ The release method is responsible for releasing the reference of the sprite to its cached image and unpinning its animation, it is called when the sprite is unloaded"""
+        if self.image_path is not None:
+            ImageCache.release(self.image_path)
+            self.image_path = None
+
+        if self.animator is not None:
+            self.animator.reset()
+
+    def add_internal(self, group):
+        """ The add_internal method is called by the sprite group define in the game.py when the sprite is added to it
+            It must be implemented to be possible for add instance of the Sprite class to the sprite group, the sprite doesn't keep its groups
+        """
+        pass
+
+    def remove_internal(self, group):
+        """ The remove_internal method is called by the sprite group define in the game.py when the sprite is removed from it
+            It must be implemented to be possible for remove instance of the Sprite class from the sprite group
+        """
+        pass
+
     def update(self):
         """ The update method is responsible for updating the sprite
             This method must be implemented even if it does nothing, for  instance of the Sprite class could be updated by  the sprite group define in the game.py
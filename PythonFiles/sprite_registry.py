@@ -0,0 +1,97 @@
+import pygame as pg
+
+
+class SpriteRegistry(pg.sprite.Group):
+    """ The SpriteRegistry class is the group of all the sprites of the level, it keeps a group of the sprites of each type as well
+        (e.g. the player, the peach and the kirbies), updated when a sprite is added to or removed from the group,
+        so finding the sprites of a type doesn't scan the whole group (get_first is O(1), get_sprites is O(k) for the k sprites of the type).
+        The sprites of a type are kept in the order they were spawned.
+
+        The sprites are not removed while the level is iterated (e.g. a kirby killed while the collisions are observed): despawn queues the sprite
+        and flush removes the queued sprites, it is called once per tick after the sprites are updated and observed.
+
+        The class has the following attributes:
+            - types: The sprites of each type (the exact class of the sprite), in spawn order
+            - despawn_queue: The sprites that are removed in the next flush
+    """
+
+    def __init__(self, *sprites) -> None:
+        """ Initializes a new instance of the SpriteRegistry class
+
+            Args:
+                - *sprites: The sprites added to the registry
+        """
+        self.types = {}
+        self.despawn_queue = []
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        """ The add_internal method is called by pygame when a sprite is added to the group, it adds the sprite to the group of its type.
+
+            Args:
+                - sprite (Sprite): The sprite added
+                - layer (int): The layer of the sprite (not used by the groups without layers)
+        """
+        super().add_internal(sprite, layer)
+
+        # The dictionaries keep the insertion order and remove a sprite in O(1)
+        self.types.setdefault(type(sprite), {})[sprite] = None
+
+    def remove_internal(self, sprite):
+        """ The remove_internal method is called by pygame when a sprite is removed from the group, it removes the sprite from the group of its type.
+
+            Args:
+                - sprite (Sprite): The sprite removed
+        """
+        super().remove_internal(sprite)
+        self.types.get(type(sprite), {}).pop(sprite, None)
+
+    def get_first(self, sprite_type):
+        """ The get_first method returns the first sprite spawned of a type (e.g. the player).
+
+            Args:
+                - sprite_type (type): The class of the sprite
+
+            Returns:
+                - Sprite: The sprite or None if there is no sprite of the type
+        """
+        return next(iter(self.types.get(sprite_type, ())), None)
+
+    def get_sprites(self, sprite_type):
+        """ The get_sprites method returns the sprites of a type in spawn order (e.g. the kirbies alive).
+
+            Args:
+                - sprite_type (type): The class of the sprites
+
+            Returns:
+                - list: The sprites of the type
+        """
+        return list(self.types.get(sprite_type, ()))
+
+    def get_counts(self):
+        """ The get_counts method returns the number of sprites of each type in the registry.
+
+            Returns:
+                - dict: The number of sprites by class name
+        """
+        return {sprite_type.__name__: len(sprites) for sprite_type, sprites in self.types.items() if sprites}
+
+    def despawn(self, sprite):
+        """ The despawn method is responsible for queuing a sprite to be removed in the next flush, the sprite stays in the group until then.
+
+            Args:
+                - sprite (Sprite): The sprite to be removed
+        """
+        if sprite not in self.despawn_queue:
+            self.despawn_queue.append(sprite)
+
+    def flush(self):
+        """ The flush method is responsible for removing the queued sprites, it is called once per tick when the group is not iterated."""
+        if self.despawn_queue:
+            self.remove(*self.despawn_queue)
+            self.despawn_queue.clear()
+
+    def empty(self):
+        """ The empty method is responsible for removing every sprite and discarding the queued despawns (e.g. when the level is restarted)."""
+        super().empty()
+        self.despawn_queue.clear()
@@ -0,0 +1,85 @@
+import time
+import threading
+from contextlib import contextmanager
+
+# Time when the first game module was imported, the startup trace measures every phase from here
+PROCESS_START = time.perf_counter()
+
+
+class StartupTrace:
+    """ The StartupTrace class is responsible for measuring the time spent in each phase of the game startup.
+        The phases are measured always (it is cheap), but the report is only printed when the trace is enabled (--trace-startup).
+        Only the first run of each phase is recorded, the later runs (e.g. loading the level again after a restart) are not part of the startup.
+
+        The class has the following attributes:
+            - enabled: A flag indicating whether the report is printed
+            - phases: The list of measured phases (name, duration in seconds, thread name)
+            - milestones: The time of each milestone since the process start (e.g. first_frame, playable)
+            - reported: A flag indicating whether the report was already printed
+    """
+
+    def __init__(self) -> None:
+        """ Initializes a new instance of the StartupTrace class"""
+        self.enabled = False
+        self.phases = []
+        self.milestones = {}
+        self.reported = False
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        """ The phase method is a context manager that measures the time spent in a phase of the startup.
+
+            Args:
+                - name (str): The name of the phase
+        """
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.record(name, start)
+
+    def record(self, name, start):
+        """ The record method is responsible for recording a phase that started at a given time and ends now.
+
+            Args:
+                - name (str): The name of the phase
+                - start (float): The time when the phase started (time.perf_counter)
+        """
+        with self.lock:
+            if any(phase[0] == name for phase in self.phases):
+                return
+
+            self.phases.append((name, time.perf_counter() - start, threading.current_thread().name))
+
+    def mark(self, name):
+        """ The mark method is responsible for recording the time of a milestone, only the first time it is reached.
+
+            Args:
+                - name (str): The name of the milestone
+        """
+        if name not in self.milestones:
+            self.milestones[name] = time.perf_counter() - PROCESS_START
+
+    def report(self):
+        """ The report method is responsible for printing the duration of each phase and the time of each milestone."""
+        if not self.enabled or self.reported:
+            return
+
+        self.reported = True
+
+        with self.lock:
+            phases = list(self.phases)
+
+        print("Startup trace (milliseconds)")
+
+        for name, duration, thread_name in phases:
+            background = "" if thread_name == "MainThread" else f" [{thread_name}]"
+            print(f"  {name:<22}{duration * 1000:>10.2f}{background}")
+
+        for name, moment in self.milestones.items():
+            print(f"  {'time to ' + name:<22}{moment * 1000:>10.2f}")
+
+
+STARTUP_TRACE = StartupTrace()
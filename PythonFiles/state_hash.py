@@ -0,0 +1,154 @@
+import argparse
+import hashlib
+import struct
+import sys
+from consts import STATE_HASH
+
+# Header of the state hash traces (the checksums of the ticks follow it)
+TRACE_MAGIC = b"SBSH"
+TRACE_HEADER = struct.Struct("<4sBB")
+TRACE_VERSION = 1
+
+# Layouts of the values of the checksum: the level index with the HUD score and time, the player rect, velocities and ground flag,
+# and each kirby rect, walked distance and dead flag
+LEVEL_VALUES = struct.Struct("<3i")
+PLAYER_VALUES = struct.Struct("<4i2d?")
+KIRBY_VALUES = struct.Struct("<4id?")
+
+
+def hash_state(game):
+    """ The hash_state function returns the checksum of the simulation state of a tick: the state of the game FSM and the level,
+        the player rect, velocities, ground flag and state, the rect, walked distance, dead flag and state of each kirby, and the HUD score and time.
+        The values are packed in binary (the velocities and distances as doubles, so any change of their floats changes the checksum).
+
+        Args:
+            - game (Game): The game, with a level loaded
+
+        Returns:
+            - bytes: The checksum of the state (STATE_HASH["DIGEST_SIZE"] bytes)
+    """
+    digest = hashlib.blake2b(digest_size=STATE_HASH["DIGEST_SIZE"])
+    player = game.player
+
+    digest.update(game.fsm.current.name.encode())
+    digest.update(LEVEL_VALUES.pack(game.map.level.index, game.ui.score, game.ui.time))
+    digest.update(PLAYER_VALUES.pack(*player.rect, player.velocity_x, player.velocity_y, player.is_on_ground))
+    digest.update(player.fsm.current.name.encode())
+
+    for kirby in game.kirbies:
+        digest.update(KIRBY_VALUES.pack(*kirby.rect, kirby.walked_distance, kirby.dead))
+        digest.update(kirby.fsm.current.name.encode())
+
+    return digest.digest()
+
+
+class StateHashRecorder:
+    """ The StateHashRecorder class is responsible for writing the checksum of the simulation state of every tick to a trace file,
+        so two runs (e.g. before and after a change of the collisions or of the kirbies update) can be compared tick by tick with diff_traces.
+        The trace is a header followed by the checksums, STATE_HASH["DIGEST_SIZE"] bytes per tick (480 bytes per second of play at 60 FPS).
+
+        The class has the following attributes:
+            - path: The path of the trace file
+            - file: The trace file
+            - ticks: The number of ticks recorded
+    """
+
+    def __init__(self, path) -> None:
+        """ Initializes a new instance of the StateHashRecorder class and writes the header of the trace
+
+            Args:
+                - path (str): The path of the trace file
+        """
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, STATE_HASH["DIGEST_SIZE"]))
+        self.ticks = 0
+
+    def record(self, game):
+        """ The record method is responsible for writing the checksum of the state of the game after a tick.
+
+            Args:
+                - game (Game): The game
+        """
+        self.file.write(hash_state(game))
+        self.ticks += 1
+
+    def close(self):
+        """ The close method is responsible for closing the trace file."""
+        self.file.close()
+
+
+def read_trace(path):
+    """ The read_trace function is responsible for reading the checksums of a trace file.
+
+        Args:
+            - path (str): The path of the trace file
+
+        Returns:
+            - list: The checksum of each tick
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+
+    if len(data) < TRACE_HEADER.size:
+        raise ValueError(f"{path} is not a state hash trace")
+
+    magic, version, digest_size = TRACE_HEADER.unpack_from(data)
+
+    if magic != TRACE_MAGIC or version != TRACE_VERSION:
+        raise ValueError(f"{path} is not a state hash trace (version {TRACE_VERSION})")
+
+    return [data[offset:offset + digest_size] for offset in range(TRACE_HEADER.size, len(data) - digest_size + 1, digest_size)]
+
+
+def diff_traces(trace, other_trace):
+    """ The diff_traces function returns the first tick where two traces diverge, a trace that ends before the other diverges at its end.
+
+        Args:
+            - trace (list): The checksums of the first trace
+            - other_trace (list): The checksums of the second trace
+
+        Returns:
+            - int: The first divergent tick, or None if the traces are identical
+    """
+    for tick, (checksum, other_checksum) in enumerate(zip(trace, other_trace)):
+        if checksum != other_checksum:
+            return tick
+
+    return None if len(trace) == len(other_trace) else min(len(trace), len(other_trace))
+
+
+def parse_arguments():
+    """ The parse_arguments function is responsible for parsing the command line arguments of the trace diff tool.
+
+        Returns:
+            - Namespace: The parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Compares two state hash traces (python game.py --state-hash) and reports the first tick where they diverge.")
+    parser.add_argument("trace", help="the reference trace")
+    parser.add_argument("other_trace", help="the trace compared with the reference")
+
+    return parser.parse_args()
+
+
+def main():
+    """ The main function compares two traces and exits with an error code when they diverge."""
+    arguments = parse_arguments()
+    trace = read_trace(arguments.trace)
+    other_trace = read_trace(arguments.other_trace)
+    tick = diff_traces(trace, other_trace)
+
+    if tick is None:
+        print(f"The traces are identical ({len(trace)} ticks)")
+        sys.exit(0)
+
+    if tick == min(len(trace), len(other_trace)):
+        print(f"The traces diverge at tick {tick}: the trace {arguments.trace if len(trace) == tick else arguments.other_trace} ends ({len(trace)} and {len(other_trace)} ticks)")
+    else:
+        print(f"The traces diverge at tick {tick} ({len(trace)} and {len(other_trace)} ticks)")
+
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()